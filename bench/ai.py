@@ -0,0 +1,149 @@
+"""Benchmark et vérification de la flotte rouge (lib/red/fleet.py)
+
+Scénario : N vaisseaux rouges (shooter, sniper et blaster à tour de rôle) placés en anneau de 200 à 1500 px autour
+du joueur immobile, qui ne peut pas mourir. Aucun ennemi n'apparaît pendant la mesure : les vaisseaux se
+rentrent dedans, explosent ou partent trop loin.
+1. Vérification : la même partie tourne avec l'ancien code vaisseau par vaisseau (Ship.update() pour chaque
+   vaisseau, puis l'IA avec des Vector2 recopiée ici), puis avec la flotte : positions, forces, angles,
+   propulseurs, PV, balles et empreinte du monde doivent être exactement les mêmes, sinon le script s'arrête
+   en erreur.
+2. Temps des vaisseaux seuls (world.objects.update() et la passe de la flotte), et du tick complet
+   (game.updateGame), par tick, pour chaque N, et le premier N où la flotte est plus rapide.
+Lancer depuis la racine du projet : python bench/ai.py
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from math import copysign, cos, sin, pi
+from random import Random
+
+os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.getcwd())
+
+from lib import game
+from lib.collision import ENEMY
+from lib.player import Player
+from lib.ship import Ship
+from lib.red.redTeam import redTeam
+from lib.red.shooter import redShooter
+from lib.red.sniper import redSniper
+from lib.red.blaster import redBlaster
+from lib.vectors import angleBetweenVectors
+
+COUNTS = (1, 6, 25, 50, 100, 200, 500, 1000)
+TICKS = 300
+
+
+def perShip(world):
+    """Ancienne IA : chaque vaisseau calcule la sienne avec des Vector2, comme redTeam.update() le faisait
+    """
+    for ship in world.ships:
+        if ship.category != ENEMY:
+            continue
+        ship.distToPlayer = ship.vectDistanceToPlayer.magnitude()
+        if ship.dying:
+            continue
+
+        ship.dotFront = ship.direction * ship.vectDistanceToPlayer.normalize()
+        if ship.dotFront > 0.90 and ship.distToPlayer < ship.firingDistance:
+            ship.fire()
+
+        ship.angleMomentum += (angleBetweenVectors(ship.direction, ship.vectDistanceToPlayer) * 0.01)
+        ship.angleMomentum *= 0.7 if ship.dotFront >= 0 else 1
+
+        if ship.distToPlayer > 500:
+            ship.propulseur += 0.0005
+        elif ship.distToPlayer < 300:
+            ship.propulseur -= 0.0005
+        else:
+            ship.propulseur *= 0.8
+        if abs(ship.propulseur) > 0.12:
+            ship.propulseur = copysign(0.12, ship.propulseur)
+
+
+def newWorld(count):
+    """Monde sans affichage, joueur immobile au centre, N vaisseaux rouges autour
+    """
+    world = game.createWorld(True, count)
+    world.chunks.update = lambda: None
+    world.player = Player(world, 300, (0, 0), world.ships, 500, 40)
+    world.player.HP = world.player.maxHP = 10 ** 9
+
+    rng = Random(count)
+    enemies = (redShooter, redSniper, redBlaster)
+    for index in range(count):
+        angle, distance = rng.uniform(-pi, pi), rng.uniform(200, 1500)
+        enemies[index % len(enemies)](world, (cos(angle) * distance, sin(angle) * distance))
+    return world
+
+
+def run(count, reference):
+    """Fait tourner la partie, avec l'ancien code vaisseau par vaisseau si reference, avec la flotte sinon
+
+    Returns:
+        tuple: (ms des vaisseaux par tick, ms du tick complet, état final comparable)
+    """
+    world = newWorld(count)
+    shipTime = 0.0
+
+    def timed(update):
+        def wrapper():
+            nonlocal shipTime
+            start = time.perf_counter()
+            update()
+            shipTime += time.perf_counter() - start
+        return wrapper
+
+    updateShip = redTeam.update
+    if reference:
+        redTeam.update = Ship.update  # Object.update() puis Ship.update(), comme avant la flotte
+        world.fleet.update = lambda: perShip(world)
+    world.objects.update = timed(world.objects.update)
+    world.fleet.update = timed(world.fleet.update)
+    manageEnemies, game.manageEnemies = game.manageEnemies, lambda world: None
+    try:
+        start = time.perf_counter()
+        for _ in range(TICKS):
+            game._randomTick(world)
+            game.updateGame(world)
+            world.tick += 1
+        elapsed = time.perf_counter() - start
+    finally:
+        redTeam.update, game.manageEnemies = updateShip, manageEnemies
+
+    bullets = world.bullets
+    state = ([(ship.x, ship.y, *ship.forces, ship.angle, ship.angleMomentum, ship.propulseur, ship.HP, ship.dying)
+              for ship in world.ships],
+             int(bullets.alive.sum()), bullets.x[bullets.alive].tolist(), bullets.y[bullets.alive].tolist(),
+             world.digest())
+    return shipTime / TICKS * 1000, elapsed / TICKS * 1000, state
+
+
+def main():
+    pygame.init()
+
+    print(f"{'vaisseaux':>9} | {'par vaisseau (ms)':>17} | {'flotte (ms)':>11} | {'tick par vaisseau (ms)':>22} | "
+          f"{'tick flotte (ms)':>16} | {'restants':>8} | {'balles':>6}")
+    crossover = None
+    for count in COUNTS:
+        shipTime, shipTick, shipState = run(count, True)
+        fleetTime, fleetTick, fleetState = run(count, False)
+        assert shipState == fleetState, f"{count} vaisseaux : la flotte ne donne pas la même partie"
+        if crossover is None and fleetTime < shipTime:
+            crossover = count
+        print(f"{count:>9} | {shipTime:>17.3f} | {fleetTime:>11.3f} | {shipTick:>22.2f} | {fleetTick:>16.2f} | "
+              f"{len(fleetState[0]) - 1:>8} | {fleetState[1]:>6}")
+
+    print(f"Flotte plus rapide à partir de : {crossover} vaisseaux")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""Benchmark des allocations et des pauses du ramasse-miettes sur une longue partie sans affichage
+
+Le joueur tire en tournant sur lui-même pendant 10 minutes de jeu (36000 ticks), une nouvelle partie
+commençant à chaque mort. Mesure :
+  - les passages du ramasse-miettes par génération, leur durée totale et la plus longue (gc.callbacks) ;
+  - les objets physiques construits (Object.__init__) et les rotations calculées ;
+  - avec tracemalloc, sur une minute de jeu après échauffement : la mémoire allouée puis libérée
+    dans un même tick (pic moins départ, moyenne et maximum) et la mémoire gardée à la fin.
+Avec --rev, mesure aussi une autre révision git dans un worktree temporaire (elle doit avoir lib.game.createWorld).
+
+Lancer depuis la racine du projet : python bench/allocations.py [--rev <révision>] [--ticks N]
+"""
+
+import os
+import sys
+import gc
+import json
+import argparse
+import tempfile
+import subprocess
+import time
+
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+SEED = 11
+
+
+def newRound(world, Player):
+    """Vide le monde et crée le joueur, comme game.run() au début de chaque partie
+    """
+    world.highscore = max(world.score, world.highscore)
+    world.reset()
+    world.player = Player(world, 300, (world.screenWidth // 2, world.screenHeight // 2), world.ships, 500, 40)
+
+
+def simulate(ticks, traced=0):
+    """Simule la partie dans l'arbre du dossier courant et retourne les mesures
+
+    Args:
+        ticks (int): Nombre de ticks mesurés pour le ramasse-miettes
+        traced (int): Nombre de ticks mesurés ensuite avec tracemalloc
+    """
+    import tracemalloc
+    from collections import defaultdict
+
+    import pygame
+
+    sys.path.insert(0, os.getcwd())
+    from lib import game
+    from lib.object import Object
+    from lib.player import Player
+
+    pygame.init()
+    world = game.createWorld(True, SEED)
+    newRound(world, Player)
+
+    keys = defaultdict(bool)
+    keys[pygame.K_SPACE] = keys[pygame.K_LEFT] = True
+
+    constructed = [0]
+    objectInit = Object.__init__
+
+    def countingInit(self, *args, **kwargs):
+        constructed[0] += 1
+        objectInit(self, *args, **kwargs)
+    Object.__init__ = countingInit
+
+    def tick():
+        if world.restart:
+            newRound(world, Player)
+        world.key = keys
+        game._randomTick(world)
+        game.updateGame(world)
+        world.tick += 1
+
+    pauses, collections, started = [], [0, 0, 0], [0.0]
+
+    def onCollect(phase, info):
+        if phase == "start":
+            started[0] = time.perf_counter()
+        else:
+            pauses.append(time.perf_counter() - started[0])
+            collections[info["generation"]] += 1
+
+    gc.collect()
+    gc.callbacks.append(onCollect)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        tick()
+    elapsed = time.perf_counter() - start
+    gc.callbacks.remove(onCollect)
+
+    results = {
+        "ticks/s": ticks / elapsed,
+        "gc (gen 0/1/2)": "/".join(map(str, collections)),
+        "gc total (ms)": sum(pauses) * 1000,
+        "gc max (ms)": max(pauses, default=0) * 1000,
+        "objets construits": constructed[0],
+        "rotations calculées": world.rotationCache.misses,
+    }
+
+    if traced:
+        tracemalloc.start()
+        gc.collect()
+        before = tracemalloc.get_traced_memory()[0]
+        transient = []
+        for _ in range(traced):
+            tracemalloc.reset_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            tick()
+            transient.append(tracemalloc.get_traced_memory()[1] - current)
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        results["alloué par tick (Ko)"] = sum(transient) / len(transient) / 1024
+        results["alloué max (Ko)"] = max(transient) / 1024
+        results["gardé (Ko)"] = (after - before) / 1024
+
+    Object.__init__ = objectInit
+    return results
+
+
+def measureTree(folder, ticks, traced):
+    """Lance la mesure dans un processus à part, dans le dossier donné
+    """
+    environment = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", str(ticks), str(traced)],
+                            cwd=folder, env=environment, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rev", help="révision git à comparer")
+    parser.add_argument("--ticks", type=int, default=36000, help="ticks mesurés pour le ramasse-miettes")
+    parser.add_argument("--traced", type=int, default=3600, help="ticks mesurés ensuite avec tracemalloc")
+    parser.add_argument("--child", nargs=2, type=int, help=argparse.SUPPRESS)
+    arguments = parser.parse_args()
+
+    if arguments.child:
+        print(json.dumps(simulate(*arguments.child)))
+        return
+
+    results = {"arbre actuel": measureTree(ROOT, arguments.ticks, arguments.traced)}
+    if arguments.rev:
+        with tempfile.TemporaryDirectory() as folder:
+            worktree = os.path.join(folder, "rev")
+            subprocess.run(["git", "worktree", "add", "--detach", worktree, arguments.rev], cwd=ROOT,
+                           check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                results[arguments.rev] = measureTree(worktree, arguments.ticks, arguments.traced)
+            finally:
+                subprocess.run(["git", "worktree", "remove", "--force", worktree], cwd=ROOT, check=True)
+
+    names = list(results)
+    print(f"{'':>22} | " + " | ".join(f"{name:>14}" for name in names))
+    for metric in results[names[0]]:
+        values = [results[name].get(metric, "") for name in names]
+        print(f"{metric:>22} | " + " | ".join(f"{value:>14.1f}" if isinstance(value, float) else f"{value:>14}"
+                                            for value in values))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""Benchmark du chargement des images : fichiers PNG/JPG décodés à chaque lancement, ou atlas préparé (lib/atlas.py)
+
+1. Chargement : l'ancien Images() (décodage, convert_alpha, redimensionnement, vaisseaux rouges non convertis),
+   plus les images du propulseur que Player rechargeait à chaque partie ; l'atlas à froid (construit puis
+   enregistré dans un dossier vide) et à chaud (pages projetées en mémoire puis converties).
+   Chaque image de l'atlas qui sert aux collisions (atlas.COLLIDING) doit donner un masque non vide au seuil de
+   RotationCache, sinon le script s'arrête en erreur.
+2. Débit des blits : chaque sprite, tourné par RotationCache comme en jeu, copié sur un écran 1920x1080
+   hors fenêtre, avec les anciennes images puis avec celles de l'atlas.
+Lancer depuis la racine du projet : python bench/assets.py
+"""
+
+import os
+import sys
+import glob
+import shutil
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from math import pi
+from statistics import median
+
+os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.getcwd())
+
+from lib import atlas
+from lib.rotation import MASK_THRESHOLD, RotationCache
+
+REPEATS = 5
+BLITS = 20000
+ANGLES = 36
+
+
+def loadFiles():
+    """Ancien chargement de Images() et de Player, image par image
+
+    Returns:
+        dict: {nom: image source utilisée par le jeu}
+    """
+    images = {}
+    images["player"] = pygame.transform.scale(
+        pygame.image.load("assets/playerSprites/Vaisseau.jpg").convert_alpha(), (64, 64))
+    for index, path in enumerate(sorted(glob.glob("assets/asteroids/asteroid*.png"))):
+        images[f"asteroid{index}"] = pygame.image.load(path).convert_alpha()
+    images["bullet"] = pygame.transform.scale(pygame.image.load("assets/bullet.png").convert_alpha(), (10, 10))
+    for index, path in enumerate(sorted(glob.glob("assets/explosionSprites/*.png"))):
+        images[f"explosion{index}"] = pygame.image.load(path).convert_alpha()
+    for name in ("redShooter", "redBlaster", "redSniper"):
+        images[name] = pygame.image.load(f"assets/redTeamSprites/{name}.png")
+    images.update(loadPlayerFiles())
+    return images
+
+
+def loadPlayerFiles():
+    """Images du propulseur et des canons, que l'ancien Player chargeait à chaque partie
+    """
+    images = {}
+    for pattern in ("vaisseau*.png", "firingvaisseau*.png", "firing.png"):
+        for index, path in enumerate(sorted(glob.glob(f"assets/playerSprites/{pattern}"))):
+            images[f"{pattern}{index}"] = pygame.transform.scale(pygame.image.load(path).convert_alpha(), (64, 64))
+    return images
+
+
+def timed(function):
+    """Temps médian de function(), en ms, et son dernier résultat
+    """
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return median(times) * 1000, result
+
+
+def blitRate(screen, image, scale=None):
+    """Nombre de blits par seconde de l'image tournée sur ANGLES angles, comme l'affichage du jeu
+    """
+    if scale is not None:
+        image = pygame.transform.scale(image, scale)
+    cache = RotationCache()
+    rotated = [cache.get(image, index * 2 * pi / ANGLES) for index in range(ANGLES)]
+
+    start = time.perf_counter()
+    for index in range(BLITS):
+        screen.blit(rotated[index % ANGLES], ((index * 37) % 1800, (index * 53) % 1000))
+    return BLITS / (time.perf_counter() - start)
+
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((1920, 1080))
+    folder = tempfile.mkdtemp()
+
+    try:
+        def cold():
+            shutil.rmtree(folder)
+            return atlas.load(folder)
+
+        files, old = timed(loadFiles)
+        player, _ = timed(loadPlayerFiles)
+        built, _ = timed(cold)
+        warm, (sprites, _) = timed(lambda: atlas.load(folder))
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    for name in atlas.COLLIDING:
+        for index, image in enumerate(sprites[name]):
+            assert pygame.mask.from_surface(image, MASK_THRESHOLD).count(), f"{name}[{index}] : masque vide"
+
+    print(f"{'chargement':>36} | ms")
+    print(f"{'fichiers, au lancement':>36} | {files:.1f}")
+    print(f"{'fichiers, propulseur à chaque partie':>36} | {player:.1f}")
+    print(f"{'atlas à froid (construit)':>36} | {built:.1f}")
+    print(f"{'atlas à chaud':>36} | {warm:.1f}")
+
+    print()
+    print(f"{'sprite':>12} | {'fichiers (blits/s)':>18} | {'atlas (blits/s)':>15}")
+    rows = (("player", old["player"], sprites["player"][0], None),
+            ("redShooter", old["redShooter"], sprites["redShooter"][0], None),
+            ("redSniper", old["redSniper"], sprites["redSniper"][0], None),
+            ("asteroid", old["asteroid0"], sprites["asteroids"][0], (90, 70)),
+            ("bullet", old["bullet"], sprites["bullet"][0], None))
+    for name, before, after, scale in rows:
+        print(f"{name:>12} | {blitRate(screen, before, scale):>18.0f} | {blitRate(screen, after, scale):>15.0f}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Benchmark des balles : un sprite Object par balle (ancienne méthode) contre BulletPool
+
+Scénario : le joueur, 50 astéroïdes et 6 vaisseaux rouges immobiles, et N balles réparties autour du joueur.
+Mesure par tick l'actualisation et les collisions des balles, puis leur affichage (écran 1920x1080).
+Lancer depuis la racine du projet : python bench/bullets.py
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from math import cos, sin
+from random import Random
+
+os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.getcwd())
+
+from lib.asteroid import Asteroid, randomState
+from lib.collision import BULLET, TEAM_PLAYER, TEAM_RED, resolve
+from lib.object import Object
+from lib.pipeline import Frame
+from lib.player import Player
+from lib.red.shooter import redShooter
+from lib.render import Renderer
+from lib.world import World
+
+COUNTS = (100, 1000, 5000)
+TICKS = 120
+
+
+class SpriteBullet(Object):
+    """Balle telle qu'elle était avant BulletPool : un Object complet
+    """
+
+    category = BULLET
+    team = TEAM_RED
+
+    def __init__(self, world, pos, forces, angle):
+        super().__init__(world, 1, pos, world.objects, world.images.bulletImage, 0.05)
+        self.forces = forces
+        self.angle = angle
+
+    def explode(self):
+        self.die()
+
+
+def newWorld(screen, count, sprites):
+    """Crée le scénario, avec count balles en sprites ou dans le pool
+    """
+    rng = Random(count)
+    world = World(screen, 1920, 1080, False, count)
+    world.renderer = Renderer(world)
+    world.player = Player(world, 300, (960, 540), world.ships, 500, 40)
+
+    imageCount = len(world.images.asteroidImages)
+    for _ in range(50):
+        Asteroid.restore(world, randomState(world.rng, imageCount, (960 + rng.randint(-1500, 1500),
+                                                                    540 + rng.randint(-1500, 1500))))
+    for _ in range(6):
+        world.ships.add(redShooter(world, (960 + rng.randint(-1500, 1500), 540 + rng.randint(-1500, 1500))))
+    for target in [*world.ships, *world.asteroids]:
+        target.update = target.rotate  # Cibles immobiles : seules les balles sont mesurées
+
+    world.spriteBullets = []
+    for _ in range(count):
+        angle = rng.uniform(-3.14, 3.14)
+        pos = (960 + rng.randint(-1500, 1500), 540 + rng.randint(-1500, 1500))
+        forces = [cos(angle) * 4, sin(angle) * 4]
+        if sprites:
+            world.spriteBullets.append(SpriteBullet(world, pos, forces, angle))
+        else:
+            world.bullets.spawn(pos, forces, angle, rng.choice((TEAM_PLAYER, TEAM_RED)))
+    return world
+
+
+def tickSprites(world):
+    """Ancienne méthode : chaque balle s'actualise, puis passe par la grille et le test des masques
+    """
+    for bullet in world.spriteBullets:
+        bullet.update()
+    world.spatialHash.rebuild(world.objects)
+    for instance, other in world.spatialHash.pairs():
+        if (isinstance(instance, SpriteBullet) or isinstance(other, SpriteBullet)) and \
+           not instance.dying and not other.dying:
+            if instance.contact(other) is not None:
+                resolve(world, instance, other)
+
+
+def tickPool(world):
+    """BulletPool : une actualisation vectorisée, puis le test groupé contre les cibles
+    """
+    world.bullets.update()
+    world.bullets.collide([*world.ships, *world.asteroids])
+
+
+def drawSprites(world):
+    camera = world.player.renderPosition(1.0)
+    frame = Frame(camera)
+    for bullet in world.spriteBullets:
+        bullet.snapshot(frame, 1.0, camera)
+    world.screen.blits(frame.sprites)
+
+
+def drawPool(world):
+    camera = world.player.renderPosition(1.0)
+    frame = Frame(camera)
+    world.bullets.snapshot(frame, 1.0, camera)
+    world.screen.blits(frame.bullets)
+
+
+def measure(world, tick, draw):
+    """Retourne (ms de simulation par tick, ms d'affichage par tick)
+    """
+    tickTime = drawTime = 0
+    for _ in range(TICKS):
+        start = time.perf_counter()
+        tick(world)
+        middle = time.perf_counter()
+        draw(world)
+        tickTime += middle - start
+        drawTime += time.perf_counter() - middle
+    return tickTime / TICKS * 1000, drawTime / TICKS * 1000
+
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((1920, 1080))
+
+    print(f"{'balles':>7} | {'sprites : tick (ms)':>19} | {'affichage (ms)':>14} | "
+          f"{'pool : tick (ms)':>16} | {'affichage (ms)':>14}")
+    for count in COUNTS:
+        spriteTimes = measure(newWorld(screen, count, True), tickSprites, drawSprites)
+        poolTimes = measure(newWorld(screen, count, False), tickPool, drawPool)
+        print(f"{count:>7} | {spriteTimes[0]:>19.2f} | {spriteTimes[1]:>14.2f} | "
+              f"{poolTimes[0]:>16.2f} | {poolTimes[1]:>14.2f}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
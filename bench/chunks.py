@@ -0,0 +1,137 @@
+"""Benchmark et vérification du monde en chunks (lib/chunks.py)
+
+1. Retour : le joueur part loin d'un coup (tout les chunks sont déchargés), puis revient : les astéroïdes retrouvés
+   doivent être exactement ceux laissés, sinon le script s'arrête en erreur. Même chose après un long voyage,
+   quand le LRU a oublié les chunks : ils sont alors tirés à nouveau, et doivent être ceux du premier tirage,
+   même quand le joueur revient pile sur l'un de ces astéroïdes et pas à son point d'apparition.
+2. Temps de chaque tick, et de ChunkMap.update() seul, pendant un vol en ligne droite à SPEED px par tick qui
+   franchit un bord de chunk toutes les CHUNK_SIZE / SPEED ticks : contenu tiré à l'avance par le thread pendant
+   l'attente de la frame suivante, ou au chargement.
+Lancer depuis la racine du projet : python bench/chunks.py
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.getcwd())
+
+from lib import game
+from lib.chunks import ChunkMap, CHUNK_SIZE, chunkOf
+from lib.player import Player
+
+SPEED = 40
+TICKS = 2000
+
+
+def newWorld(threaded=True):
+    """Monde sans affichage, joueur immobile au centre de l'écran logique, chunks autour de lui chargés
+    """
+    world = game.createWorld(True, 11)
+    world.chunks.close()
+    world.chunks = ChunkMap(world, threaded)
+    world.chunks.reset()
+    world.player = Player(world, 300, (world.screenWidth // 2, world.screenHeight // 2), world.ships, 500, 40)
+    world.chunks.update()
+    return world
+
+
+def teleport(world, x, y):
+    """Déplace le joueur d'un coup, et met les chunks à jour
+
+    Returns:
+        set: États des astéroïdes chargés une fois arrivé
+    """
+    world.player.x, world.player.y = x, y
+    world.chunks.update()
+    return {asteroid.state() for asteroid in world.asteroids}
+
+
+def check():
+    """Vérifie qu'un aller-retour retrouve les mêmes astéroïdes, gardés dans le LRU ou tirés à nouveau
+
+    Returns:
+        tuple: (astéroïdes au départ, chunks déchargés gardés dans le LRU)
+    """
+    world = newWorld()
+    home = world.player.x, world.player.y
+    start = {asteroid.state() for asteroid in world.asteroids}
+
+    teleport(world, home[0] + 10 * CHUNK_SIZE, home[1])
+    assert teleport(world, *home) == start, "aller-retour : astéroïdes différents au retour"
+
+    forget(world, home)
+    assert teleport(world, *home) == start, "chunks oubliés par le LRU : tirage différent"
+
+    target = min(start)  # Un astéroïde du départ : le joueur revient pile dessus
+    chunk = chunkOf(target[0], target[1])
+    forget(world, home)
+    arrived = teleport(world, target[0], target[1])
+    assert ({state for state in arrived if chunkOf(state[0], state[1]) == chunk} ==
+            {state for state in start if chunkOf(state[0], state[1]) == chunk}), \
+        "chunk tiré à nouveau avec le joueur ailleurs : tirage différent"
+    return len(start), len(world.chunks.unloaded)
+
+
+def forget(world, home):
+    """Voyage assez loin pour que le LRU oublie tout les chunks autour du départ
+    """
+    for step in range(1, 30):
+        teleport(world, home[0] + step * 5 * CHUNK_SIZE, home[1])
+    assert len(world.chunks.unloaded) <= world.chunks.maxUnloaded
+    assert not any(abs(chunkX) <= 2 and abs(chunkY) <= 2 for chunkX, chunkY in world.chunks.unloaded)
+    # Les chunks du départ ont été oubliés : ils sont tirés à nouveau au retour
+
+
+def flight(threaded):
+    """Vol en ligne droite : retourne les temps de chaque tick (game.updateGame()) et de ChunkMap.update(), triés, en ms
+    """
+    world = newWorld(threaded)
+    world.player.HP = world.player.maxHP = 10 ** 9
+    ticks, updates = [], []
+
+    chunksUpdate = world.chunks.update
+
+    def timedUpdate():
+        start = time.perf_counter()
+        chunksUpdate()
+        updates.append((time.perf_counter() - start) * 1000)
+    world.chunks.update = timedUpdate
+
+    for _ in range(TICKS):
+        world.player.x += SPEED
+        start = time.perf_counter()
+        game._randomTick(world)
+        game.updateGame(world)
+        ticks.append((time.perf_counter() - start) * 1000)
+        time.sleep(0.002)  # L'attente de la frame suivante : le thread tire le contenu des chunks pendant ce temps
+
+    world.chunks.close()
+    return sorted(ticks), sorted(updates)
+
+
+def main():
+    pygame.init()
+
+    count, kept = check()
+    print(f"Aller-retour : {count} astéroïdes retrouvés à l'identique, {kept} chunks déchargés gardés ; "
+          f"chunks oubliés tirés à nouveau à l'identique, où que soit le joueur")
+    print()
+
+    print(f"{'génération':>13} | {'':>13} | {'médiane (ms)':>12} | {'p99 (ms)':>8} | {'pire (ms)':>9}")
+    for threaded in (False, True):
+        for part, times in zip(("tick", "ChunkMap.update"), flight(threaded)):
+            name = "thread" if threaded else "au chargement"
+            print(f"{name:>13} | {part:>15} | {times[len(times) // 2]:>12.3f} | {times[int(len(times) * 0.99)]:>8.3f} | "
+                  f"{times[-1]:>9.3f}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
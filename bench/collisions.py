@@ -0,0 +1,84 @@
+"""Benchmark de la broad-phase des collisions : spritecollide contre tout le groupe, ou grille spatiale
+
+Les objets sont répartis dans la zone où ils vivent en jeu (willExpire : 1920 * 2 autour du joueur),
+avec les tailles des astéroïdes (50 à 90 px) et des balles (10 px).
+Lancer depuis la racine du projet : python bench/collisions.py
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from random import Random
+
+os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.getcwd())
+
+from lib.spatial import SpatialHash
+
+COUNTS = (100, 1000, 5000)
+RADIUS = 1920 * 2
+
+
+class Dummy(pygame.sprite.Sprite):
+    """Objet minimal : position et rect, comme Object
+    """
+
+    def __init__(self, rng, group):
+        super().__init__(group)
+        size = rng.randint(50, 90) if rng.random() < 0.3 else 10
+        self.x = rng.randint(-RADIUS, RADIUS)
+        self.y = rng.randint(-RADIUS, RADIUS)
+        self.rect = pygame.Rect(0, 0, size, size)
+        self.rect.center = (self.x, self.y)
+
+
+def naive(objects):
+    """Ancienne méthode de Object.collisionManage(), pour chaque objet. Retourne le nombre de paires
+    """
+    found = 0
+    for instance in list(objects):
+        objects.remove(instance)
+        found += len(pygame.sprite.spritecollide(instance, objects, False, pygame.sprite.collide_circle))
+        objects.add(instance)
+    return found // 2
+
+
+def hashed(objects, grid):
+    """Reconstruit la grille et génère chaque paire une fois. Retourne le nombre de paires
+    """
+    grid.rebuild(objects)
+    return sum(1 for _ in grid.pairs())
+
+
+def timeIt(function, repeat):
+    """Retourne (résultat, temps moyen en ms)
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return result, (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    print(f"{'objets':>7} | {'spritecollide (ms)':>19} | {'grille (ms)':>12} | paires")
+    for count in COUNTS:
+        objects = pygame.sprite.Group()
+        rng = Random(count)
+        for _ in range(count):
+            Dummy(rng, objects)
+
+        grid = SpatialHash()
+        naivePairs, naiveTime = timeIt(lambda: naive(objects), max(1, 1000 // count))
+        hashPairs, hashTime = timeIt(lambda: hashed(objects, grid), 20)
+
+        assert naivePairs == hashPairs, (naivePairs, hashPairs)
+        print(f"{count:>7} | {naiveTime:>19.2f} | {hashTime:>12.2f} | {hashPairs}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""Benchmark des réponses aux collisions : chaîne d'isinstance appelée dans les deux sens, ou table lib.collision
+
+Scénario : un champ d'astéroïdes dense (N astéroïdes serrés autour du joueur, avec 6 vaisseaux rouges),
+où beaucoup de paires se touchent. Les paires trouvées par la grille spatiale sont mesurées deux fois :
+la réponse seule, puis avec le test des masques (deux tests par paire avant, un seul maintenant).
+Les PV sont assez grands pour que personne ne meure pendant la mesure.
+Avant la mesure, vérifie les équipes : une balle rouge ne touche aucun vaisseau rouge, quelle que soit sa classe,
+mais touche le joueur et les astéroïdes, et une balle du joueur touche chaque classe de vaisseau rouge.
+Lancer depuis la racine du projet : python bench/dispatch.py
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+from math import hypot
+from random import Random
+
+os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.getcwd())
+
+from lib import game
+from lib.asteroid import Asteroid, randomState
+from lib.bullet import BulletPool
+from lib.collision import resolve, ENEMY, TEAM_PLAYER, TEAM_RED
+from lib.player import Player
+from lib.red.redTeam import redTeam
+from lib.red.shooter import redShooter
+from lib.red.sniper import redSniper
+from lib.red.blaster import redBlaster
+
+COUNTS = (200, 1000, 3000)
+REPEATS = 20
+
+
+def isinstanceResponse(self, other):
+    """Ancienne réponse de Object.collideWith(), du point de vue de self, appelée pour les deux objets de la paire
+    """
+    world = self.world
+    player = world.player
+
+    damage = hypot(self.forces[0] - other.forces[0], self.forces[1] - other.forces[1])
+
+    if isinstance(self, Player):
+        if other.HP - damage <= 0:
+            if isinstance(other, redTeam):
+                player.HP += 3
+                world.score += 25
+
+    if isinstance(self, Player):
+        self.shieldCounter = 300
+        if self.shieldHP > 0:
+            self.shieldHP -= damage
+            self.shieldAlphaCounter = 255
+            other.HP -= damage
+            return
+    elif isinstance(other, Player):
+        other.shieldCounter = 300
+        if other.shieldHP > 0:
+            other.shieldHP -= damage
+            other.shieldAlphaCounter = 255
+            self.HP -= damage
+            return
+
+    self.HP -= damage
+    other.HP -= damage
+
+
+def newWorld(count):
+    """Crée le champ d'astéroïdes, assez serré pour qu'environ un astéroïde sur deux en touche un autre
+    """
+    rng = Random(count)
+    world = game.createWorld(True, count)
+    world.player = Player(world, 300, (0, 0), world.ships, 500, 40)
+
+    spread = int((count * 60 * 60) ** 0.5)  # Environ un astéroïde de 60 px par case de 60 px
+    imageCount = len(world.images.asteroidImages)
+    for _ in range(count):
+        Asteroid.restore(world, randomState(world.rng, imageCount, (rng.randint(-spread, spread) // 2,
+                                                                    rng.randint(-spread, spread) // 2)))
+    for enemy in (redShooter, redSniper, redBlaster) * 2:
+        world.ships.add(enemy(world, (rng.randint(-200, 200), rng.randint(-200, 200))))
+
+    for instance in world.objects:
+        instance.HP = 10 ** 9
+        instance.rotate()
+    world.player.shieldHP = 10 ** 9
+    return world
+
+
+def checkTeams():
+    """Tire une balle de chaque équipe sur chaque cible et vérifie qui perd des PV, sinon arrête le script
+    """
+    world = game.createWorld(True, 0)
+    world.player = Player(world, 300, (0, 0), world.ships, 500, 40)
+    world.player.shieldHP = 0
+    targets = [enemy(world, (0, 0)) for enemy in (redShooter, redSniper, redBlaster)]
+    asteroid = Asteroid.restore(world, randomState(world.rng, len(world.images.asteroidImages), (0, 0)))
+    targets += [world.player, asteroid]
+
+    for team, name in ((TEAM_RED, "rouge"), (TEAM_PLAYER, "du joueur")):
+        for target in targets:
+            target.HP = 100
+            world.bullets = BulletPool(world)
+            world.bullets.spawn((target.x, target.y), (10, 0), 0, team)
+            world.bullets.hit(int(np.flatnonzero(world.bullets.alive)[0]), target)
+            friendly = target is world.player if team == TEAM_PLAYER else target.category == ENEMY
+            assert (target.HP == 100) == friendly, \
+                f"balle {name} sur {type(target).__name__} : {'dégâts entre alliés' if friendly else 'aucun dégât'}"
+
+
+def measure(count):
+    """Retourne (paires candidates, paires qui se touchent, µs par paire touchée pour chaque méthode)
+    """
+    world = newWorld(count)
+    world.spatialHash.rebuild(world.objects)
+    candidates = list(world.spatialHash.pairs())
+    touching = [pair for pair in candidates if pair[0].contact(pair[1]) is not None]
+
+    def chain():
+        for instance, other in touching:
+            isinstanceResponse(instance, other)
+            isinstanceResponse(other, instance)
+
+    def registry():
+        for instance, other in touching:
+            resolve(world, instance, other)
+
+    def chainWithMasks():
+        for instance, other in candidates:
+            if instance.contact(other) is not None:
+                isinstanceResponse(instance, other)
+            if other.contact(instance) is not None:
+                isinstanceResponse(other, instance)
+
+    def registryWithMasks():
+        for instance, other in candidates:
+            if instance.contact(other) is not None:
+                resolve(world, instance, other)
+
+    times = []
+    for function in (chain, registry, chainWithMasks, registryWithMasks):
+        start = time.perf_counter()
+        for _ in range(REPEATS):
+            function()
+        times.append((time.perf_counter() - start) / REPEATS / max(len(touching), 1) * 1e6)
+    return len(candidates), len(touching), times
+
+
+def main():
+    pygame.init()
+    checkTeams()
+
+    print(f"{'astéroïdes':>10} | {'candidates':>10} | {'touchées':>8} | {'isinstance (µs)':>15} | "
+          f"{'table (µs)':>10} | {'+ masques : isinstance':>22} | {'table':>6}")
+    for count in COUNTS:
+        candidates, touching, times = measure(count)
+        print(f"{count:>10} | {candidates:>10} | {touching:>8} | {times[0]:>15.2f} | {times[1]:>10.2f} | "
+              f"{times[2]:>22.2f} | {times[3]:>6.2f}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Benchmark des explosions pré-redimensionnées (Images.explosion()) : 30 astéroïdes qui explosent en même temps
+
+Scénario : écran 1920x1080 hors fenêtre, COUNT astéroïdes qui tournent autour du joueur immobile, tous à l'écran.
+Ils explosent tous au même tick, et l'explosion est suivie jusqu'au bout (une image toutes les 8 ticks), ROUNDS fois
+de suite avec de nouveaux astéroïdes : le cache des rotations reste chaud d'une vague à l'autre, comme en jeu.
+1. avant : l'image de l'explosion, à sa taille d'origine, est tournée à l'angle de l'objet à chaque tick (recopié ici)
+2. après : l'image à la taille de l'objet est affichée sans rotation
+Pour chacun : temps de rotation (Object.rotate()), du tick complet et du dessin, par tick, et rotations calculées.
+Lancer depuis la racine du projet : python bench/explosions.py
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from math import cos, sin, hypot, pi
+from random import Random
+
+os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.getcwd())
+
+from lib import game
+from lib.asteroid import Asteroid, randomState
+from lib.camera import FULL
+from lib.object import Object
+from lib.player import Player
+from lib.render import Renderer
+from lib.world import World
+
+COUNT = 30
+ROUNDS = 10
+
+
+def rotatedExplosion(self):
+    """Ancien Object.rotate() : l'image de l'explosion est tournée comme l'objet
+    """
+    self.angle += self.angleMomentum
+    self.direction.update((cos(self.angle), sin(self.angle)))
+    if self.lod != FULL:
+        return
+
+    if self.explosionFrame:
+        self.rotationSource = self.world.images.explosionImages[self.explosionFrame - 1]
+    else:
+        self.rotationSource = self.originalImage
+    self.radius = 0.5 * hypot(*self.rotationSource.get_size())
+    self.image = self.world.rotationCache.get(self.rotationSource, self.angle)
+    self.rect.size = self.image.get_size()
+
+
+def newWorld():
+    """Monde affiché hors fenêtre, joueur immobile au centre qui ne peut pas mourir
+    """
+    world = World(pygame.display.set_mode((1920, 1080)), 1920, 1080, False, 7)
+    world.renderer = Renderer(world)
+    game.genStars(world)
+    world.chunks.update = lambda: None
+    world.asteroids.empty()
+
+    world.player = Player(world, 300, (0, 0), world.ships, 500, 40)
+    world.player.HP = world.player.maxHP = 10 ** 9
+    return world
+
+
+def wave(world, rng):
+    """Fait apparaître COUNT astéroïdes à l'écran, qui tournent, et les fait tous exploser
+    """
+    imageCount = len(world.images.asteroidImages)
+    for _ in range(COUNT):
+        angle, distance = rng.uniform(-pi, pi), rng.uniform(150, 500)
+        asteroid = Asteroid.restore(world, randomState(world.rng, imageCount,
+                                                       (cos(angle) * distance, sin(angle) * distance)))
+        asteroid.angleMomentum = rng.uniform(-0.06, 0.06)
+        asteroid.HP = 0
+
+
+def measure(rotate):
+    """Retourne (ms de rotation par tick, ms de tick par tick, ms de dessin par tick, rotations calculées)
+    """
+    world = newWorld()
+    rng = Random(COUNT)
+    rotationTime = tickTime = drawTime = 0.0
+    ticks = 0
+
+    def timedRotate(self):
+        nonlocal rotationTime
+        start = time.perf_counter()
+        rotate(self)
+        rotationTime += time.perf_counter() - start
+
+    previous, Object.rotate = Object.rotate, timedRotate
+    manageEnemies, game.manageEnemies = game.manageEnemies, lambda world: None
+    try:
+        for _ in range(ROUNDS):
+            wave(world, rng)
+            while world.asteroids:
+                start = time.perf_counter()
+                game._randomTick(world)
+                game.updateGame(world)
+                world.tick += 1
+                middle = time.perf_counter()
+                game.drawGame(world, 1.0)
+                drawTime += time.perf_counter() - middle
+                tickTime += middle - start
+                ticks += 1
+    finally:
+        Object.rotate, game.manageEnemies = previous, manageEnemies
+
+    return (rotationTime / ticks * 1000, tickTime / ticks * 1000, drawTime / ticks * 1000,
+            world.rotationCache.misses)
+
+
+def main():
+    pygame.init()
+
+    print(f"{COUNT} astéroïdes qui explosent en même temps, {ROUNDS} vagues")
+    print(f"{'explosion':>25} | {'rotation (ms)':>13} | {'tick (ms)':>9} | {'dessin (ms)':>11} | {'rotations':>9}")
+    for name, rotate in (("tournée, taille d'origine", rotatedExplosion), ("pré-redimensionnée", Object.rotate)):
+        rotation, tick, draw, misses = measure(rotate)
+        print(f"{name:>25} | {rotation:>13.3f} | {tick:>9.3f} | {draw:>11.3f} | {misses:>9}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Benchmark de la couche du HUD (lib/hud.py) : textes et barres gardés une fois rendus, blittés en une passe
+
+Scénario : écran 1920x1080 hors fenêtre, 6 vaisseaux rouges autour du joueur qui tourne en tirant et ne peut pas
+mourir (ses PV sont remis au maximum à chaque tick), puis l'écran de fin de partie. Chaque frame est dessinée
+normalement, puis son HUD est redessiné deux fois et mesuré : avant, avec pygame.draw.rect et Font.render_to à
+chaque frame (recopiés ici), et après, avec Hud.
+Les deux donnent les mêmes pixels, sinon le script s'arrête en erreur.
+Lancer depuis la racine du projet : python bench/hud.py
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from collections import defaultdict
+from math import cos, sin, pi
+from random import Random
+
+os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.getcwd())
+
+from lib import game
+from lib.player import Player, hudGauges
+from lib.red.shooter import redShooter
+from lib.red.sniper import redSniper
+from lib.red.blaster import redBlaster
+from lib.render import Renderer
+from lib.ship import hudHealthbar
+from lib.world import World
+
+ENEMIES = 6
+FRAMES = 600
+
+
+def drawBefore(world, frame):
+    """Ancien HUD : barres et textes dessinés directement sur l'écran, à chaque frame
+    """
+    screen, myFont, mark = world.screen, world.myFont, world.renderer.mark
+
+    for drawRectPos, maxHP, HP in frame.bars:
+        mark(pygame.draw.rect(screen, (190, 30, 30), (drawRectPos, (maxHP / 10, 5))))
+        pygame.draw.rect(screen, (0, 255, 0), (drawRectPos, (HP / 10, 5)))
+
+    if frame.gauges is not None:
+        drawRectPos, maxHP, fuel, ammo, shield = frame.gauges
+        pygame.draw.rect(screen, (255, 0, 255), (drawRectPos, (fuel * (maxHP / 10), 2)))
+        mark(myFont.render_to(screen, (drawRectPos[0] - 10, drawRectPos[1]), f"{ammo}", fgcolor=(255, 255, 255),
+                              size=10))
+        pygame.draw.rect(screen, (0, 70, 255), ((drawRectPos[0], drawRectPos[1] + 2), (shield * (maxHP / 10), 3)))
+
+    if frame.gameOver is not None:
+        score, highscore = frame.gameOver
+        width, height = world.centered_screenWidth, world.centered_screenHeight
+        mark(myFont.render_to(screen, (width * 0.5, height * 0.5), "GAME OVER", fgcolor=(200, 30, 30), size=165))
+        mark(myFont.render_to(screen, (width // 1.5, height), f"Your score is {score}", fgcolor=(30, 100, 120),
+                              size=40))
+        if score > highscore:
+            mark(myFont.render_to(screen, (width // 1.5, height * 1.2), f"New highscore ! Previous was {highscore}",
+                                  fgcolor=(30, 100, 120), size=40))
+        else:
+            mark(myFont.render_to(screen, (width // 1.5, height * 1.2), f"Highscore : {highscore}",
+                                  fgcolor=(30, 150, 120), size=40))
+        mark(myFont.render_to(screen, (width // 1.5, height * 1.4), "Press enter to restart", fgcolor=(30, 100, 120),
+                              size=60))
+
+
+def drawAfter(world, frame):
+    """HUD actuel, comme game.renderFrame()
+    """
+    hud = [hudHealthbar(world, bar) for bar in frame.bars]
+    if frame.gauges is not None:
+        hud += hudGauges(world, frame.gauges)
+    if frame.gameOver is not None:
+        hud += game.hudGameOver(world, *frame.gameOver)
+    world.hud.draw(world, hud)
+
+
+def newWorld():
+    """Monde affiché hors fenêtre, joueur au centre, 6 vaisseaux rouges autour, à l'écran
+    """
+    world = World(pygame.display.set_mode((1920, 1080)), 1920, 1080, False, ENEMIES)
+    world.renderer = Renderer(world)
+    game.genStars(world)
+    world.chunks.update = lambda: None
+
+    world.player = Player(world, 300, (0, 0), world.ships, 500, 40)
+
+    rng = Random(ENEMIES)
+    enemies = (redShooter, redSniper, redBlaster)
+    for index in range(ENEMIES):
+        angle, distance = rng.uniform(-pi, pi), rng.uniform(200, 450)
+        enemies[index % len(enemies)](world, (cos(angle) * distance, sin(angle) * distance))
+    return world
+
+
+def measure(world, gameOver):
+    """Retourne les temps du HUD par frame, triés, en ms : (avant, après)
+    """
+    before, after = [], []
+    screen = world.screen
+
+    for _ in range(FRAMES):
+        if not gameOver:
+            world.key = defaultdict(bool)
+            world.key[pygame.K_SPACE] = True
+            world.key[pygame.K_LEFT] = world.tick % 120 < 40
+            game._randomTick(world)
+            game.updateGame(world)
+            world.tick += 1
+            world.player.HP = world.player.maxHP  # Le joueur ne meurt pas, et sa barre garde sa taille
+        world.restart = gameOver
+
+        frame = game.snapshotGame(world, 1.0)
+        game.renderFrame(world, frame)
+        background = screen.copy()
+
+        world.renderer.beginFrame(frame.camera)
+        screen.blit(background, (0, 0))
+        start = time.perf_counter()
+        drawBefore(world, frame)
+        before.append((time.perf_counter() - start) * 1000)
+        expected = pygame.image.tobytes(screen, "RGB")
+
+        screen.blit(background, (0, 0))
+        start = time.perf_counter()
+        drawAfter(world, frame)
+        after.append((time.perf_counter() - start) * 1000)
+        assert pygame.image.tobytes(screen, "RGB") == expected, "le HUD en cache ne donne pas les mêmes pixels"
+        world.renderer.endFrame()
+
+    return sorted(before), sorted(after)
+
+
+def main():
+    pygame.init()
+
+    world = newWorld()
+    manageEnemies, game.manageEnemies = game.manageEnemies, lambda world: None
+    try:
+        results = [("6 ennemis", *measure(world, False))]
+        world.score, world.highscore = 1250, 900
+        results.append(("fin de partie", *measure(world, True)))
+    finally:
+        game.manageEnemies = manageEnemies
+
+    print(f"{'écran':>13} | {'avant méd. (ms)':>15} | {'p99 (ms)':>8} | {'après méd. (ms)':>15} | {'p99 (ms)':>8}")
+    for name, before, after in results:
+        print(f"{name:>13} | {before[len(before) // 2]:>15.3f} | {before[int(len(before) * 0.99)]:>8.3f} | "
+              f"{after[len(after) // 2]:>15.3f} | {after[int(len(after) * 0.99)]:>8.3f}")
+    print(f"Rendus en {2 * FRAMES} frames : {world.hud.textBuilds} textes, {world.hud.barBuilds} barres")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
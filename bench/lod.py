@@ -0,0 +1,103 @@
+"""Benchmark du niveau de détail de la caméra (lib/camera.py) : tout simuler en entier, ou seulement près de l'écran
+
+Scénario : N astéroïdes apparus autour du joueur immobile, jusqu'à 1800 px, assez de PV pour que personne ne meure.
+Les chunks ne sont pas mis à jour pendant la mesure : le nombre d'astéroïdes reste N. Chaque scénario tourne sans affichage, puis avec le rendu
+complet sur un écran 1920x1080 hors fenêtre. Sans niveau de détail, la marge de la caméra est infinie :
+tout les objets sont simulés en entier, comme avant.
+Lancer depuis la racine du projet : python bench/lod.py
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from math import cos, sin, pi
+from random import Random
+
+os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.getcwd())
+
+from lib import game
+from lib.asteroid import Asteroid, randomState
+from lib.camera import TIER_NAMES
+from lib.player import Player
+from lib.render import Renderer
+from lib.world import World
+
+COUNTS = (200, 500, 1000)
+TICKS = 300
+SPREAD = 1800
+
+
+def newWorld(count, headless, margin):
+    """Crée le champ d'astéroïdes autour du joueur
+
+    Args:
+        count (int): Nombre d'astéroïdes
+        headless (bool): Si True, simulation seule
+        margin (float): Marge de la caméra, float("inf") pour tout simuler en entier
+    """
+    if headless:
+        world = game.createWorld(True, count)
+    else:
+        world = World(pygame.display.set_mode((1920, 1080)), 1920, 1080, False, count)
+        world.renderer = Renderer(world)
+        game.genStars(world)
+    world.camera.margin = margin
+    world.chunks.update = lambda: None
+
+    world.player = Player(world, 300, (0, 0), world.ships, 500, 40)
+    world.player.HP = world.player.maxHP = 10 ** 9
+
+    rng = Random(count)
+    imageCount = len(world.images.asteroidImages)
+    for _ in range(count):
+        angle, distance = rng.uniform(-pi, pi), SPREAD * rng.random() ** 0.5
+        asteroid = Asteroid.restore(world, randomState(world.rng, imageCount,
+                                                       (cos(angle) * distance, sin(angle) * distance)))
+        asteroid.HP = 10 ** 9
+    return world
+
+
+def measure(count, headless, margin):
+    """Retourne (ms par tick, nombre moyen d'objets dans chaque niveau de détail)
+    """
+    world = newWorld(count, headless, margin)
+    totals = [0] * len(TIER_NAMES)
+
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        game._randomTick(world)
+        game.updateGame(world)
+        world.tick += 1
+        if not headless:
+            game.drawGame(world, 1.0)
+        for tier, tierCount in enumerate(world.camera.counts):
+            totals[tier] += tierCount
+    elapsed = time.perf_counter() - start
+
+    return elapsed / TICKS * 1000, [total / TICKS for total in totals]
+
+
+def main():
+    pygame.init()
+
+    tiers = " / ".join(TIER_NAMES)
+    print(f"{'astéroïdes':>10} | {'mode':>9} | {'sans LOD (ms/tick)':>18} | {'avec LOD (ms/tick)':>18} | objets {tiers}")
+    for count in COUNTS:
+        for headless in (True, False):
+            full, _ = measure(count, headless, float("inf"))
+            lod, counts = measure(count, headless, 256)
+            mode = "headless" if headless else "offscreen"
+            print(f"{count:>10} | {mode:>9} | {full:>18.2f} | {lod:>18.2f} | "
+                  f"{' / '.join(f'{value:.0f}' for value in counts)}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Benchmark de la mémoire des entités : 5000 astéroïdes et vaisseaux rouges vivants dans un monde sans affichage
+
+Mesure avec tracemalloc la mémoire Python gardée par la création des entités (octets par entité), puis
+la mémoire allouée pendant une seconde de jeu (60 ticks d'actualisation, sans collisions pour que toutes
+restent en vie), et la mémoire résidente (RSS) du processus à la fin.
+Avec --rev, mesure aussi une autre révision git dans un worktree temporaire (elle doit avoir lib.game.createWorld).
+
+Lancer depuis la racine du projet : python bench/memory.py [--rev <révision>] [--entities N]
+"""
+
+import os
+import sys
+import gc
+import json
+import argparse
+import tempfile
+import subprocess
+
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+SEED = 13
+TICKS = 60
+SHIPS_RATIO = 10  # Un vaisseau rouge pour SHIPS_RATIO - 1 astéroïdes
+
+
+def residentMemory():
+    """Mémoire résidente du processus, en Ko
+
+    Returns:
+        int: VmRSS sous Linux, sinon le pic donné par resource
+    """
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def measure(entities):
+    """Crée les entités dans l'arbre du dossier courant et retourne les mesures
+
+    Args:
+        entities (int): Nombre d'entités vivantes à créer
+    """
+    import tracemalloc
+    from collections import defaultdict
+
+    import pygame
+
+    sys.path.insert(0, os.getcwd())
+    from lib import game
+    from lib.asteroid import Asteroid, randomState
+    from lib.player import Player
+    from lib.red.shooter import redShooter
+
+    pygame.init()
+    world = game.createWorld(True, SEED)
+    world.player = Player(world, 300, (world.screenWidth // 2, world.screenHeight // 2), world.ships, 500, 40)
+    world.key = defaultdict(bool)
+    rng = world.rng
+
+    def position():
+        return (world.player.x + rng.randint(-1200, 1200), world.player.y + rng.randint(-1200, 1200))
+
+    def asteroid():
+        return Asteroid.restore(world, randomState(rng, len(world.images.asteroidImages), position()))
+
+    for _ in range(SHIPS_RATIO):
+        redShooter(world, position()).kill()
+        asteroid().kill()
+    # Premières entités jetées : les images et caches partagés ne comptent pas dans la mesure
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+
+    for index in range(entities):
+        if index % SHIPS_RATIO:
+            asteroid()
+        else:
+            world.ships.add(redShooter(world, position()))
+
+    gc.collect()
+    created = tracemalloc.get_traced_memory()[0]
+
+    for _ in range(TICKS):
+        world.objects.update()
+        world.tick += 1
+    # Sans manageCollisions() : aucune entité ne meurt pendant la mesure
+
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    alive = len(world.asteroids) + len(world.ships) - 1
+    return {
+        "entités vivantes": alive,
+        "octets / entité": (created - before) / entities,
+        "alloué par tick (Ko)": (after - created) / TICKS / 1024,
+        "RSS total (Mo)": residentMemory() / 1024,
+    }
+
+
+def measureTree(folder, entities):
+    """Lance la mesure dans un processus à part, dans le dossier donné
+    """
+    environment = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", str(entities)],
+                            cwd=folder, env=environment, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rev", help="révision git à comparer")
+    parser.add_argument("--entities", type=int, default=5000, help="nombre d'entités vivantes")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    arguments = parser.parse_args()
+
+    if arguments.child:
+        print(json.dumps(measure(arguments.child)))
+        return
+
+    results = {"arbre actuel": measureTree(ROOT, arguments.entities)}
+    if arguments.rev:
+        with tempfile.TemporaryDirectory() as folder:
+            worktree = os.path.join(folder, "rev")
+            subprocess.run(["git", "worktree", "add", "--detach", worktree, arguments.rev], cwd=ROOT,
+                           check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                results[arguments.rev] = measureTree(worktree, arguments.entities)
+            finally:
+                subprocess.run(["git", "worktree", "remove", "--force", worktree], cwd=ROOT, check=True)
+
+    names = list(results)
+    print(f"{'':>22} | " + " | ".join(f"{name:>14}" for name in names))
+    for metric in results[names[0]]:
+        values = [results[name].get(metric, "") for name in names]
+        print(f"{metric:>22} | " + " | ".join(f"{value:>14.1f}" if isinstance(value, float) else f"{value:>14}"
+                                            for value in values))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
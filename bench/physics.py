@@ -0,0 +1,152 @@
+"""Benchmark et vérification de la physique des chocs : balles rapides (tunneling) et coût par tick
+
+1. Tunneling : des balles sont tirées vers un astéroïde immobile, sur plusieurs lignes qui le traversent, à des
+   vitesses de 10 à 240 px par tick (redSniper tire à 90, plus la vitesse du vaisseau). Compte les balles
+   arrêtées par l'astéroïde avec BulletPool.collide() (trajet complet) et avec l'ancien test du seul point
+   d'arrivée. À toutes les vitesses, les lignes touchées doivent être exactement celles qui croisent le masque de
+   l'astéroïde, et il doit y en avoir : sinon le script s'arrête en erreur.
+2. Coût par tick de manageCollisions() (grille, masques, normales, réponses, rebonds, puis balles) dans un champ
+   de 50 astéroïdes et 6 vaisseaux rouges, avec 0, 500 ou 2000 balles en jeu.
+Lancer depuis la racine du projet : python bench/physics.py
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from math import cos, sin, pi
+from random import Random
+
+os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.getcwd())
+
+from lib import game
+from lib.asteroid import Asteroid, randomState
+from lib.collision import TEAM_RED
+from lib.player import Player
+from lib.red.shooter import redShooter
+from lib.red.sniper import redSniper
+from lib.red.blaster import redBlaster
+
+SPEEDS = (10, 40, 90, 150, 240)
+LANES = range(-40, 41, 4)  # Décalage vertical de chaque ligne de tir par rapport au centre de l'astéroïde
+BULLETS = (0, 500, 2000)
+TICKS = 300
+
+
+def newWorld(seed):
+    """Monde sans affichage, avec le joueur immobile au centre
+    """
+    world = game.createWorld(True, seed)
+    world.player = Player(world, 300, (0, 0), world.ships, 500, 40)
+    world.player.HP = world.player.maxHP = 10 ** 9
+    return world
+
+
+def pointHit(world, asteroid, x, y):
+    """Ancien test : la balle touche si le pixel du masque sous sa position actuelle est plein
+    """
+    mask = world.rotationCache.getMask(asteroid.rotationSource, asteroid.angle)
+    width, height = mask.get_size()
+    maskX, maskY = int(x) - int(asteroid.x - width / 2), int(y) - int(asteroid.y - height / 2)
+    return 0 <= maskX < width and 0 <= maskY < height and bool(mask.get_at((maskX, maskY)))
+
+
+def target(world):
+    """Astéroïde immobile, qui ne peut pas mourir, à 600 px du départ des balles
+    """
+    asteroid = Asteroid.restore(world, randomState(world.rng, len(world.images.asteroidImages), (600, 0)))
+    asteroid.forces = [0, 0]
+    asteroid.angleMomentum = 0
+    asteroid.HP = 10 ** 9
+    asteroid.rotate()
+    asteroid.previousX, asteroid.previousY = asteroid.x, asteroid.y
+    return asteroid
+
+
+def crossing():
+    """Nombre de lignes de tir qui croisent au moins un pixel plein du masque de l'astéroïde
+    """
+    world = newWorld(1)
+    asteroid = target(world)
+    mask = world.rotationCache.getMask(asteroid.rotationSource, asteroid.angle)
+    width, height = mask.get_size()
+    top = int(asteroid.y - height / 2)
+    return sum(0 <= lane - top < height and any(mask.get_at((x, lane - top)) for x in range(width)) for lane in LANES)
+
+
+def tunneling(speed):
+    """Tire une balle par ligne à la vitesse donnée. Retourne (lignes touchées avec le trajet, avec le point seul)
+    """
+    swept = pointOnly = 0
+    for lane in LANES:
+        world = newWorld(1)
+        asteroid = target(world)
+
+        world.bullets.spawn((0, lane), [speed, 0], 0.0, TEAM_RED)
+        touched = False
+        while world.bullets.count and world.bullets.x[0] < 1200:
+            world.bullets.update()
+            if not world.bullets.count:
+                break
+            touched = touched or pointHit(world, asteroid, world.bullets.x[0], world.bullets.y[0])
+            world.bullets.collide([asteroid])
+
+        swept += asteroid.HP < 10 ** 9
+        pointOnly += touched
+    return swept, pointOnly
+
+
+def stageCost(bullets):
+    """Temps moyen de manageCollisions() par tick, en ms, avec le nombre de balles donné maintenu en jeu
+    """
+    rng = Random(bullets)
+    world = newWorld(2)
+    imageCount = len(world.images.asteroidImages)
+    for _ in range(50):
+        Asteroid.restore(world, randomState(world.rng, imageCount, (rng.randint(-900, 900), rng.randint(-900, 900))))
+    for enemy in (redShooter, redSniper, redBlaster) * 2:
+        world.ships.add(enemy(world, (rng.randint(-900, 900), rng.randint(-900, 900))))
+
+    elapsed = 0
+    for _ in range(TICKS):
+        while world.bullets.count < bullets:
+            angle = rng.uniform(-pi, pi)
+            world.bullets.spawn((rng.randint(-900, 900), rng.randint(-900, 900)),
+                                [cos(angle) * 60, sin(angle) * 60], angle, TEAM_RED)
+        for instance in world.objects:
+            instance.HP = 10 ** 9  # Personne ne meurt : le nombre d'objets reste le même
+        world.bullets.update()
+        world.objects.update()
+
+        start = time.perf_counter()
+        game.manageCollisions(world)
+        elapsed += time.perf_counter() - start
+    return elapsed / TICKS * 1000
+
+
+def main():
+    pygame.init()
+
+    print(f"{'vitesse (px/tick)':>17} | {'lignes':>6} | {'trajet complet':>14} | {'point seul':>10}")
+    reference = crossing()
+    assert reference > 0, "aucune ligne ne croise le masque de l'astéroïde : il est vide"
+    for speed in SPEEDS:
+        swept, pointOnly = tunneling(speed)
+        print(f"{speed:>17} | {len(LANES):>6} | {swept:>14} | {pointOnly:>10}")
+        assert swept == reference, f"{swept} ligne(s) touchée(s) à {speed} px/tick, {reference} croisent l'astéroïde"
+
+    print()
+    print(f"{'balles':>6} | manageCollisions (ms / tick)")
+    for bullets in BULLETS:
+        print(f"{bullets:>6} | {stageCost(bullets):.3f}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
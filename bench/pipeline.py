@@ -0,0 +1,122 @@
+"""Benchmark du dessin dans un thread à part (lib/pipeline.py)
+
+Scénario : écran 1920x1080 hors fenêtre, N vaisseaux rouges en anneau autour du joueur qui tourne en tirant et ne
+peut pas mourir, aucun ennemi n'apparaît pendant la mesure. FRAMES frames d'un tick chacune, sans limite de framerate :
+1. séquentiel : tick puis game.drawGame(), comme avant ;
+2. thread : tick, copie de la frame (game.snapshotGame()) puis RenderThread.submit(), le thread dessine à côté.
+Pour chacun : temps du thread principal par frame (médiane et p99), temps de dessin médian, frames dessinées et
+frames remplacées par une plus récente avant d'être dessinées, débit total en frames dessinées par seconde.
+Le gain ne vient que si le thread de dessin a un cœur à lui : sur une machine à un cœur, les deux se partagent le même.
+Lancer depuis la racine du projet : python bench/pipeline.py
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from collections import defaultdict
+from math import cos, sin, pi
+from random import Random
+
+os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.getcwd())
+
+from lib import game
+from lib.pipeline import RenderThread
+from lib.player import Player
+from lib.red.shooter import redShooter
+from lib.red.sniper import redSniper
+from lib.red.blaster import redBlaster
+from lib.render import Renderer
+from lib.world import World
+
+COUNTS = (6, 30)
+FRAMES = 600
+
+
+def newWorld(count):
+    """Monde affiché hors fenêtre, joueur au centre, N vaisseaux rouges autour, à l'écran ou presque
+    """
+    world = World(pygame.display.set_mode((1920, 1080)), 1920, 1080, False, count)
+    world.renderer = Renderer(world)
+    game.genStars(world)
+    world.chunks.update = lambda: None
+
+    world.player = Player(world, 300, (0, 0), world.ships, 500, 40)
+    world.player.HP = world.player.maxHP = 10 ** 9
+
+    rng = Random(count)
+    enemies = (redShooter, redSniper, redBlaster)
+    for index in range(count):
+        angle, distance = rng.uniform(-pi, pi), rng.uniform(300, 900)
+        enemies[index % len(enemies)](world, (cos(angle) * distance, sin(angle) * distance))
+    return world
+
+
+def tick(world):
+    """Un tick de jeu, le joueur tourne en tirant
+    """
+    world.key = defaultdict(bool)
+    world.key[pygame.K_SPACE] = True
+    world.key[pygame.K_LEFT] = world.tick % 120 < 40
+    game._randomTick(world)
+    game.updateGame(world)
+    world.tick += 1
+
+
+def measure(count, threaded):
+    """Retourne (temps du thread principal par frame triés en ms, temps de dessin triés en ms, frames dessinées,
+    frames remplacées, durée totale en s)
+    """
+    world = newWorld(count)
+    manageEnemies, game.manageEnemies = game.manageEnemies, lambda world: None
+    pipeline = RenderThread(world, game.renderFrame, FRAMES) if threaded else None
+    frames, renders = [], []
+
+    try:
+        start = time.perf_counter()
+        for _ in range(FRAMES):
+            frameStart = time.perf_counter()
+            tick(world)
+            if threaded:
+                pipeline.submit(game.snapshotGame(world, 1.0))
+            else:
+                renderStart = time.perf_counter()
+                game.drawGame(world, 1.0)
+                renders.append((time.perf_counter() - renderStart) * 1000)
+            frames.append((time.perf_counter() - frameStart) * 1000)
+        if threaded:
+            pipeline.close()  # Dessine la dernière frame
+        elapsed = time.perf_counter() - start
+    finally:
+        game.manageEnemies = manageEnemies
+
+    if threaded:
+        renders = [renderTime * 1000 for renderTime in pipeline.renderTimes]
+        return sorted(frames), sorted(renders), len(renders), pipeline.dropped, elapsed
+    return sorted(frames), sorted(renders), FRAMES, 0, elapsed
+
+
+def main():
+    pygame.init()
+    print(f"{os.cpu_count()} cœur(s)")
+
+    print(f"{'vaisseaux':>9} | {'dessin':>11} | {'principal méd. (ms)':>19} | {'p99 (ms)':>8} | "
+          f"{'dessin méd. (ms)':>16} | {'dessinées':>9} | {'remplacées':>10} | {'frames/s':>8}")
+    for count in COUNTS:
+        for threaded in (False, True):
+            frames, renders, drawn, dropped, elapsed = measure(count, threaded)
+            name = "thread" if threaded else "séquentiel"
+            print(f"{count:>9} | {name:>11} | {frames[len(frames) // 2]:>19.2f} | "
+                  f"{frames[int(len(frames) * 0.99)]:>8.2f} | {renders[len(renders) // 2]:>16.2f} | {drawn:>9} | "
+                  f"{dropped:>10} | {drawn / elapsed:>8.1f}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark de l'affichage : tout l'écran à chaque frame (Renderer) ou zones modifiées seulement (DirtyRenderer)
+
+Deux scénarios par résolution, avec la même graine : le joueur immobile (la caméra ne bouge pas,
+seuls les objets changent) et le joueur qui accélère (les étoiles bougent presque à chaque frame).
+Chaque frame du DirtyRenderer est comparée pixel par pixel à un rendu complet de la même scène.
+Le rendu complet est aussi mesuré à des résolutions de rendu plus basses (World.setRenderScale).
+Lancer depuis la racine du projet : python bench/render.py
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from collections import defaultdict
+
+os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.getcwd())
+
+from lib import game
+from lib.player import Player
+from lib.render import Renderer, DirtyRenderer
+from lib.world import World
+
+RESOLUTIONS = ((1920, 1080), (3840, 2160))
+SCENARIOS = {"immobile": (), "propulseur": (pygame.K_UP, pygame.K_LEFT)}
+TICKS = 300
+SCALES = (1 / 2, 1 / 3)  # Arrondies à 1 / n par World.setRenderScale()
+SEED = 1
+
+
+def newWorld(screen, rendererType, keys, scale):
+    """Crée un monde prêt à jouer, avec le moteur d'affichage donné et les touches appuyées à chaque tick
+    """
+    world = World(screen, screen.get_width(), screen.get_height(), False, SEED)
+    game.genStars(world)
+    world.renderer = rendererType(world)
+    world.setRenderScale(scale)
+    world.player = Player(world, 300, (world.screenWidth // 2, world.screenHeight // 2), world.ships, 500, 40)
+    world.player.HP = world.player.maxHP = 10 ** 6  # La partie ne doit pas s'arrêter pendant la mesure
+
+    world.key = defaultdict(bool)
+    for key in keys:
+        world.key[key] = True
+    return world
+
+
+def run(screen, rendererType, keys, scale=1.0, reference=None):
+    """Simule et affiche TICKS frames. Retourne (ms par frame, pixels envoyés par frame, frames complètes)
+
+    Args:
+        reference (Surface, optional): Si donnée, chaque frame est comparée à un rendu complet sur cette surface
+    """
+    world = newWorld(screen, rendererType, keys, scale)
+    if reference is not None:
+        full = Renderer(world)
+
+    drawTime = 0
+    for _ in range(TICKS):
+        game._randomTick(world)
+        game.updateGame(world)
+
+        start = time.perf_counter()
+        game.drawGame(world, 1.0)
+        drawTime += time.perf_counter() - start
+
+        if reference is not None:
+            renderer, world.renderer, world.screen, world.display = world.renderer, full, reference, reference
+            game.drawGame(world, 1.0)
+            world.renderer, world.screen, world.display = renderer, screen, screen
+            # Le HUD est dessiné sur world.display : la référence le remplace aussi
+            assert screen.get_view("2").raw == reference.get_view("2").raw, "rendu partiel différent"
+
+    renderer = world.renderer
+    return drawTime / TICKS * 1000, renderer.totalPixelsPushed / renderer.frames, renderer.fullFrames
+
+
+def main():
+    pygame.init()
+    check = "--no-check" not in sys.argv
+
+    print(f"{'résolution':>10} | {'scénario':>10} | {'moteur':>12} | {'ms / frame':>10} | "
+          f"{'pixels / frame':>14} | frames complètes")
+    for width, height in RESOLUTIONS:
+        screen = pygame.display.set_mode((width, height))
+        reference = screen.copy() if check else None
+
+        for name, keys in SCENARIOS.items():
+            runs = [("plein", Renderer, 1.0, None), ("partiel", DirtyRenderer, 1.0, reference)]
+            runs += [(f"plein 1/{round(1 / scale)}", Renderer, scale, None) for scale in SCALES]
+
+            for label, rendererType, scale, check in runs:
+                frameTime, pixels, fullFrames = run(screen, rendererType, keys, scale, check)
+                print(f"{f'{width}x{height}':>10} | {name:>10} | {label:>12} | {frameTime:>10.2f} | "
+                      f"{pixels:>14.0f} | {fullFrames} / {TICKS}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark des rotations : pygame.transform.rotate à chaque tick contre RotationCache
+
+Scénario : 50 astéroïdes, 6 vaisseaux et 200 balles qui tournent comme dans Object.rotate().
+Lancer depuis la racine du projet : python bench/rotation.py
+"""
+
+import os
+import sys
+import glob
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from math import degrees
+from random import Random
+
+os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.getcwd())
+
+from lib.rotation import RotationCache
+
+TICKS = 600
+
+
+def buildScene(rng):
+    """Retourne une liste [image, angle, angleMomentum] pour chaque objet du scénario
+    """
+    asteroidImages = [pygame.image.load(i).convert_alpha() for i in glob.glob("assets/asteroids/asteroid*.png")]
+    bulletImage = pygame.transform.scale(pygame.image.load("assets/bullet.png").convert_alpha(), (10, 10))
+    shipImages = [pygame.image.load(i).convert_alpha() for i in glob.glob("assets/redTeamSprites/*.png")]
+
+    scene = []
+    for _ in range(50):
+        size = rng.randint(50, 90)
+        image = pygame.transform.scale(rng.choice(asteroidImages), (size, int(size * rng.uniform(0.7, 1.3))))
+        scene.append([image, rng.uniform(-3, 3), rng.uniform(-0.05, 0.05)])
+    for _ in range(6):
+        scene.append([rng.choice(shipImages), rng.uniform(-3, 3), rng.uniform(-0.02, 0.02)])
+    for _ in range(200):
+        scene.append([bulletImage, rng.uniform(-3, 3), 0.0])
+
+    return scene
+
+
+def run(scene, rotate):
+    """Fait tourner la scène pendant TICKS ticks, retourne le coût moyen par tick en ms
+    """
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        for sprite in scene:
+            sprite[1] += sprite[2]
+            rotate(sprite[0], sprite[1])
+    return (time.perf_counter() - start) / TICKS * 1000
+
+
+def main():
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    scene = buildScene(Random(1))
+
+    before = run([list(s) for s in scene], lambda image, angle: pygame.transform.rotate(image, - degrees(angle)))
+
+    print(f"avant : {before:.3f} ms/tick")
+
+    for buckets in (360, 720):
+        for maxBytes in (64 * 1024 ** 2, 1024 ** 3):
+            cache = RotationCache(buckets=buckets, maxBytes=maxBytes)
+            sprites = [list(s) for s in scene]
+            cold = run(sprites, cache.get)
+            warm = run(sprites, cache.get)
+            print(f"{buckets} angles, {maxBytes // 1024 ** 2} Mo max : {cold:.3f} ms/tick à froid, "
+                  f"{warm:.3f} ms/tick à chaud | hits {cache.hits}, misses {cache.misses}, "
+                  f"{cache.size / 1024 ** 2:.1f} Mo en cache")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
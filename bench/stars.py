@@ -0,0 +1,102 @@
+"""Benchmark du champ d'étoiles : ancien manageStars() contre StarField
+
+Compare le coût d'une frame d'étoiles pour 12k, 50k et 200k étoiles, sur une surface hors-écran
+en 1920x1080. Vérifie d'abord que les couches pré-rendues donnent les mêmes pixels que l'écriture directe
+sur des surfaces de 8, 16, 24 et 32 bits, sinon le script s'arrête en erreur.
+Lancer depuis la racine du projet : python bench/stars.py
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import pygame.gfxdraw
+
+from random import Random, randint
+
+os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.getcwd())
+
+from lib.stars import StarField
+
+WIDTH, HEIGHT = 1920, 1080
+COUNTS = (12000, 50000, 200000)
+FRAMES = 60
+
+
+def legacyStars(count):
+    """Génère les étoiles comme l'ancien genStars()
+
+    Args:
+        count (int): Nombre d'étoiles
+    """
+    return {((randint(0, WIDTH), randint(0, HEIGHT)),
+             1 / randint(3, 12), (randint(170, 255), randint(170, 255), randint(170, 255)))
+            for _ in range(count)}
+
+
+def legacyDraw(screen, stars, cameraX, cameraY):
+    """Copie de l'ancien manageStars()
+    """
+    for (starPosX, starPosY), layer, color in stars:
+
+        drawPosX = int(starPosX - cameraX * layer) % WIDTH
+        drawPosY = int(starPosY - cameraY * layer) % HEIGHT
+
+        pygame.gfxdraw.pixel(screen, drawPosX, drawPosY, color)
+
+
+def timeFrames(draw, screen, frames):
+    """Retourne le temps moyen d'une frame en millisecondes, caméra en mouvement
+    """
+    start = time.perf_counter()
+    for frame in range(frames):
+        screen.fill((20, 20, 20))
+        draw(screen, frame * 3.7, frame * -2.1)
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def checkDepths():
+    """Dessine les mêmes étoiles en mode "tiles" sur des surfaces de 8 à 32 bits et les compare à l'écriture
+    directe en 32 bits convertie à la même profondeur
+    """
+    background = pygame.Surface((WIDTH, HEIGHT), 0, 32)
+    background.fill((20, 20, 20))
+    reference = background.copy()
+    StarField(WIDTH, HEIGHT, 12000, mode="pixels", rng=Random(0)).draw(reference, 123.4, -56.7)
+
+    for depth in (8, 16, 24, 32):
+        surface = pygame.Surface((WIDTH, HEIGHT), 0, depth)
+        surface.blit(background, (0, 0))  # Même conversion du fond que pour la référence, même en 8 bits
+        StarField(WIDTH, HEIGHT, 12000, mode="tiles", rng=Random(0)).draw(surface, 123.4, -56.7)
+        expected = pygame.image.tobytes(reference.convert(surface), "RGB")
+        assert pygame.image.tobytes(surface, "RGB") == expected, f"{depth} bits : les couches ne donnent pas les " \
+                                                                 "mêmes pixels"
+
+
+def main():
+    pygame.init()
+    checkDepths()
+    screen = pygame.Surface((WIDTH, HEIGHT))
+
+    print(f"{'étoiles':>8} | {'ancien (ms)':>12} | {'pixels (ms)':>12} | {'tiles (ms)':>12}")
+    for count in COUNTS:
+        stars = legacyStars(count)
+        legacyFrames = max(3, FRAMES * 12000 // count)
+        legacy = timeFrames(lambda s, x, y: legacyDraw(s, stars, x, y), screen, legacyFrames)
+
+        pixels = StarField(WIDTH, HEIGHT, count, mode="pixels")
+        tiles = StarField(WIDTH, HEIGHT, count, mode="tiles")
+        fast = timeFrames(pixels.draw, screen, FRAMES)
+        tiled = timeFrames(tiles.draw, screen, FRAMES)
+
+        print(f"{count:>8} | {legacy:>12.2f} | {fast:>12.2f} | {tiled:>12.2f}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""Benchmark du temps de démarrage : du lancement du processus à la première frame affichée
+
+Lance `python main.py --ticks 1` (une seule frame, pilote vidéo dummy) plusieurs fois et donne le temps
+du premier lancement (sans __pycache__), puis le minimum et la médiane des lancements suivants.
+Avec --rev, mesure aussi une autre révision git dans un worktree temporaire : les lancements des deux
+arbres sont alternés, pour que le bruit de la machine touche les deux de la même façon.
+
+Lancer depuis la racine du projet : python bench/startup.py [--rev <révision>] [--runs N]
+"""
+
+import os
+import sys
+import glob
+import shutil
+import argparse
+import tempfile
+import subprocess
+import statistics
+import time
+
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def clearBytecode(folder):
+    """Supprime tout les __pycache__ du dossier, pour mesurer un démarrage à froid
+    """
+    for cache in glob.glob(os.path.join(folder, "**", "__pycache__"), recursive=True):
+        shutil.rmtree(cache, ignore_errors=True)
+
+
+def launch(folder):
+    """Lance main.py pour une frame et retourne le temps écoulé en secondes
+    """
+    environment = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy",
+                       PYGAME_HIDE_SUPPORT_PROMPT="1")
+
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "main.py", "--ticks", "1"], cwd=folder, env=environment,
+                   check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def measure(folders, runs):
+    """Retourne {nom: (temps à froid, minimum à chaud, médiane à chaud)} en secondes
+
+    Args:
+        folders (dict): {nom: dossier contenant main.py}
+        runs (int): Nombre de lancements à chaud par dossier
+    """
+    cold, warm = {}, {name: [] for name in folders}
+
+    for name, folder in folders.items():
+        clearBytecode(folder)
+        cold[name] = launch(folder)
+
+    for _ in range(runs):
+        for name, folder in folders.items():
+            warm[name].append(launch(folder))
+
+    return {name: (cold[name], min(warm[name]), statistics.median(warm[name])) for name in folders}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rev", help="révision git à comparer (doit accepter --ticks)")
+    parser.add_argument("--runs", type=int, default=20, help="nombre de lancements à chaud par arbre")
+    arguments = parser.parse_args()
+
+    if not arguments.rev:
+        results = measure({"arbre actuel": ROOT}, arguments.runs)
+    else:
+        with tempfile.TemporaryDirectory() as folder:
+            worktree = os.path.join(folder, "rev")
+            subprocess.run(["git", "worktree", "add", "--detach", worktree, arguments.rev], cwd=ROOT,
+                           check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                results = measure({"arbre actuel": ROOT, arguments.rev: worktree}, arguments.runs)
+            finally:
+                subprocess.run(["git", "worktree", "remove", "--force", worktree], cwd=ROOT, check=True)
+
+    for name, (cold, fastest, median) in results.items():
+        print(f"{name:>14} : {cold * 1000:7.1f} ms à froid | à chaud {fastest * 1000:7.1f} ms min, "
+              f"{median * 1000:7.1f} ms médiane")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
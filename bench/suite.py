@@ -0,0 +1,306 @@
+"""Suite de benchmarks : scénarios scriptés comparés à une référence enregistrée, avec des seuils de tolérance
+
+Chaque scénario part d'une graine fixe et utilise les vraies fonctions du jeu (game.updateGame, game.drawGame) :
+  - idle : le joueur ne touche à rien, au milieu des astéroïdes des chunks chargés autour de lui ;
+  - combat : idem, avec 2 redShooter, 2 redSniper et 2 redBlaster, et le joueur qui tire en tournant.
+Le joueur ne peut pas mourir : la partie ne recommence jamais pendant la mesure.
+Chaque scénario tourne sans affichage (simulation seule, une frame == un tick), puis avec le rendu complet
+sur un écran 1920x1080 hors fenêtre (pilote vidéo dummy) et 10000 étoiles. Chaque mesure tourne dans son
+propre processus, pour que le pic de mémoire (RSS) soit le sien.
+
+Mesure : ticks par seconde, temps de frame médian (p50) et p99, pic de mémoire, après WARMUP ticks. Chaque mesure
+est lancée REPEATS fois, les scénarios à tour de rôle, et c'est la médiane des lancements qui est comparée à
+bench/baseline.json : une médiane plus mauvaise que la référence au-delà de sa tolérance (en proportion) est une
+régression, et la commande se termine avec le code 1. La référence dépend de la machine : --update l'enregistre à
+nouveau, avec le bruit mesuré (l'écart médian des lancements à leur médiane, qu'un lancement isolé plus rapide
+ou plus lent ne change pas) et des tolérances tirées de ce bruit : NOISE_FACTOR fois le plus grand de chaque
+mesure, jamais moins que MIN_TOLERANCES.
+
+Lancer depuis la racine du projet :
+    python bench/suite.py [--update] [--ticks N] [--repeats N] [--tolerance MESURE=PART]
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+import statistics
+import time
+
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+SEED = 17
+WARMUP = 120  # Ticks simulés avant la mesure, les mêmes à chaque lancement
+REPEATS = 7  # Lancements de chaque mesure, dont la médiane est comparée
+MAX_ENEMIES = 6  # Vaisseaux en jeu au plus, joueur compris : la charge des scénarios ne suit pas game.maxEnemies
+STARS = 10000
+SCENARIOS = ("idle", "combat")
+MODES = ("headless", "offscreen")
+TICKS_FACTOR = {"headless": 4, "offscreen": 1}
+# Multiple de --ticks pour chaque mode : un lancement sans affichage dure autant qu'avec le rendu, assez pour lisser
+# les à-coups de la machine
+
+METRICS = {"ticks/s": True, "p50 (ms)": False, "p99 (ms)": False, "mémoire (Mo)": False}
+# True si une valeur plus grande est meilleure
+MIN_TOLERANCES = {"ticks/s": 0.05, "p50 (ms)": 0.05, "p99 (ms)": 0.10, "mémoire (Mo)": 0.02}
+# Tolérances minimum, en proportion de la référence, et tolérances par défaut sans référence enregistrée
+NOISE_FACTOR = 3  # Tolérance enregistrée par --update, en multiple du bruit mesuré
+
+
+def peakMemory():
+    """Pic de mémoire résidente du processus, en Mo, None si la plateforme ne le donne pas
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Ko sous Linux
+
+
+def percentile(values, part):
+    """Valeur sous laquelle se trouve la proportion part des valeurs
+
+    Args:
+        values (list): Valeurs triées
+        part (float): Proportion entre 0 et 1
+    """
+    return values[round(part * (len(values) - 1))]
+
+
+def newWorld(scenario, mode):
+    """Crée le monde du scénario, prêt à mesurer
+
+    Args:
+        scenario (str): Nom du scénario, voir SCENARIOS
+        mode (str): "headless" pour la simulation seule, "offscreen" pour le rendu complet
+    """
+    from collections import defaultdict
+    from random import Random
+
+    import pygame
+
+    from lib import game
+    from lib.player import Player
+    from lib.red.shooter import redShooter
+    from lib.red.sniper import redSniper
+    from lib.red.blaster import redBlaster
+    from lib.render import Renderer
+    from lib.stars import StarField
+    from lib.world import World
+
+    game.maxEnemies = MAX_ENEMIES
+
+    if mode == "headless":
+        world = game.createWorld(True, SEED)
+    else:
+        screen = pygame.display.set_mode((1920, 1080))
+        world = World(screen, 1920, 1080, False, SEED)
+        world.renderer = Renderer(world)
+        world.stars = StarField(world.screenWidth, world.screenHeight, STARS, rng=Random(SEED))
+
+    world.player = Player(world, 300, (world.screenWidth // 2, world.screenHeight // 2), world.ships, 500, 40)
+    world.player.HP = world.player.maxHP = 10 ** 9  # La partie ne doit pas s'arrêter pendant la mesure
+
+    world.key = defaultdict(bool)
+    if scenario == "combat":
+        world.key[pygame.K_SPACE] = world.key[pygame.K_LEFT] = True
+        for index, enemy in enumerate((redShooter, redShooter, redSniper, redSniper, redBlaster, redBlaster)):
+            position = (world.player.x + 900 * (-1) ** index, world.player.y + 300 * (index - 2.5))
+            world.ships.add(enemy(world, position))
+
+    world.chunks.update()
+    return world
+
+
+def measure(scenario, mode, ticks):
+    """Lance le scénario dans l'arbre du dossier courant et retourne les mesures
+
+    Args:
+        scenario (str): Nom du scénario, voir SCENARIOS
+        mode (str): Mode d'affichage, voir MODES
+        ticks (int): Nombre de ticks mesurés, un par frame
+    """
+    import pygame
+
+    sys.path.insert(0, os.getcwd())
+    from lib import game
+
+    pygame.init()
+    world = newWorld(scenario, mode)
+
+    frameTimes = []
+    for tick in range(WARMUP + ticks):
+        start = time.perf_counter()
+        game._randomTick(world)
+        game.updateGame(world)
+        world.tick += 1
+        if mode != "headless":
+            game.drawGame(world, 1.0)
+        if tick >= WARMUP:
+            frameTimes.append(time.perf_counter() - start)
+
+    frameTimes.sort()
+    return {
+        "ticks/s": len(frameTimes) / sum(frameTimes),
+        "p50 (ms)": percentile(frameTimes, 0.50) * 1000,
+        "p99 (ms)": percentile(frameTimes, 0.99) * 1000,
+        "mémoire (Mo)": peakMemory(),
+    }
+
+
+def measureTree(folder, scenario, mode, ticks):
+    """Lance la mesure dans un processus à part, dans le dossier donné
+    """
+    environment = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", scenario, mode, str(ticks)],
+                            cwd=folder, env=environment, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def measureAll(runs, ticks, repeats):
+    """Lance chaque mesure repeats fois, à tour de rôle : une machine qui ralentit touche toutes les mesures
+
+    Args:
+        runs (list): Mesures à lancer, "scénario/mode"
+        ticks (int): Nombre de ticks mesurés par lancement, multiplié par TICKS_FACTOR
+        repeats (int): Nombre de lancements par mesure
+
+    Returns:
+        dict: {"scénario/mode": [résultats de chaque lancement]}
+    """
+    samples = {run: [] for run in runs}
+    for _ in range(repeats):
+        for run in runs:
+            scenario, mode = run.split("/")
+            samples[run].append(measureTree(ROOT, scenario, mode, ticks * TICKS_FACTOR[mode]))
+    return samples
+
+
+def summarize(samples):
+    """Médiane de chaque mesure, et son bruit : l'écart médian des lancements à la médiane, en proportion
+
+    Args:
+        samples (dict): Résultats de chaque lancement, voir measureAll()
+
+    Returns:
+        tuple: ({"scénario/mode": {mesure: médiane}}, {"scénario/mode": {mesure: bruit}})
+    """
+    results, noise = {}, {}
+    for run, runs in samples.items():
+        results[run], noise[run] = {}, {}
+        for metric in METRICS:
+            values = [values[metric] for values in runs if values[metric] is not None]
+            if not values:
+                results[run][metric] = noise[run][metric] = None
+                continue
+            median = statistics.median(values)
+            results[run][metric] = median
+            noise[run][metric] = statistics.median(abs(value - median) for value in values) / median
+    return results, noise
+
+
+def noiseTolerances(noise):
+    """Tolérances tirées du bruit mesuré : NOISE_FACTOR fois le plus grand bruit de chaque mesure, arrondi au
+    centième supérieur, jamais moins que MIN_TOLERANCES
+
+    Args:
+        noise (dict): Bruit de chaque mesure, voir summarize()
+    """
+    tolerances = {}
+    for metric, minimum in MIN_TOLERANCES.items():
+        worst = max((values[metric] for values in noise.values() if values[metric] is not None), default=0)
+        tolerances[metric] = max(minimum, -(-round(worst * NOISE_FACTOR * 1000) // 10) / 100)
+    return tolerances
+
+
+def compare(results, baseline, tolerances, noise):
+    """Affiche chaque mesure à côté de sa référence et retourne le nombre de régressions
+
+    Args:
+        results (dict): {"scénario/mode": {mesure: médiane}}
+        baseline (dict): Résultats de référence, même forme que results
+        tolerances (dict): {mesure: dégradation acceptée, en proportion de la référence}
+        noise (dict): Bruit des lancements de cette fois, même forme que results
+    """
+    regressions = 0
+    print(f"{'':>18} | {'mesure':>12} | {'référence':>10} | {'actuel':>10} | {'bruit':>6} | {'écart':>8} | "
+          f"{'tolérance':>9} | verdict")
+
+    for run, values in results.items():
+        for metric, higherIsBetter in METRICS.items():
+            value, reference = values.get(metric), baseline.get(run, {}).get(metric)
+            if value is None or reference is None:
+                value = "" if value is None else f"{value:.2f}"
+                print(f"{run:>18} | {metric:>12} | {'':>10} | {value:>10} | {'':>6} | {'':>8} | {'':>9} | "
+                      f"pas de référence")
+                continue
+
+            change = (value - reference) / reference
+            worse = -change if higherIsBetter else change
+            verdict = "RÉGRESSION" if worse > tolerances[metric] else "ok"
+            regressions += verdict != "ok"
+            print(f"{run:>18} | {metric:>12} | {reference:>10.2f} | {value:>10.2f} | {noise[run][metric]:>6.1%} | "
+                  f"{change:>+8.1%} | {tolerances[metric]:>9.0%} | {verdict}")
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--update", action="store_true", help="enregistre les résultats comme nouvelle référence")
+    parser.add_argument("--ticks", type=int, default=1800, help="ticks mesurés par lancement avec le rendu")
+    parser.add_argument("--repeats", type=int, default=REPEATS, help="lancements de chaque mesure")
+    parser.add_argument("--tolerance", action="append", default=[], metavar="MESURE=PART",
+                        help="change une tolérance, par exemple p99=0.5 (préfixe du nom de la mesure)")
+    parser.add_argument("--only", help="ne lance que les scénarios dont le nom contient ce texte")
+    parser.add_argument("--child", nargs=3, help=argparse.SUPPRESS)
+    arguments = parser.parse_args()
+
+    if arguments.child:
+        scenario, mode, ticks = arguments.child
+        print(json.dumps(measure(scenario, mode, int(ticks))))
+        return 0
+
+    stored = {}
+    if os.path.exists(BASELINE):
+        with open(BASELINE, encoding="utf-8") as file:
+            stored = json.load(file)
+    tolerances = dict(MIN_TOLERANCES, **stored.get("tolerances", {}))
+
+    overridden = []
+    for option in arguments.tolerance:
+        prefix, _, value = option.partition("=")
+        names = [metric for metric in METRICS if metric.startswith(prefix)]
+        if len(names) != 1 or not value:
+            parser.error(f"--tolerance : mesure inconnue ou valeur manquante dans {option!r}")
+        tolerances[names[0]] = float(value)
+        overridden.append(names[0])
+
+    runs = [f"{scenario}/{mode}" for scenario in SCENARIOS for mode in MODES]
+    runs = [run for run in runs if arguments.only is None or arguments.only in run]
+    results, noise = summarize(measureAll(runs, arguments.ticks, arguments.repeats))
+
+    if arguments.update:
+        baseline = dict(stored.get("results", {}), **results)
+        noise = dict(stored.get("noise", {}), **noise)
+        tolerances = dict(noiseTolerances(noise), **{metric: tolerances[metric] for metric in overridden})
+        with open(BASELINE, "w", encoding="utf-8") as file:
+            json.dump({"tolerances": tolerances, "noise": noise, "results": baseline}, file, indent=4,
+                      ensure_ascii=False)
+            file.write("\n")
+        print(f"Référence enregistrée dans {os.path.relpath(BASELINE)}, tolérances : "
+              + ", ".join(f"{metric} {tolerance:.0%}" for metric, tolerance in tolerances.items()))
+        return 0
+
+    regressions = compare(results, stored.get("results", {}), tolerances, noise)
+    if regressions:
+        print(f"{regressions} régression(s) au-delà des tolérances")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+"""Paquet contenant toute la logique du jeu
+
+Les modules ne partagent plus de variables globales : tout l'état du jeu passe par un objet World
+(voir lib/world.py), donné à chaque objet à sa création.
+"""
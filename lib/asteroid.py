@@ -1,6 +1,11 @@
 """Fichier contenant la classe relative aux astéroïdes
 """
 
+from math import cos, sin, pi
+
+from lib.collision import ASTEROID
+from lib.object import Object
+
 
 class Asteroid(Object):
     """Classe qui représente les astéroïdes
@@ -11,39 +16,109 @@ class Asteroid(Object):
         forces (list): Forces de mouvement
         HP (int): PV de l'astéroïde
         image (image): Image choisie pour l'astéroïde
+        imageIndex (int): Indice de l'image source dans world.images.asteroidImages
         mass (int): Masse de l'astéroïde
-        randomSeed (int): Booléen random
-        scale (tuple): Ratios de chaque dimension de l'astéroïde entre l'image original et l'image réel
-        scaleFactor (int): Facteur de grandissement
+        scale (tuple): Taille de l'astéroïde en pixels, l'image source y est redimensionnée
+
+    Deleted Attributes:
+        randomSeed (int): Booléen random, voir randomShape()
+        scaleFactor (int): Facteur de grandissement, voir randomShape()
+
+    Les astéroïdes sont créés par restore(), à partir d'un état tiré par randomState() ou gardé par state().
     """
 
-    def __init__(self, pos):
-        """Initialise l'astéroïde
-        
+    __slots__ = ("imageIndex", "scale")
+
+    category = ASTEROID
+
+    def state(self):
+        """État de l'astéroïde, de quoi le recréer tel quel avec restore() une fois déchargé
+
+        Returns:
+            tuple: (x, y, imageIndex, scale, HP, angle, angleMomentum, force x, force y), sans aucune Surface
+        """
+        return (self.x, self.y, self.imageIndex, self.scale, self.HP, self.angle, self.angleMomentum,
+                self.forces[0], self.forces[1])
+
+    @classmethod
+    def restore(cls, world, state):
+        """Recrée un astéroïde à partir de son état, en réutilisant un astéroïde mort du pool si possible
+
         Args:
-            pos (tuple): Position de départ
-        
-        Deleted Parameters:
-            life (int): PV de l'objet
-            image (image): Image de l'objet à afficher
+            world (World): Monde où remettre l'astéroïde
+            state (tuple): État donné par state(), ou tiré par randomState()
+
+        Returns:
+            Asteroid: L'astéroïde, déjà dans world.objects et world.asteroids
         """
-        self.randomSeed = randint(0, 1)
-        if self.randomSeed == 0:
-            self.scaleFactor = randint(50, 90)
-            self.scale = (self.scaleFactor, self.scaleFactor * uniform(0.7, 1.3))
+        x, y, imageIndex, scale, HP, angle, angleMomentum, forceX, forceY = state
+        image = world.images.scale(world.images.asteroidImages[imageIndex], scale)
+
+        if world.asteroidPool:
+            asteroid = world.asteroidPool.pop()
+            asteroid.reset(HP, (x, y), image, massOf(scale))
+            asteroid.add(world.objects)
         else:
-            self.scaleFactor = randint(50, 90)
-            self.scale = (self.scaleFactor * uniform(0.7, 1.3), self.scaleFactor)
-        self.image = pygame.transform.scale(choice(asteroidImages), self.scale)
-        self.mass = (self.scale[0] * self.scale[1] * 5) // 1000
-        # Le 5 est arbitraire, mass est en tonnes d'où le // 1000
+            asteroid = cls.__new__(cls)
+            Object.__init__(asteroid, world, HP, (x, y), world.objects, image, massOf(scale))
+
+        asteroid.imageIndex, asteroid.scale = imageIndex, scale
+        asteroid.angle, asteroid.angleMomentum = angle, angleMomentum
+        asteroid.forces = [forceX, forceY]
+
+        world.asteroids.add(asteroid)
+        return asteroid
+
+    def willExpire(self):
+        """Un astéroïde ne disparaît plus avec la distance : il est rangé avec son chunk, voir lib.chunks
+        """
+
+    def die(self):
+        """Supprime l'astéroïde et le range dans le pool, pour le prochain astéroïde à apparaître
+        """
+        if self.alive():
+            self.world.asteroidPool.append(self)
+        super().die()
+
+
+def randomShape(rng, imageCount):
+    """Tire la taille, l'image et les PV d'un astéroïde
+
+    Args:
+        rng (random.Random): Générateur à utiliser : celui du monde, ou celui d'un chunk
+        imageCount (int): Nombre d'images d'astéroïdes
+
+    Returns:
+        tuple: (indice de l'image, taille (largeur, hauteur) en pixels, PV)
+    """
+    if rng.randint(0, 1) == 0:
+        scaleFactor = rng.randint(50, 90)
+        scale = (scaleFactor, scaleFactor * rng.uniform(0.7, 1.3))
+    else:
+        scaleFactor = rng.randint(50, 90)
+        scale = (scaleFactor * rng.uniform(0.7, 1.3), scaleFactor)
+    imageIndex = rng.randrange(imageCount)  # Même tirage que rng.choice() sur la liste des images
+    return imageIndex, scale, massOf(scale) * rng.uniform(2.2, 3.6)
 
-        self.HP = self.mass * uniform(2.2, 3.6)
 
-        super().__init__(self.HP, pos, objects, self.image, self.mass)
+def randomState(rng, imageCount, pos):
+    """Tire un astéroïde à la position donnée, sans rien créer : forme, rotation et mouvement
 
-        self.angle = angleBetweenVectors(
-            self.direction, self.vectDistanceToPlayer) + randint(-10, 10)
-        self.forces = [uniform(0.8, 1.2) * cos(self.angle) + player.forces[0] * 1.02,
-                       uniform(0.8, 1.2) * sin(self.angle) + player.forces[1] * 1.02]
-        self.angleMomentum = uniform(-0.050, 0.050)
+    Args:
+        rng (random.Random): Générateur à utiliser : celui d'un chunk, voir lib.chunks.generate()
+        imageCount (int): Nombre d'images d'astéroïdes
+        pos (tuple): Position de l'astéroïde
+
+    Returns:
+        tuple: État de l'astéroïde, à donner à Asteroid.restore(), voir Asteroid.state()
+    """
+    imageIndex, scale, HP = randomShape(rng, imageCount)
+    angle, speed = rng.uniform(-pi, pi), rng.uniform(0.2, 1.2)
+    return (pos[0], pos[1], imageIndex, scale, HP, angle, rng.uniform(-0.050, 0.050),
+            cos(angle) * speed, sin(angle) * speed)
+
+
+def massOf(scale):
+    """Masse d'un astéroïde en tonnes, selon sa taille : le 5 est arbitraire, d'où le // 1000
+    """
+    return (scale[0] * scale[1] * 5) // 1000
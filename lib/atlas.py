@@ -0,0 +1,251 @@
+"""Fichier contenant l'atlas des sprites : toutes les images du jeu, préparées une fois et rangées dans quelques pages
+
+La construction décode les images sources, les redimensionne à leur taille d'affichage, précalcule les rotations
+demandées et range le tout dans des pages RGBA brutes, décrites par un manifeste JSON. Au lancement, load()
+projette les pages en mémoire (mmap), convertit chaque page une seule fois au format de l'écran et découpe les
+sprites dedans. L'atlas est reconstruit tout seul quand une image source ou la liste SPRITES change.
+Construire l'atlas à l'avance, depuis la racine du projet : python -m lib.atlas
+"""
+
+import os
+import glob
+import json
+import hashlib
+import mmap
+
+import numpy as np
+import pygame
+
+from lib.rotation import MASK_THRESHOLD
+
+
+FOLDER = "assets/atlas"
+MANIFEST = "manifest.json"
+VERSION = 2  # À augmenter quand le format des pages ou du manifeste change, ou la préparation des images
+PAGE_SIZE = 1024  # Largeur et hauteur maximales d'une page, en pixels
+
+SPRITES = {
+    "player": ("assets/playerSprites/Vaisseau.jpg", (64, 64), 0),
+    "playerMoving": ("assets/playerSprites/vaisseau*.png", (64, 64), 0),
+    "playerFiringMoving": ("assets/playerSprites/firingvaisseau*.png", (64, 64), 0),
+    "playerFiring": ("assets/playerSprites/firing.png", (64, 64), 0),
+    "asteroids": ("assets/asteroids/asteroid*.png", 128, 0),
+    "bullet": ("assets/bullet.png", (10, 10), 360),
+    "explosion": ("assets/explosionSprites/*.png", None, 0),
+    "redShooter": ("assets/redTeamSprites/redShooter.png", None, 0),
+    "redBlaster": ("assets/redTeamSprites/redBlaster.png", None, 0),
+    "redSniper": ("assets/redTeamSprites/redSniper.png", None, 0),
+}
+# {nom: (motif des fichiers sources, taille, nombre de rotations précalculées)}
+# La taille est (largeur, hauteur), un côté maximal (l'image est réduite en gardant ses proportions), ou None.
+# Les fichiers d'un motif sont triés : l'ordre des images ne dépend pas du système de fichiers.
+# Les rotations précalculées suivent la convention de RotationCache, avec autant d'angles que ses buckets
+
+COLLIDING = ("player", "playerMoving", "playerFiringMoving", "playerFiring", "asteroids", "redShooter", "redBlaster",
+             "redSniper")
+# Sprites dont le masque sert aux collisions : build() refuse une image dont le masque serait vide
+
+
+def _signature():
+    """Empreinte de tout ce dont dépend l'atlas : format, liste des sprites, taille et date des fichiers sources
+    """
+    state = [VERSION, PAGE_SIZE, sorted(SPRITES.items())]
+    for pattern, _, _ in SPRITES.values():
+        for path in sorted(glob.glob(pattern)):
+            status = os.stat(path)
+            state.append((path, status.st_size, status.st_mtime_ns))
+    return hashlib.sha1(repr(state).encode()).hexdigest()
+
+
+def _prepare(path, size):
+    """Décode une image source et la met à sa taille d'affichage
+
+    Args:
+        path (str): Chemin de l'image
+        size: Taille voulue, voir SPRITES
+
+    Returns:
+        Surface: Image préparée
+    """
+    image = pygame.image.load(path)
+    if size is None:
+        return image
+
+    if isinstance(size, int):
+        width, height = image.get_size()
+        if max(width, height) <= size:
+            return image
+        ratio = size / max(width, height)
+        return pygame.transform.scale(image, (max(round(width * ratio), 1), max(round(height * ratio), 1)))
+        # Pas smoothscale : il plafonne l'opacité à 253, et plus aucun pixel n'atteint le seuil des masques
+
+    return pygame.transform.scale(image, size)
+
+
+def _pack(surfaces):
+    """Range les surfaces dans des pages, par étagères de hauteur décroissante
+
+    Args:
+        surfaces (list): Surfaces à ranger
+
+    Returns:
+        tuple: (liste des tailles (largeur, hauteur) des pages, liste des [page, x, y, largeur, hauteur] de chaque surface)
+    """
+    order = sorted(range(len(surfaces)), key=lambda index: surfaces[index].get_height(), reverse=True)
+    rects = [None] * len(surfaces)
+    pages = []
+
+    x = y = shelfHeight = 0
+    for index in order:
+        width, height = surfaces[index].get_size()
+        if x + width > PAGE_SIZE:
+            x, y, shelfHeight = 0, y + shelfHeight, 0
+        if not pages or y + height > PAGE_SIZE:
+            pages.append([0, 0])
+            x = y = shelfHeight = 0
+
+        rects[index] = [len(pages) - 1, x, y, width, height]
+        pages[-1][0] = max(pages[-1][0], x + width)
+        pages[-1][1] = max(pages[-1][1], y + height)
+        x += width
+        shelfHeight = max(shelfHeight, height)
+
+    return [tuple(page) for page in pages], rects
+
+
+def build():
+    """Prépare toutes les images de SPRITES et les range dans des pages, sans rien écrire
+
+    Returns:
+        tuple: (pages, manifeste), pages étant la liste des (octets RGBA, taille) de chaque page
+    """
+    surfaces = []
+    sprites = {}
+    for name, (pattern, size, rotations) in SPRITES.items():
+        frames = [_prepare(path, size) for path in sorted(glob.glob(pattern))]
+        if not frames:
+            raise FileNotFoundError(f"Aucune image ne correspond à {pattern}")
+        if name in COLLIDING:
+            for path, frame in zip(sorted(glob.glob(pattern)), frames):
+                if not pygame.mask.from_surface(frame, MASK_THRESHOLD).count():
+                    raise ValueError(f"{path} : masque de collision vide une fois préparée (opacité < {MASK_THRESHOLD})")
+
+        sprites[name] = {"frames": list(range(len(surfaces), len(surfaces) + len(frames)))}
+        surfaces += frames
+
+        if rotations:
+            sprites[name]["rotations"] = list(range(len(surfaces), len(surfaces) + rotations))
+            surfaces += [pygame.transform.rotate(frames[0], - bucket * 360 / rotations) for bucket in range(rotations)]
+
+    sizes, rects = _pack(surfaces)
+    pixels = [np.zeros((height, width, 4), np.uint8) for width, height in sizes]
+    for surface, (page, x, y, width, height) in zip(surfaces, rects):
+        pixels[page][y:y + height, x:x + width] = np.frombuffer(
+            pygame.image.tobytes(surface, "RGBA"), np.uint8).reshape(height, width, 4)
+    # Copie octet par octet : un blit mélangerait la transparence au lieu de la recopier
+
+    for entry in sprites.values():
+        for key in entry:
+            entry[key] = [rects[index] for index in entry[key]]
+
+    manifest = {
+        "version": VERSION,
+        "signature": _signature(),
+        "pages": [{"file": f"page{page}.rgba", "size": size} for page, size in enumerate(sizes)],
+        "sprites": sprites,
+    }
+    return [(page.tobytes(), size) for page, size in zip(pixels, sizes)], manifest
+
+
+def save(pages, manifest, folder=FOLDER):
+    """Écrit les pages puis le manifeste, en dernier : un atlas à moitié écrit n'est jamais utilisé
+
+    Args:
+        pages (list): Pages données par build()
+        manifest (dict): Manifeste donné par build()
+        folder (str, optional): Dossier de l'atlas
+    """
+    os.makedirs(folder, exist_ok=True)
+    for (data, _), page in zip(pages, manifest["pages"]):
+        with open(os.path.join(folder, page["file"]), "wb") as file:
+            file.write(data)
+
+    temporary = os.path.join(folder, MANIFEST + ".tmp")
+    with open(temporary, "w", encoding="utf-8") as file:
+        json.dump(manifest, file)
+    os.replace(temporary, os.path.join(folder, MANIFEST))
+
+
+def _readManifest(folder):
+    """Retourne le manifeste de l'atlas s'il est à jour, None s'il manque ou doit être reconstruit
+    """
+    try:
+        with open(os.path.join(folder, MANIFEST), encoding="utf-8") as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return None
+
+    if manifest.get("version") != VERSION or manifest.get("signature") != _signature():
+        return None
+    return manifest
+
+
+def _mapPage(folder, page):
+    """Projette une page en mémoire et la convertit au format de l'écran
+
+    Args:
+        folder (str): Dossier de l'atlas
+        page (dict): Entrée de la page dans le manifeste
+
+    Returns:
+        Surface: Page convertie, None si le fichier manque ou n'a pas la bonne taille
+    """
+    width, height = page["size"]
+    try:
+        with open(os.path.join(folder, page["file"]), "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if len(mapped) != width * height * 4:
+                    return None
+                return pygame.image.frombuffer(mapped, (width, height), "RGBA").convert_alpha()
+    except (OSError, ValueError):
+        return None
+
+
+def load(folder=FOLDER):
+    """Charge l'atlas, en le reconstruisant d'abord s'il manque ou n'est plus à jour
+
+    Il faut que l'écran soit déjà créé : chaque page est convertie à son format.
+    Si le dossier n'est pas accessible en écriture, l'atlas reconstruit est utilisé sans être enregistré.
+
+    Args:
+        folder (str, optional): Dossier de l'atlas
+
+    Returns:
+        tuple: ({nom: [images]}, {nom: [rotations de la première image, une par angle]})
+    """
+    manifest = _readManifest(folder)
+    pages = None if manifest is None else [_mapPage(folder, page) for page in manifest["pages"]]
+
+    if pages is None or None in pages:
+        data, manifest = build()
+        try:
+            save(data, manifest, folder)
+        except OSError:
+            pass
+        pages = [pygame.image.frombuffer(pixels, size, "RGBA").convert_alpha() for pixels, size in data]
+
+    sprites, rotations = {}, {}
+    for name, entry in manifest["sprites"].items():
+        sprites[name] = [pages[page].subsurface((x, y, width, height)) for page, x, y, width, height in entry["frames"]]
+        if "rotations" in entry:
+            rotations[name] = [pages[page].subsurface((x, y, width, height))
+                               for page, x, y, width, height in entry["rotations"]]
+    return sprites, rotations
+
+
+if __name__ == "__main__":
+    pages, manifest = build()
+    save(pages, manifest)
+    count = sum(len(entry["frames"]) + len(entry.get("rotations", ())) for entry in manifest["sprites"].values())
+    print(f"Atlas enregistré dans {FOLDER} : {count} images sur {len(pages)} page(s), "
+          f"{sum(len(data) for data, _ in pages) // 1024} Ko")
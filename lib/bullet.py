@@ -1,36 +1,318 @@
 """Fichier contenant les méthodes relatives aux balles
+
+Les balles ne sont plus des sprites : toutes les balles du monde sont rangées dans les tableaux NumPy
+d'un seul BulletPool (une colonne par attribut), actualisées, expirées et testées en quelques opérations.
 """
 
+import numpy as np
+
+from math import pi
+
+from lib.camera import FULL
+from lib.collision import BULLET, resolve
+
+
+RANGE_SQUARED = 3686400  # 1920 ** 2, comme Object.willExpire()
+SWEEP_STEP = 2  # Distance en pixels entre deux tests du masque le long du trajet d'une balle
+SWEEP_SAMPLES = 48  # Nombre maximum de tests du masque par paire balle / cible, pour borner le coût
+
+
+class BulletPool:
+    """Toutes les balles du monde, en structure de tableaux
+
+    Une case libérée est réutilisée par la balle suivante : le nombre de cases ne grandit que si toutes sont prises.
 
-class Bullet(Object):
-    """Classe spécifique aux balles, munitions cinétiques
-    
     Attributes:
-        angle (float): Angle de la balle, direction
-        forces (list): Forces [x, y] de la balle
+        age (np.ndarray): Nombre de ticks depuis le tir, 0 si la balle n'a pas encore bougé
+        alive (np.ndarray): True si la case contient une balle en jeu
+        angle (np.ndarray): Angle de chaque balle, celui du vaisseau qui l'a tirée, en rad
+        count (int): Nombre de balles en jeu
+        free (list): Indices des cases libres, la prochaine balle prend la dernière
+        HP (np.ndarray): Points de vie de chaque balle : elle disparaît au tick suivant s'ils tombent à 0
+        owner (np.ndarray): Équipe du vaisseau qui a tiré chaque balle, voir lib.collision
+        view (BulletView): Une balle vue comme un objet, pour lib.collision.resolve()
+        vx (np.ndarray): Force X de chaque balle, son mouvement par tick
+        vy (np.ndarray): Force Y de chaque balle, son mouvement par tick
+        world (World): Monde auquel appartiennent les balles
+        x (np.ndarray): Coordonnée X de chaque balle
+        y (np.ndarray): Coordonnée Y de chaque balle
     """
 
-    def __init__(self, life, pos, groupe, image, forces, angle, mass, owner=None):
-        """Initialise la balle tirée !
-        
+    def __init__(self, world, capacity=256):
+        """Constructeur du pool de balles
+
+        Args:
+            world (World): Monde auquel appartiennent les balles
+            capacity (int, optional): Nombre de cases de départ
+        """
+        self.world = world
+        self.count = 0
+
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self.vx = np.zeros(0)
+        self.vy = np.zeros(0)
+        self.angle = np.zeros(0)
+        self.HP = np.zeros(0)
+        self.age = np.zeros(0, dtype=np.int32)
+        self.owner = np.zeros(0, dtype=np.int8)
+        self.alive = np.zeros(0, dtype=bool)
+        self.free = []
+        self.view = BulletView(self)
+
+        self._grow(capacity)
+
+    def __len__(self):
+        """Nombre de balles en jeu
+        """
+        return self.count
+
+    def _grow(self, capacity):
+        """Agrandit les tableaux jusqu'à capacity cases, les nouvelles cases étant libres
+
+        Args:
+            capacity (int): Nouveau nombre de cases
+        """
+        old = len(self.alive)
+        extra = capacity - old
+
+        for name in ("x", "y", "vx", "vy", "angle", "HP", "age", "owner", "alive"):
+            column = getattr(self, name)
+            setattr(self, name, np.concatenate((column, np.zeros(extra, dtype=column.dtype))))
+
+        self.free.extend(range(capacity - 1, old - 1, -1))
+        # Rangées à l'envers : les premières cases sont prises en premier
+
+    def spawn(self, pos, forces, angle, owner):
+        """Tire une balle
+
         Args:
-            life (int): Résistance de la balle : Détruite si == 0
             pos (tuple): Position de départ de la balle
-            groupe (list): Groupe où mettre la balle
-            image (image): Image de la munition, à changer
-            forces (list): Forces de départ de la balle
+            forces (list): Forces [x, y] de la balle, son mouvement par tick
             angle (float): Angle, direction, de la balle
-            mass (int): Masse de la balle en KG (introduit en tonnes)
-            owner (str, optional): Nom du type de vaisseau qui a tiré la balle
+            owner (int): Équipe du vaisseau qui a tiré la balle, voir lib.collision
+        """
+        if not self.free:
+            self._grow(2 * len(self.alive))
+
+        index = self.free.pop()
+        self.x[index], self.y[index] = pos
+        self.vx[index], self.vy[index] = forces
+        self.angle[index] = angle
+        self.HP[index] = 1
+        self.age[index] = 0
+        self.owner[index] = owner
+        self.alive[index] = True
+        self.count += 1
+
+    def update(self):
+        """Fait avancer toutes les balles d'un tick, puis retire celles détruites ou trop loin du joueur
+        """
+        if not self.count:
+            return
+
+        alive = self.alive
+        self.x += np.where(alive, self.vx, 0)
+        self.y += np.where(alive, self.vy, 0)
+        self.age += alive
+
+        player = self.world.player
+        distance = (self.x - player.x) ** 2 + (self.y - player.y) ** 2
+
+        dead = np.flatnonzero(alive & ((self.HP <= 0) | (distance > RANGE_SQUARED)))
+        # Les balles touchées au tick précédent disparaissent maintenant, comme lorsqu'elles étaient des sprites
+        if len(dead):
+            alive[dead] = False
+            self.free.extend(dead.tolist())
+            self.count -= len(dead)
+
+    def collide(self, targets):
+        """Teste toutes les balles contre chaque cible sur tout leur trajet du tick : cercle englobant, puis masque
+
+        Une balle rapide (un tir de redSniper fait plus de 90 px par tick) traverserait un astéroïde entre deux
+        ticks : chaque balle est donc un segment, de sa position au tick précédent à sa position actuelle, dans
+        le repère de la cible qui bouge aussi. La distance de chaque segment à chaque cible est calculée en une
+        seule opération ; seules les paires proches passent par Python, dans l'ordre de leur entrée dans le
+        cercle de la cible. Le masque est testé le long du segment, au plus SWEEP_SAMPLES fois par paire,
+        et une balle détruite s'arrête au premier point touché. Une cible loin de la caméra est touchée dès
+        l'entrée dans son cercle, sans masque (voir lib.camera).
+
+        Args:
+            targets (list): Objets que les balles peuvent toucher (vaisseaux, astéroïdes)
+        """
+        targets = [target for target in targets if not target.dying]
+        if not self.count or not targets:
+            return
+
+        indices = np.flatnonzero(self.alive)
+        moved = self.age[indices] > 0  # Une balle qui vient d'être tirée n'a pas encore de trajet
+        endX, endY = self.x[indices], self.y[indices]
+        startX = endX - np.where(moved, self.vx[indices], 0)
+        startY = endY - np.where(moved, self.vy[indices], 0)
+
+        targetX, targetY, previousX, previousY, radius = np.array(
+            [(target.x, target.y, target.previousX, target.previousY, target.radius) for target in targets]).T
+
+        relativeX = startX - previousX[:, None]  # Une ligne par cible, une colonne par balle
+        relativeY = startY - previousY[:, None]
+        deltaX = endX - targetX[:, None] - relativeX
+        deltaY = endY - targetY[:, None] - relativeY
+        # Segment de la balle dans le repère de la cible : relative + t * delta, t entre 0 et 1
+
+        lengthSquared = deltaX ** 2 + deltaY ** 2
+        dot = relativeX * deltaX + relativeY * deltaY
+        closest = np.clip(-dot / np.where(lengthSquared > 0, lengthSquared, 1), 0, 1)
+        near = ((relativeX + closest * deltaX) ** 2 + (relativeY + closest * deltaY) ** 2 <=
+                (radius ** 2)[:, None])
+        if not near.any():
+            return
+
+        rows, columns = np.nonzero(near)
+        lengthSquared, dot = lengthSquared[rows, columns], dot[rows, columns]
+        relativeX, relativeY = relativeX[rows, columns], relativeY[rows, columns]
+        deltaX, deltaY = deltaX[rows, columns], deltaY[rows, columns]
+
+        root = np.sqrt(np.maximum(dot ** 2 - lengthSquared * (relativeX ** 2 + relativeY ** 2 - radius[rows] ** 2), 0))
+        divisor = np.where(lengthSquared > 0, lengthSquared, 1)
+        entry = np.where(lengthSquared > 0, np.clip((-dot - root) / divisor, 0, 1), 0)
+        leave = np.where(lengthSquared > 0, np.clip((-dot + root) / divisor, 0, 1), 0)
+        # Entrée et sortie du segment dans le cercle de la cible
+
+        samples = np.minimum(np.sqrt(lengthSquared) * (leave - entry) // SWEEP_STEP + 1, SWEEP_SAMPLES).astype(int)
+
+        rotationCache = self.world.rotationCache
+        pairs = zip(rows.tolist(), indices[columns].tolist(), relativeX.tolist(), relativeY.tolist(),
+                    deltaX.tolist(), deltaY.tolist(), entry.tolist(), leave.tolist(), samples.tolist())
+
+        for pair in sorted(pairs, key=lambda pair: pair[6]):
+            targetIndex, index, relativeX, relativeY, deltaX, deltaY, entry, leave, count = pair
+            if self.HP[index] <= 0:
+                continue  # Déjà arrêtée par une cible touchée plus tôt sur son trajet
+
+            target = targets[targetIndex]
+            if target.lod == FULL:
+                mask = rotationCache.getMask(target.rotationSource, target.angle)
+                width, height = mask.get_size()
+                left, top = int(target.x - width / 2), int(target.y - height / 2)
+                # Même origine du masque que dans Object.contact()
+            else:
+                mask, count = None, 1
+
+            for step in range(count):
+                t = entry + (leave - entry) * step / max(count - 1, 1)
+                pointX, pointY = target.x + relativeX + t * deltaX, target.y + relativeY + t * deltaY
+                if mask is not None:
+                    maskX, maskY = int(pointX) - left, int(pointY) - top
+                    if not (0 <= maskX < width and 0 <= maskY < height and mask.get_at((maskX, maskY))):
+                        continue
+
+                self.hit(index, target)
+                if self.HP[index] <= 0:
+                    self.x[index], self.y[index] = pointX, pointY
+                    # Affichée au point d'impact, jusqu'à sa disparition au tick suivant
+                break
+
+    def hit(self, index, target):
+        """Applique la réponse à la collision entre une balle et target, comme pour une paire d'objets
+
+        Args:
+            index (int): Case de la balle
+            target (Object): Objet touché
+        """
+        self.view.index = index
+        resolve(self.world, self.view, target)
+
+    def snapshot(self, frame, alpha=1.0, camera=None):
+        """Ajoute les balles à l'écran à la frame, une image tournée par angle quantifié
+
+        Args:
+            frame (Frame): Frame à remplir, voir lib.pipeline
+            alpha (float, optional): Avancement entre le tick précédent et le tick actuel
+            camera (tuple, optional): Position interpolée de la caméra, celle du joueur par défaut
         """
-        super().__init__(life, pos, groupe, image, mass)
+        if not self.count:
+            return
+
+        world = self.world
+        if camera is None:
+            camera = world.player.renderPosition(alpha)
+
+        indices = np.flatnonzero(self.alive)
+        lag = np.where(self.age[indices] > 0, 1 - alpha, 0)
+        # Une balle qui n'a pas encore bougé n'a pas de position précédente
+        drawX = self.x[indices] - self.vx[indices] * lag - camera[0] + world.centered_screenWidth
+        drawY = self.y[indices] - self.vy[indices] * lag - camera[1] + world.centered_screenHeight
+
+        visible = (drawX > -16) & (drawX < world.screenWidth + 16) & (drawY > -16) & (drawY < world.screenHeight + 16)
+        if not visible.any():
+            return
+
+        rotationCache, bulletImage = world.rotationCache, world.images.bulletImage
+        buckets = np.round(self.angle[indices[visible]] * rotationCache.buckets / (2 * pi)).astype(int)
+        buckets %= rotationCache.buckets
+        # Même quantification que RotationCache.quantize()
+
+        images = {}
+        for bucket in np.unique(buckets).tolist():
+            image = rotationCache.get(bulletImage, bucket * 2 * pi / rotationCache.buckets)
+            images[bucket] = (image, image.get_width() // 2, image.get_height() // 2)
 
-        self.forces = forces
-        self.angle = angle
+        sequence = frame.bullets
+        for bucket, x, y in zip(buckets.tolist(), drawX[visible].tolist(), drawY[visible].tolist()):
+            image, halfWidth, halfHeight = images[bucket]
+            sequence.append((image, (int(x) - halfWidth, int(y) - halfHeight)))
 
-        self.owner = owner
+    def digest(self):
+        """État des balles en jeu, pour World.digest()
 
-    def explode(self):
-        """Override de Object.explode() pour éviter l'explosion des balles
+        Returns:
+            list: (x, y, HP) de chaque balle, dans l'ordre des cases
         """
-        self.die()
+        indices = np.flatnonzero(self.alive)
+        return list(zip(self.x[indices].tolist(), self.y[indices].tolist(), self.HP[indices].tolist()))
+
+
+class BulletView:
+    """Une case de BulletPool vue comme un objet, avec les attributs lus par les réponses de lib.collision
+
+    Une seule vue par pool, déplacée sur la balle touchée : rien n'est alloué par collision.
+
+    Attributes:
+        index (int): Case de la balle vue
+        pool (BulletPool): Pool contenant la balle
+    """
+
+    __slots__ = ("index", "pool")
+
+    category = BULLET
+
+    def __init__(self, pool):
+        """Constructeur de la vue
+
+        Args:
+            pool (BulletPool): Pool contenant les balles
+        """
+        self.pool = pool
+        self.index = 0
+
+    @property
+    def forces(self):
+        """Forces [x, y] de la balle
+        """
+        return (self.pool.vx[self.index], self.pool.vy[self.index])
+
+    @property
+    def team(self):
+        """Équipe du vaisseau qui a tiré la balle
+        """
+        return int(self.pool.owner[self.index])
+
+    @property
+    def HP(self):
+        """Points de vie de la balle
+        """
+        return self.pool.HP[self.index]
+
+    @HP.setter
+    def HP(self, value):
+        self.pool.HP[self.index] = value
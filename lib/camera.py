@@ -0,0 +1,90 @@
+"""Fichier contenant la caméra de la simulation : la zone autour du joueur où les objets gardent tout leur détail
+
+Un objet dans la vue (l'écran logique autour du joueur, agrandi d'une marge) est simulé en entier : image tournée,
+masque de collision, balles testées pixel par pixel. Plus loin, il ne fait qu'avancer et tourner son angle :
+ses collisions se contentent des cercles de la grille spatiale. Il retrouve tout son détail dès qu'il entre
+dans la marge, avant d'apparaître à l'écran.
+La vue ne dépend que de la simulation (taille logique de l'écran, position du joueur) : une partie se rejoue
+pareil avec ou sans affichage, quelle que soit l'échelle de rendu.
+"""
+
+
+FULL, FAR = range(2)
+# Niveaux de détail, aussi indices de Camera.counts
+
+TIER_NAMES = ("plein", "loin")
+
+
+class Camera:
+    """Vue de la simulation, recentrée sur le joueur au début de chaque tick
+
+    Attributes:
+        bottom (float): Bord bas de la vue, marge comprise, en coordonnées du monde
+        counts (list): Nombre d'objets dans chaque niveau de détail depuis le dernier update()
+        left (float): Bord gauche de la vue, marge comprise
+        margin (float): Marge autour de l'écran, en pixels : l'objet retrouve son détail avant d'être visible
+        right (float): Bord droit de la vue, marge comprise
+        top (float): Bord haut de la vue, marge comprise
+        world (World): Monde observé
+    """
+
+    def __init__(self, world, margin=256):
+        """Constructeur de la caméra
+
+        Args:
+            world (World): Monde observé
+            margin (float, optional): Marge autour de l'écran en pixels, float("inf") pour tout simuler en entier
+        """
+        self.world = world
+        self.margin = margin
+        self.left = self.top = float("-inf")
+        self.right = self.bottom = float("inf")
+        self.counts = [0] * len(TIER_NAMES)
+
+    def update(self):
+        """Recentre la vue sur le joueur et remet les compteurs à zéro, avant l'actualisation des objets
+        """
+        world = self.world
+        player = world.player
+        halfWidth, halfHeight = world.screenWidth / 2 + self.margin, world.screenHeight / 2 + self.margin
+
+        self.left, self.right = player.x - halfWidth, player.x + halfWidth
+        self.top, self.bottom = player.y - halfHeight, player.y + halfHeight
+
+        for tier in range(len(self.counts)):
+            self.counts[tier] = 0
+
+    def tier(self, instance):
+        """Niveau de détail de l'objet : FULL si son cercle touche la vue, FAR sinon
+
+        Args:
+            instance (Object): Objet à placer, avec x, y et radius
+
+        Returns:
+            int: FULL ou FAR
+        """
+        x, y, radius = instance.x, instance.y, instance.radius
+        if self.left - radius < x < self.right + radius and self.top - radius < y < self.bottom + radius:
+            tier = FULL
+        else:
+            tier = FAR
+        self.counts[tier] += 1
+        return tier
+
+    def tiers(self, x, y, radius):
+        """Niveau de détail de plusieurs objets à la fois, même test que tier()
+
+        Args:
+            x (np.ndarray): Coordonnée X de chaque objet
+            y (np.ndarray): Coordonnée Y de chaque objet
+            radius (np.ndarray): Rayon de chaque objet
+
+        Returns:
+            np.ndarray: True pour les objets FULL, False pour les objets FAR
+        """
+        full = ((self.left - radius < x) & (x < self.right + radius)
+                & (self.top - radius < y) & (y < self.bottom + radius))
+        visible = int(full.sum())
+        self.counts[FULL] += visible
+        self.counts[FAR] += len(full) - visible
+        return full
@@ -0,0 +1,211 @@
+"""Fichier contenant le monde découpé en chunks : une grille de cases générées à partir de la graine de la partie
+
+Chaque chunk (case de CHUNK_SIZE pixels de côté) tire ses astéroïdes avec un générateur à lui, créé à partir de la
+graine de la partie et de ses coordonnées : revenir au même endroit retrouve les mêmes astéroïdes. Seuls les chunks
+autour du joueur sont chargés. Un chunk qui s'éloigne est déchargé, et l'état de ses astéroïdes (position, PV,
+mouvement) est gardé dans un LRU, pour les retrouver tels quels en revenant.
+Le contenu des chunks voisins est tiré à l'avance par un thread, pendant que le joueur traverse le chunk actuel :
+franchir un bord ne fait plus que créer des astéroïdes déjà tirés. Le tirage ne dépend que de la graine, des
+coordonnées et du point d'apparition du joueur, jamais du moment où le thread le fait ni de l'endroit où est le
+joueur : un chunk tiré à nouveau est le même, et une partie se rejoue à l'identique.
+"""
+
+from collections import OrderedDict
+from math import floor
+from random import Random
+
+from lib.asteroid import Asteroid, randomState
+
+
+CHUNK_SIZE = 1024  # Plus grand que la moitié de l'écran : les chunks voisins couvrent toujours la vue
+LOAD_RADIUS = 1  # Chunks chargés autour de celui du joueur, en distance de Chebyshev : 3x3
+UNLOAD_RADIUS = 2  # Déchargés au-delà : au plus 5x5 chunks en mémoire, et un aller-retour sur un bord ne recharge rien
+ASTEROIDS_PER_CHUNK = (2, 7)  # Environ 40 astéroïdes dans les 3x3 chunks chargés, comme avant les chunks
+SAFE_DISTANCE = 300  # Aucun astéroïde n'est tiré aussi près du point d'apparition du joueur
+
+
+def generate(seed, chunk, imageCount, spawn):
+    """Tire les astéroïdes d'un chunk, sans rien créer : appelée dans le thread de génération
+
+    Args:
+        seed (int): Graine du monde de la partie
+        chunk (tuple): Coordonnées (x, y) du chunk
+        imageCount (int): Nombre d'images d'astéroïdes
+        spawn (tuple): Point d'apparition du joueur, aucun astéroïde n'est gardé à moins de SAFE_DISTANCE
+
+    Returns:
+        list: États des astéroïdes, voir Asteroid.state()
+    """
+    chunkX, chunkY = chunk
+    rng = Random(f"{seed}-{chunkX}-{chunkY}")
+
+    states = []
+    for _ in range(rng.randint(*ASTEROIDS_PER_CHUNK)):
+        x, y = (chunkX + rng.random()) * CHUNK_SIZE, (chunkY + rng.random()) * CHUNK_SIZE
+        state = randomState(rng, imageCount, (x, y))
+        if (x - spawn[0]) ** 2 + (y - spawn[1]) ** 2 > SAFE_DISTANCE ** 2:
+            states.append(state)
+        # Tiré dans tout les cas : la suite du chunk ne dépend pas du point d'apparition
+    return states
+
+
+def chunkOf(x, y):
+    """Coordonnées du chunk qui contient le point (x, y) du monde
+    """
+    return floor(x / CHUNK_SIZE), floor(y / CHUNK_SIZE)
+
+
+class ChunkMap:
+    """Chunks chargés autour du joueur, états des chunks déchargés, et génération à l'avance
+
+    Un astéroïde appartient au chunk où il se trouve : s'il dérive hors des chunks chargés, il est rangé
+    avec ce chunk comme s'il avait été déchargé, et revient quand le chunk est chargé.
+
+    Attributes:
+        executor (ThreadPoolExecutor): Thread qui tire le contenu des chunks à l'avance, créé à la première
+            demande. None avant, ou pour tout tirer au moment du chargement
+        futures (dict): {chunk: Future du contenu tiré par le thread}, pour les chunks pas encore chargés
+        loaded (set): Chunks chargés
+        maxUnloaded (int): Nombre maximum de chunks déchargés gardés, les plus anciens sont oubliés
+        seed (int): Graine du monde de la partie, tirée avec world.rng à chaque nouvelle partie
+        spawn (tuple): Position du joueur au premier update() de la partie, voir generate(). None avant
+        threaded (bool): Si False, le contenu des chunks est tiré au chargement, sans thread
+        unloaded (OrderedDict): {chunk: (True si l'état est complet, états des astéroïdes)}, du plus ancien au
+            plus récent. Un état incomplet ne contient que des astéroïdes venus d'ailleurs : le contenu tiré du
+            chunk s'y ajoute au chargement
+        world (World): Monde dont les astéroïdes sont gérés
+    """
+
+    def __init__(self, world, threaded=True, maxUnloaded=64):
+        """Constructeur des chunks
+
+        Args:
+            world (World): Monde dont les astéroïdes sont gérés
+            threaded (bool, optional): Si False, le contenu des chunks est tiré au chargement, sans thread
+            maxUnloaded (int, optional): Nombre maximum de chunks déchargés gardés
+        """
+        self.world = world
+        self.threaded = threaded
+        self.executor = None
+        self.maxUnloaded = maxUnloaded
+
+        self.seed = 0
+        self.spawn = None
+        self.loaded = set()
+        self.unloaded = OrderedDict()
+        self.futures = {}
+
+    def reset(self):
+        """Oublie tout les chunks pour une nouvelle partie, dans un nouveau monde
+        """
+        self.seed = self.world.rng.getrandbits(63)
+        self.spawn = None
+        self.loaded.clear()
+        self.unloaded.clear()
+        for future in self.futures.values():
+            future.cancel()
+        self.futures.clear()
+
+    def update(self):
+        """Décharge les chunks trop loin du joueur, range les astéroïdes sortis des chunks chargés, charge les chunks
+        proches et demande au thread le contenu des suivants. Appelée au début de chaque tick
+
+        Au premier tick d'une partie, rien n'est demandé au thread : les chunks autour du joueur sont tirés tout de
+        suite, et la première frame n'attend pas l'import de concurrent.futures ni ne partage le processeur avec le
+        thread.
+        """
+        world = self.world
+        first = self.spawn is None
+        if first:
+            self.spawn = (world.player.x, world.player.y)
+        centerX, centerY = chunkOf(world.player.x, world.player.y)
+
+        def distance(chunk):
+            return max(abs(chunk[0] - centerX), abs(chunk[1] - centerY))
+
+        for chunk in sorted(self.loaded):
+            if distance(chunk) > UNLOAD_RADIUS:
+                self.loaded.remove(chunk)
+                self._store(chunk, True, [])
+                # Ses astéroïdes sont rangés juste après, avec ceux qui dérivent
+
+        for asteroid in world.asteroids.sprites():
+            if not asteroid.dying:
+                chunk = chunkOf(asteroid.x, asteroid.y)
+                if chunk not in self.loaded:
+                    self._store(chunk, False, [asteroid.state()])
+                    asteroid.die()  # Retourne dans le pool
+
+        for offsetY in range(-LOAD_RADIUS, LOAD_RADIUS + 1):
+            for offsetX in range(-LOAD_RADIUS, LOAD_RADIUS + 1):
+                chunk = (centerX + offsetX, centerY + offsetY)
+                if chunk not in self.loaded:
+                    self._load(chunk)
+
+        if first:
+            return
+        for offsetY in range(-UNLOAD_RADIUS, UNLOAD_RADIUS + 1):
+            for offsetX in range(-UNLOAD_RADIUS, UNLOAD_RADIUS + 1):
+                chunk = (centerX + offsetX, centerY + offsetY)
+                if chunk not in self.loaded and not self.unloaded.get(chunk, (False,))[0]:
+                    self._request(chunk)
+
+        for chunk in [chunk for chunk in self.futures if distance(chunk) > UNLOAD_RADIUS + 1]:
+            self.futures.pop(chunk).cancel()
+            # Le joueur est parti ailleurs : le contenu sera tiré à nouveau s'il revient
+
+    def _store(self, chunk, complete, states):
+        """Ajoute des astéroïdes à l'état d'un chunk déchargé, et oublie les plus anciens chunks au-delà de maxUnloaded
+
+        Args:
+            chunk (tuple): Coordonnées du chunk
+            complete (bool): True si le chunk vient d'être déchargé : son état contient tout ses astéroïdes
+            states (list): États d'astéroïdes à ajouter
+        """
+        entry = self.unloaded.pop(chunk, None)
+        if entry is not None:
+            complete, states = complete or entry[0], entry[1] + states
+        self.unloaded[chunk] = (complete, states)
+
+        while len(self.unloaded) > self.maxUnloaded:
+            self.unloaded.popitem(last=False)
+
+    def _request(self, chunk):
+        """Demande au thread de tirer le contenu du chunk, s'il ne l'a pas déjà été
+        """
+        if not self.threaded or chunk in self.futures:
+            return
+
+        if self.executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            # Importé à la première demande, après la première frame
+            self.executor = ThreadPoolExecutor(1, thread_name_prefix="chunks")
+        self.futures[chunk] = self.executor.submit(generate, self.seed, chunk, len(self.world.images.asteroidImages),
+                                                   self.spawn)
+
+    def _load(self, chunk):
+        """Charge un chunk : son état gardé s'il a déjà été déchargé, sinon son contenu tiré
+
+        Le contenu est attendu s'il n'est pas encore prêt : le résultat ne dépend jamais du thread.
+
+        Args:
+            chunk (tuple): Coordonnées du chunk
+        """
+        world = self.world
+        complete, states = self.unloaded.pop(chunk, (False, []))
+
+        if not complete:
+            future = self.futures.pop(chunk, None)
+            generated = (generate(self.seed, chunk, len(world.images.asteroidImages), self.spawn) if future is None
+                         else future.result())
+            states = generated + states
+
+        self.loaded.add(chunk)
+        for state in states:
+            Asteroid.restore(world, state)
+
+    def close(self):
+        """Arrête le thread de génération
+        """
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
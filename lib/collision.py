@@ -0,0 +1,130 @@
+"""Fichier contenant les réponses aux collisions : dégâts, boucliers et score, rangés par paire de catégories
+
+Chaque classe d'objet a une catégorie et une équipe, des entiers fixés sur la classe. Une paire d'objets qui se
+touchent est résolue une seule fois par tick : resolve() trouve la réponse de la paire de catégories dans
+responses et l'applique aux deux objets à la fois. Pour un nouveau type d'objet, il suffit de lui donner une
+catégorie et d'enregistrer ses réponses avec register().
+"""
+
+from math import hypot
+
+
+PLAYER, ENEMY, ASTEROID, BULLET = range(4)
+# Catégories des objets
+
+TEAM_PLAYER, TEAM_RED = 0, 1
+NEUTRAL = -1
+# Équipes, aussi rangées dans BulletPool.owner : pas de dégâts entre membres d'une même équipe.
+# Tous les vaisseaux rouges (redShooter, redSniper, redBlaster) partagent TEAM_RED, comme l'ownership "red" de
+# redTeam avant : leurs tirs ne se touchent pas entre eux, quelle que soit la classe (voir bench/dispatch.py).
+# Les astéroïdes sont neutres, tout le monde peut les toucher
+
+responses = {}
+# {(catégorie, catégorie): (réponse, True si les deux objets sont à inverser avant de l'appeler)}
+
+
+def register(first, second):
+    """Décorateur qui enregistre une réponse pour une paire de catégories, dans les deux ordres
+
+    La réponse est appelée avec (world, objet de catégorie first, objet de catégorie second, dégâts).
+    Les décorateurs s'empilent pour utiliser la même réponse pour plusieurs paires.
+
+    Args:
+        first (int): Catégorie du premier objet donné à la réponse
+        second (int): Catégorie du second objet donné à la réponse
+    """
+    def decorator(response):
+        responses[first, second] = (response, False)
+        if first != second:
+            responses[second, first] = (response, True)
+        return response
+    return decorator
+
+
+def resolve(world, first, second):
+    """Applique la réponse à la collision entre deux objets, une seule fois pour les deux
+
+    Les dégâts valent la vitesse relative des deux objets. Une paire sans réponse enregistrée ne fait rien.
+
+    Args:
+        world (World): Monde des deux objets
+        first (Object): Premier objet de la paire
+        second (Object): Second objet de la paire
+    """
+    entry = responses.get((first.category, second.category))
+    if entry is None:
+        return
+
+    response, swap = entry
+    if swap:
+        first, second = second, first
+
+    firstForces, secondForces = first.forces, second.forces
+    response(world, first, second, hypot(firstForces[0] - secondForces[0], firstForces[1] - secondForces[1]))
+
+
+def absorb(player, damage):
+    """Fait prendre les dégâts au bouclier du joueur s'il lui reste des PV
+
+    Args:
+        player (Player): Joueur touché
+        damage (float): Dégâts de la collision
+
+    Returns:
+        bool: True si le bouclier a pris les dégâts à la place du joueur
+    """
+    player.shieldCounter = 300  # Le bouclier ne se recharge plus pendant 5 secondes
+    if player.shieldHP > 0:
+        player.shieldHP -= damage
+        player.shieldAlphaCounter = 255
+        return True
+    return False
+
+
+@register(ASTEROID, ASTEROID)
+@register(ASTEROID, ENEMY)
+@register(ENEMY, ENEMY)
+def crash(world, first, second, damage):
+    """Deux objets sans bouclier se percutent : chacun perd les dégâts
+    """
+    first.HP -= damage
+    second.HP -= damage
+
+
+@register(PLAYER, ASTEROID)
+@register(PLAYER, ENEMY)
+def ram(world, player, other, damage):
+    """Le joueur percute un objet : le bouclier protège le joueur, et détruire un ennemi rapporte des points
+    """
+    if other.category == ENEMY and other.HP - damage <= 0:
+        player.HP += 3
+        world.score += 25
+
+    if not absorb(player, damage):
+        player.HP -= damage
+    other.HP -= damage
+
+
+@register(BULLET, PLAYER)
+@register(BULLET, ENEMY)
+@register(BULLET, ASTEROID)
+def shot(world, bullet, target, damage):
+    """Une balle touche un objet : pas de tir ami, et les tirs du joueur le soignent et rapportent des points
+    """
+    if bullet.team == target.team:
+        return
+
+    if bullet.team == TEAM_PLAYER:
+        player = world.player
+        player.HP += 2 if target.category == ASTEROID else 6
+        player.ammo += 4
+        player.fuel += 8
+        if target.HP - damage <= 0:
+            world.score += 5 if target.category == ASTEROID else 25
+
+    if target.category == PLAYER and absorb(target, damage):
+        bullet.HP -= damage
+        return
+
+    bullet.HP -= damage
+    target.HP -= damage
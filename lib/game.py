@@ -0,0 +1,495 @@
+"""Fichier contenant la boucle du jeu et la gestion des évènements de la partie
+"""
+
+from collections import defaultdict
+from random import Random
+from time import perf_counter
+
+import pygame
+
+from lib.world import World
+from lib.render import Renderer, DirtyRenderer, AutoScale
+from lib.collision import ENEMY, resolve
+from lib.camera import FULL
+from lib.physics import bounce, centerNormal, closingSpeed
+from lib.ship import hudHealthbar
+from lib.object import drawDebug
+from lib.player import Player, drawShield, hudGauges
+from lib.red.shooter import redShooter
+from lib.red.sniper import redSniper
+from lib.red.blaster import redBlaster
+
+
+tickRate = 60  # Le nombre de fois où le jeu tourne par seconde
+maxCatchUp = 5  # Nombre maximum de ticks simulés pour rattraper le retard d'une seule frame
+
+possibleEnemies = [redShooter, redSniper, redBlaster]
+maxEnemies = 256  # Vaisseaux en jeu, joueur compris, au-delà duquel aucun ennemi n'apparaît (voir bench/ai.py)
+
+
+def createWorld(headless=False, seed=None, size=None, dirtyRects=False, renderScale=1.0, profile=False,
+                profilePath=None):
+    """Crée l'écran puis le monde
+
+    Args:
+        headless (bool, optional): Si True, l'écran n'est jamais affiché et garde une taille logique de 1920x1080
+        seed (int, optional): Graine du générateur aléatoire du monde, tirée au hasard si None
+        size (tuple, optional): Taille logique de l'écran sans affichage, pour relire une partie enregistrée
+        dirtyRects (bool, optional): Si True, seules les zones modifiées de l'écran sont redessinées et envoyées
+        renderScale (float, optional): Résolution de rendu par rapport à l'écran, ou "auto" pour l'ajuster
+            selon le temps des frames
+        profile (bool, optional): Si True, mesure le temps de chaque phase des frames (graphe avec F3)
+        profilePath (str, optional): Fichier .csv ou .jsonl où écrire le temps des phases de chaque frame
+
+    Returns:
+        World: Le monde prêt à jouer
+    """
+    screenInfo = pygame.display.Info()
+
+    if headless:
+        screenWidth, screenHeight = size or (1920, 1080)
+        screen = pygame.display.set_mode((1, 1))
+        # La simulation garde une taille d'écran logique, mais rien n'est jamais affiché
+    else:
+        screenWidth, screenHeight = screenInfo.current_w, screenInfo.current_h
+        screen = pygame.display.set_mode((screenWidth, screenHeight))
+
+    screen.fill((20, 20, 20))
+
+    world = World(screen, screenWidth, screenHeight, headless, seed)
+    if not headless:
+        world.renderer = DirtyRenderer(world) if dirtyRects else Renderer(world)
+
+        if renderScale == "auto":
+            world.autoScale = AutoScale(world)
+        else:
+            world.setRenderScale(renderScale)
+
+    if profile or profilePath is not None:
+        from lib.profiler import Profiler
+        # Importé seulement si le profilage est demandé
+        world.profiler = Profiler(world, profilePath)
+
+    return world
+
+
+def visibleCurseur(option):
+    """Change la visibilité du curseur windows
+    
+    Args:
+        option (bool): True si le curseur doit être visible, False sinon.
+    """
+
+    if option is True:
+        pygame.mouse.set_visible(True)
+    else:
+        pygame.mouse.set_visible(False)
+
+
+def toggleDebug(world):
+    """Copie les vecteurs relatifs aux objects et les compteurs de masques de la frame précédente, si F1 est appuyée
+
+    Args:
+        world (World): Monde à afficher
+
+    Returns:
+        tuple: (vecteurs de chaque objet, texte des masques), None sans F1
+    """
+    if not world.key[pygame.K_F1]:
+        return None
+
+    rotationCache = world.rotationCache
+    return ([instance.debug() for instance in world.objects],
+            f"Masques : {rotationCache.frameMaskBuilds} construits / {rotationCache.frameMaskRequests} demandés "
+            f"(total {rotationCache.maskBuilds} / {rotationCache.maskRequests})")
+
+
+def drawDebugInfo(world, debug):
+    """Dessine les vecteurs et les compteurs copiés par toggleDebug(), et les pixels envoyés par l'affichage
+
+    Args:
+        world (World): Monde à afficher
+        debug (tuple): (vecteurs de chaque objet, texte des masques)
+    """
+    vectors, masks = debug
+    drawDebug(world, vectors)
+
+    renderer = world.renderer
+    renderer.mark(world.myFont.render_to(world.display, (10, 10), masks, fgcolor=(255, 255, 255), size=14))
+    renderer.mark(world.myFont.render_to(
+            world.display, (10, 28), f"Pixels envoyés : {renderer.pixelsPushed} "
+            f"({renderer.pixelsPushed / (world.screenWidth * world.screenHeight):.0%} de l'écran, "
+            f"{renderer.fullFrames} / {renderer.frames} frames complètes)", fgcolor=(255, 255, 255), size=14))
+
+
+def _randomTick(world):
+    """Permet de créer une variable aléatoire utile pour le déroulement des évènements du jeu
+    """
+    world.randomTick = world.rng.randint(0, 10000)
+
+
+def genStars(world):
+    """Fait apparaître des étoiles au lancement
+    """
+    from lib.stars import StarField
+    # Importé seulement avec un affichage
+
+    rng = Random(f"{world.seed}-stars")
+    # Générateur à part : les étoiles ne doivent pas changer la simulation, avec ou sans affichage
+
+    world.stars = StarField(world.screenWidth, world.screenHeight, rng.randint(3000, 12000), rng=rng)
+    # Couches de parallaxe de 1/3 à 1/12, couleurs entre 170 et 255
+
+
+def manageEnemies(world):
+    """Fait apparaître des ennemis
+    """
+    player, rng = world.player, world.rng
+    dist = 1200
+    if world.randomTick < 500 and len(world.ships) < maxEnemies:
+        position = (int(player.x + rng.randint(-dist, -int(dist * 0.5))
+                        if rng.randint(0, 1) == 1 else rng.randint(int(dist * 0.5), dist)),
+                    int(player.y + rng.randint(-dist, -int(dist * 0.5))
+                        if rng.randint(0, 1) == 1 else rng.randint(int(dist * 0.5), dist)))
+
+        world.ships.add(rng.choice(possibleEnemies)(world, position))
+
+
+def manageCollisions(world):
+    """Gère les collisions : chaque paire d'objets qui se touchent n'est trouvée qu'une fois par tick
+
+    Près de l'écran, les masques décident du contact. Si un des deux objets est loin de la caméra, les cercles
+    de la grille suffisent : ses masques ne sont jamais construits.
+    """
+    world.spatialHash.rebuild(world.objects)
+
+    for instance, other in world.spatialHash.pairs():
+
+        if instance.dying or other.dying:
+            continue
+
+        if instance.lod == FULL and other.lod == FULL:
+            normal = instance.contact(other)
+        else:
+            normal = centerNormal(instance, other)
+
+        if normal is not None and closingSpeed(instance, other, normal) > 0:
+            resolve(world, instance, other)
+            # Une seule réponse pour les deux objets, voir lib.collision
+            bounce(instance, other, normal)
+            # Après les dégâts, qui dépendent de la vitesse avant le choc
+            for ship in (instance, other):
+                if ship.category == ENEMY:
+                    world.fleet.pull(ship)  # Les forces des vaisseaux rouges sont gardées par la flotte
+
+    world.bullets.collide([*world.ships, *world.asteroids])
+
+
+def updateGame(world):
+    """Fonction qui actualise tout les objects : C'est un Tick, toujours de 1 / tickRate secondes
+    """
+
+    profiler = world.profiler
+    if profiler is not None:
+        profiler.begin()
+
+    world.rotationCache.newFrame()
+    world.camera.update()
+
+    world.chunks.update()  # Les astéroïdes viennent des chunks autour du joueur, voir lib.chunks
+    manageEnemies(world)
+    if profiler is not None:
+        profiler.lap("spawning")
+
+    world.bullets.update()  # Avant les vaisseaux : les balles tirées pendant ce tick ne bougent qu'au suivant
+    world.objects.update()
+    world.fleet.update()  # Après les objets : tout les vaisseaux rouges bougent, visent et tirent en une passe
+    if profiler is not None:
+        profiler.lap("physics")  # Sans la rotation, comptée à part par Object.update()
+
+    manageCollisions(world)
+    if profiler is not None:
+        profiler.lap("collision")
+
+
+def snapshotGame(world, alpha):
+    """Copie de la simulation tout ce qu'il faut pour dessiner une frame, avec les positions interpolées entre les
+    deux derniers ticks
+
+    Args:
+        world (World): Monde à afficher
+        alpha (float): Avancement entre le tick précédent (0) et le dernier tick (1)
+
+    Returns:
+        Frame: Frame à dessiner avec renderFrame(), voir lib.pipeline
+    """
+    from lib.pipeline import Frame
+    # Importé seulement avec un affichage : déjà chargé après la première frame
+
+    camera = world.player.renderPosition(alpha)
+    frame = Frame(camera)
+
+    for instance in world.objects:
+        instance.snapshot(frame, alpha, camera)
+    world.bullets.snapshot(frame, alpha, camera)
+
+    frame.debug = toggleDebug(world)
+    if world.restart is True:
+        frame.gameOver = (world.score, world.highscore)
+    if world.profiler is not None:
+        frame.overlay = world.profiler.overlay()
+
+    return frame
+
+
+def renderFrame(world, frame, profiler=None):
+    """Dessine une frame copiée par snapshotGame(), sans lire aucun objet du jeu, puis l'envoie à l'écran
+
+    Args:
+        world (World): Monde à afficher
+        frame (Frame): Frame à dessiner
+        profiler (Profiler, optional): Mesure les phases du dessin, None dans le thread de dessin
+    """
+    screen, renderer = world.screen, world.renderer
+
+    renderer.beginFrame(frame.camera)  # Toujours en premier !
+    if profiler is not None:
+        profiler.lap("stars")
+
+    for shield in frame.shields:
+        drawShield(world, shield)
+    with world.rotationCache.lock:
+        # Le thread principal ne construit pas de masque, et ne verrouille donc pas d'image, pendant ces blits
+        for sequence in (frame.sprites, frame.bullets):
+            for rect in screen.blits(renderer.downscale(sequence)):
+                renderer.mark(rect)
+    if profiler is not None:
+        profiler.lap("draw")
+
+    renderer.upscale()
+    # Le HUD est dessiné sur l'écran, par-dessus l'image agrandie : toujours en pleine résolution
+
+    hud = [hudHealthbar(world, bar) for bar in frame.bars]
+    if frame.gauges is not None:
+        hud += hudGauges(world, frame.gauges)
+    if frame.gameOver is not None:
+        hud += hudGameOver(world, *frame.gameOver)
+    world.hud.draw(world, hud)
+    # Par-dessus tout les sprites et les balles, en un seul appel
+
+    if frame.debug is not None:
+        drawDebugInfo(world, frame.debug)
+    if frame.overlay is not None:
+        world.profiler.draw(frame.overlay)
+    if profiler is not None:
+        profiler.lap("hud")
+
+    renderer.endFrame()
+    if profiler is not None:
+        profiler.lap("flip")
+
+
+def drawGame(world, alpha):
+    """Affiche tout, avec les positions interpolées entre les deux derniers ticks, sans thread de dessin
+
+    Args:
+        world (World): Monde à afficher
+        alpha (float): Avancement entre le tick précédent (0) et le dernier tick (1)
+    """
+    profiler = world.profiler
+    if profiler is not None:
+        profiler.begin()
+
+    frame = snapshotGame(world, alpha)
+    if profiler is not None:
+        profiler.lap("draw")
+
+    renderFrame(world, frame, profiler)
+
+
+def hudGameOver(world, score, highscore):
+    """Textes et positions de l'écran de fin de partie, pour la passe du HUD : rendus une seule fois par partie
+
+    Args:
+        world (World): Monde à afficher
+        score (int): Score de la partie finie
+        highscore (int): Meilleur score avant cette partie
+
+    Returns:
+        list: (image, position) dans l'ordre d'affichage, voir Hud.draw()
+    """
+    text = world.hud.text
+    centered_screenWidth, centered_screenHeight = world.centered_screenWidth, world.centered_screenHeight
+
+    if score > highscore:
+        record = text(f"New highscore ! Previous was {highscore}", 40, (30, 100, 120))
+    else:
+        record = text(f"Highscore : {highscore}", 40, (30, 150, 120))
+
+    left = centered_screenWidth // 1.5
+    return [(text("GAME OVER", 165, (200, 30, 30)), (centered_screenWidth * 0.5, centered_screenHeight * 0.5)),
+            (text(f"Your score is {score}", 40, (30, 100, 120)), (left, centered_screenHeight)),
+            (record, (left, centered_screenHeight * 1.2)),
+            (text("Press enter to restart", 60, (30, 100, 120)), (left, centered_screenHeight * 1.4))]
+
+
+def tickInput(world, keys, recorder=None, replay=None):
+    """Choisit les touches d'un tick, et les enregistre si besoin
+
+    Args:
+        world (World): Monde où jouer
+        keys (list): État du clavier lu pour cette frame, None sans affichage
+        recorder (ReplayRecorder, optional): Enregistre les touches de chaque tick
+        replay (ReplayPlayer, optional): Relit les touches d'une partie enregistrée au lieu du clavier
+
+    Returns:
+        bool: False si la partie relue est finie
+    """
+    if replay is not None:
+        if replay.finished:
+            return False
+        world.key = replay.next()
+
+    elif keys is not None:
+        world.key = keys
+
+    else:
+        world.key = defaultdict(bool)  # Aucune touche appuyée
+        world.key[pygame.K_RETURN] = world.restart
+        # Sans affichage, personne ne peut appuyer sur entrée : la partie suivante commence directement
+
+    if recorder is not None:
+        recorder.record(world.key)
+
+    return True
+
+
+def run(world, maxTicks=0, recorder=None, replay=None, maxFps=144, renderThread=False):
+    """Boucle du jeu, jusqu'à Échap ou maxTicks
+
+    La simulation avance par ticks fixes de 1 / tickRate secondes, quel que soit le framerate : sur une
+    machine lente, plusieurs ticks sont simulés par frame (au plus maxCatchUp), sur une machine rapide
+    l'affichage interpole entre les deux derniers ticks. Sans affichage, les ticks s'enchaînent sans attendre.
+    Avec renderThread, chaque frame est copiée puis dessinée par un thread à part, pendant les ticks suivants.
+
+    Args:
+        world (World): Monde où jouer
+        maxTicks (int, optional): Nombre de ticks avant d'arrêter le jeu, 0 == sans limite
+        recorder (ReplayRecorder, optional): Enregistre les touches de chaque tick
+        replay (ReplayPlayer, optional): Relit les touches d'une partie enregistrée au lieu du clavier
+        maxFps (int, optional): Nombre maximum de frames affichées par seconde, 0 == sans limite
+        renderThread (bool, optional): Si True, les frames sont dessinées par un thread à part, voir lib.pipeline
+    """
+    clock = pygame.time.Clock()
+
+    pipeline = None
+    if not world.headless:
+        genStars(world)
+        if renderThread:
+            from lib.pipeline import RenderThread
+            pipeline = RenderThread(world, renderFrame)
+
+    visibleCurseur(False)
+
+    startTime = perf_counter()
+    previousTime = startTime
+    accumulator = 0.0  # Temps pas encore simulé, en secondes
+
+    loop = True
+    # boucle du programme
+
+    while loop:
+
+        world.reset()
+        world.player = Player(world, 300, (world.screenWidth // 2, world.screenHeight // 2), world.ships, 500, 40)
+        # Le centre de l'écran, pas de la surface de rendu : l'échelle de rendu ne change pas la simulation
+
+        newRound = False
+
+        while loop and not newRound:
+
+            keys = None
+            steps = 1
+
+            if not world.headless:
+                clock.tick(maxFps)
+
+                now = perf_counter()
+                accumulator += now - previousTime
+                previousTime = now
+
+                steps = int(accumulator * tickRate)
+                accumulator -= steps / tickRate
+                steps = min(steps, maxCatchUp)
+                # Au-delà, le retard est abandonné : le jeu ralentit au lieu de geler
+
+                pygame.event.pump()
+                keys = pygame.key.get_pressed()  # Partie clavier, j'espère
+
+                if world.profiler is not None:
+                    world.profiler.toggle(keys[pygame.K_F3])
+                    # Lue ici et pas dans world.key : le graphe ne change pas la partie, il n'est pas enregistré
+
+            for _ in range(steps):
+
+                if not tickInput(world, keys, recorder, replay):
+                    loop = False
+                    break
+
+                if world.key[pygame.K_ESCAPE]:
+                    loop = False
+                _randomTick(world)
+
+                if world.restart is True and world.key[pygame.K_RETURN] is True:
+                    newRound = True
+                    break
+
+                updateGame(world)
+
+                world.tick += 1
+                if world.tick == maxTicks:
+                    loop = False
+
+                if not loop:
+                    break
+
+            if pipeline is not None and not newRound:
+                profiler = world.profiler
+                if profiler is not None:
+                    profiler.begin()
+                pipeline.submit(snapshotGame(world, accumulator * tickRate))
+                if profiler is not None:
+                    profiler.lap("draw")
+                # Le thread règle lui-même l'échelle de rendu automatique, sur son temps de dessin
+
+            elif not world.headless and not newRound:
+                drawGame(world, accumulator * tickRate)
+
+                if world.autoScale is not None:
+                    world.autoScale.update(perf_counter() - now)
+                    # Temps de la frame sans l'attente de clock.tick()
+
+            if world.profiler is not None:
+                world.profiler.endFrame()
+
+        world.highscore = world.score if world.score > world.highscore else world.highscore
+
+    if pipeline is not None:
+        pipeline.close()
+
+    visibleCurseur(True)
+
+    if recorder is not None:
+        recorder.save()
+
+    if world.profiler is not None:
+        world.profiler.close()
+    world.chunks.close()
+
+    if world.headless:
+        elapsed = perf_counter() - startTime
+        print(f"{world.tick} ticks simulés ({world.tick / tickRate:.1f} s de jeu) en {elapsed:.2f} s, "
+              f"{world.tick / elapsed:.0f} ticks/s | score {world.score}, highscore {world.highscore}, "
+              f"graine {world.seed}, empreinte {world.digest()[:12]}")
+        if world.profiler is not None:
+            print(f"Temps moyen par tick : {world.profiler.summary()}")
@@ -0,0 +1,118 @@
+"""Fichier contenant la couche du HUD : textes et barres gardés une fois rendus, puis blittés en une seule passe
+
+Un texte est rendu une seule fois par (texte, taille, couleur), une barre une seule fois par largeurs en pixels :
+tant que les munitions, les PV ou le score ne changent pas, le HUD n'est qu'une suite de copies. Chaque frame,
+game.renderFrame() rassemble les (image, position) de tout le HUD, et Hud.draw() les blitte d'un seul appel.
+Mêmes pixels qu'avec pygame.draw.rect et Font.render_to directement sur l'écran.
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+
+class Hud:
+    """Caches des textes et des barres du HUD
+
+    Attributes:
+        barBuilds (int): Nombre de barres dessinées, soit les barres pas trouvées dans le cache
+        bars (OrderedDict): {rectangles en pixels entiers et couleurs: Surface}, de la plus ancienne à la plus récente
+        font (pygame.freetype.Font): Police des textes
+        maxBars (int): Nombre maximum de barres gardées
+        maxTexts (int): Nombre maximum de textes gardés
+        textBuilds (int): Nombre de textes rendus, soit les textes pas trouvés dans le cache
+        texts (OrderedDict): {(texte, taille, couleur): Surface}, du plus ancien au plus récent
+    """
+
+    def __init__(self, font, maxTexts=256, maxBars=1024):
+        """Constructeur des caches, vides
+
+        Args:
+            font (pygame.freetype.Font): Police des textes
+            maxTexts (int, optional): Nombre maximum de textes gardés
+            maxBars (int, optional): Nombre maximum de barres gardées
+        """
+        self.font = font
+        self.maxTexts = maxTexts
+        self.maxBars = maxBars
+
+        self.texts = OrderedDict()
+        self.bars = OrderedDict()
+
+        self.textBuilds = 0
+        self.barBuilds = 0
+
+    def text(self, string, size, color):
+        """Retourne le texte rendu, depuis le cache s'il l'a déjà été avec cette taille et cette couleur
+
+        Args:
+            string (str): Texte à rendre
+            size (int): Taille de la police
+            color (tuple): Couleur (r, g, b)
+
+        Returns:
+            Surface: Texte rendu, à blitter à la position qu'aurait eue Font.render_to
+        """
+        key = (string, size, color)
+
+        surface = self.texts.get(key)
+        if surface is None:
+            self.textBuilds += 1
+            surface = self.texts[key] = self.font.render(string, fgcolor=color, size=size)[0].convert_alpha()
+            # Au format de l'écran : freetype rend en RGBA, que SDL blitte bien plus lentement
+            if len(self.texts) > self.maxTexts:
+                self.texts.popitem(last=False)
+        else:
+            self.texts.move_to_end(key)
+
+        return surface
+
+    def bar(self, world, position, *parts):
+        """Retourne les rectangles dessinés, dans l'ordre, sur une image transparente, depuis le cache si possible
+
+        Les rectangles sont coupés au bord droit et au bord bas de l'écran, comme pygame.draw.rect
+        les couperait : une barre très longue (PV énormes) ne crée pas une image plus grande que l'écran.
+
+        Args:
+            world (World): Monde où se trouve l'écran
+            position (tuple): Position du coin de la barre sur l'écran
+            *parts (tuple): (couleur, (x, y, largeur, hauteur)) relatifs au coin, comme pour pygame.draw.rect
+
+        Returns:
+            Surface: Barre, à blitter à position
+        """
+        limitX, limitY = world.screenWidth - int(position[0]), world.screenHeight - int(position[1])
+        key = []
+        for color, rect in parts:
+            x, y, width, height = pygame.Rect(rect)
+            key.append((color, (x, y, min(width, limitX - x), min(height, limitY - y))))
+        key = tuple(key)
+        # En pixels entiers, comme pygame.draw.rect : la barre ne change que quand un rectangle visible gagne ou perd
+        # un pixel
+
+        surface = self.bars.get(key)
+        if surface is None:
+            self.barBuilds += 1
+            width = max(max(x + w for _, (x, _, w, _) in key), 1)
+            height = max(max(y + h for _, (_, y, _, h) in key), 1)
+            surface = pygame.Surface((width, height), pygame.SRCALPHA)
+            for color, rect in key:
+                pygame.draw.rect(surface, color, rect)
+            surface = self.bars[key] = surface.convert_alpha()
+            if len(self.bars) > self.maxBars:
+                self.bars.popitem(last=False)
+        else:
+            self.bars.move_to_end(key)
+
+        return surface
+
+    def draw(self, world, sprites):
+        """Blitte tout le HUD de la frame d'un seul appel, et signale les zones touchées à l'affichage
+
+        Args:
+            world (World): Monde où se trouve l'écran
+            sprites (list): (image, position) du HUD, dans l'ordre d'affichage
+        """
+        mark = world.renderer.mark
+        for rect in world.display.blits(sprites):
+            mark(rect)
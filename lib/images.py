@@ -0,0 +1,115 @@
+"""Fichier contenant le chargement des images du jeu, depuis l'atlas des sprites
+"""
+
+import pygame
+
+from collections import OrderedDict
+
+from lib import atlas
+
+
+EXPLOSION_SIZES = (48, 64, 96, 128)
+# Classes de taille des explosions : côté de la plus grande image de l'animation, en pixels
+
+
+class Images:
+    """Toutes les images utilisées par le jeu, chargées une seule fois
+
+    Attributes:
+        asteroidImages (list): Liste contenants les images des différents types d'astéroïdes
+        blasterRedSprite (Surface): Image du 'blaster' rouge
+        bulletImage (Surface): Image des balles
+        explosionImages (list): Images de l'explosion à leur taille d'origine, dans l'ordre : leur taille donne le
+            rayon d'un objet qui explose, avec ou sans affichage
+        explosions (dict): {classe de taille: images de l'explosion redimensionnées}, voir EXPLOSION_SIZES
+        firingImage (Surface): Image du vaisseau joueur avec les éclats des canons
+        firingMouvementImages (list): Images du vaisseau joueur avec le propulseur ET les éclats des canons
+        maxScaled (int): Nombre maximum d'images redimensionnées gardées
+        mouvementImages (list): Images du vaisseau joueur avec le propulseur activé
+        rotations (dict): {image: rotations précalculées, une par angle de RotationCache}, voir RotationCache.bake()
+        scaled (OrderedDict): {(image source, largeur, hauteur): image redimensionnée}, de la plus ancienne à la plus récente
+        shooterRedSprite (Surface): Image du 'shooter' rouge
+        sniperRedSprite (Surface): Image du 'sniper' rouge
+        VaisseauJoueur (Surface): Image du vaisseau joueur
+    """
+
+    def __init__(self):
+        """Charge toutes les images depuis l'atlas, une fois l'écran créé
+
+        Les images sont déjà à leur taille d'affichage et au format de l'écran : chaque blit est une simple copie.
+        """
+        sprites, rotations = atlas.load()
+
+        self.VaisseauJoueur = sprites["player"][0]
+        self.mouvementImages = sprites["playerMoving"]
+        self.firingMouvementImages = sprites["playerFiringMoving"]
+        self.firingImage = sprites["playerFiring"][0]
+
+        self.asteroidImages = sprites["asteroids"]
+        # Images triées par nom dans l'atlas, pour que la graine suffise à rejouer une partie
+
+        self.bulletImage = sprites["bullet"][0]
+
+        self.explosionImages = sprites["explosion"]
+        self.explosions = {size: _scaleAnimation(self.explosionImages, size) for size in EXPLOSION_SIZES}
+
+        self.shooterRedSprite = sprites["redShooter"][0]
+        self.blasterRedSprite = sprites["redBlaster"][0]
+        self.sniperRedSprite = sprites["redSniper"][0]
+
+        self.rotations = {self.bulletImage: rotations["bullet"]}
+
+        self.scaled = OrderedDict()
+        self.maxScaled = 256
+
+    def explosion(self, image):
+        """Retourne les images de l'explosion de la classe de taille la plus proche de l'image
+
+        Args:
+            image (Surface): Image de l'objet qui va exploser
+
+        Returns:
+            list: Images de l'explosion, dans l'ordre, à ne pas modifier
+        """
+        side = max(image.get_size())
+        return self.explosions[min(EXPLOSION_SIZES, key=lambda size: abs(size - side))]
+
+    def scale(self, image, size):
+        """Retourne l'image redimensionnée, depuis le cache si elle a déjà été demandée à cette taille
+
+        Deux objets de même taille partagent aussi leurs rotations dans le RotationCache.
+
+        Args:
+            image (Surface): Image source
+            size (tuple): Taille voulue, tronquée en pixels entiers comme pygame.transform.scale
+
+        Returns:
+            Surface: Image redimensionnée, à ne pas modifier
+        """
+        key = (image, int(size[0]), int(size[1]))
+
+        scaled = self.scaled.get(key)
+        if scaled is None:
+            scaled = self.scaled[key] = pygame.transform.scale(image, key[1:])
+            if len(self.scaled) > self.maxScaled:
+                self.scaled.popitem(last=False)
+        else:
+            self.scaled.move_to_end(key)
+
+        return scaled
+
+
+def _scaleAnimation(images, size):
+    """Redimensionne toutes les images d'une animation du même facteur, pour que la plus grande fasse size pixels
+
+    Args:
+        images (list): Images de l'animation, dans l'ordre
+        size (int): Côté voulu de la plus grande image
+
+    Returns:
+        list: Images redimensionnées, dans le même ordre
+    """
+    ratio = size / max(max(image.get_size()) for image in images)
+    return [pygame.transform.smoothscale(image, (max(round(image.get_width() * ratio), 1),
+                                                 max(round(image.get_height() * ratio), 1)))
+            for image in images]
@@ -1,35 +1,53 @@
 """Fichier contenant les méthodes relatives aux objets physiques
 """
 
+import pygame
+
+from pygame import Vector2
+from math import cos, sin, hypot
+from time import perf_counter_ns
+
+from lib.camera import FULL
+from lib.collision import NEUTRAL
+from lib.physics import contactNormal
+from lib.vectors import drawVector
+
 
 class Object(pygame.sprite.Sprite):
     """Classe commune aux objets physiques
+
+    Les attributs sont déclarés dans __slots__ : pas de dictionnaire par objet pour eux, et les positions et forces
+    sont des nombres modifiés sur place, rien n'est alloué à chaque tick.
     
     Attributes:
         angle (float): Angle de l'objet, relatif à l'axe horizontal vers la droite, counter-clockwise == positif, en rad
         angleMomentum (float): Mouvement angulaire de l'objet, counter-clockwise (en rad)
+        category (int): Catégorie de l'objet pour les réponses aux collisions, None si l'objet n'en a aucune
         direction (Vector2): Direction de l'objet
-        drawPos (tuple): Position d'affichage de l'objet, relatif au vaisseau joueur
         dying (bool): Si True, l'object est à supprimer
         dyingCounter (int): Temps nécessaire pour mourir
-        explosionSprites (list): Images d'explosion
+        explosionFrame (int): Nombre d'images de l'explosion déjà affichées, 0 avant l'explosion : l'image actuelle
+            est explosionSprites[explosionFrame - 1]
+        explosionSprites (list): Images de l'explosion à la taille de l'objet, partagées par sa classe de taille,
+            voir Images.explosion()
         forces (list): Forces appliquées à l'objet : Définit le mouvement / tick ([x, y])
         HP (int): Points de vie de l'objet. 0 == 'Mort'.
         image (image): Image de l'objet
-        mask (pygame.mask.Mask): Masque de l'object, en gros : Sa hitbox
+        lod (int): Niveau de détail de l'objet au dernier tick, FULL près de l'écran, voir lib.camera
         mass (int): Masse en Kilogrammes (Init en tonnes)
         originalImage (Image): Image original de l'objet, utilisée pour tourner sans perdre la qualité
         originalOriginalImage (Image): Image original de l'objet, pour des raisons de stockage
-        pos (list): Position de l'objet sur l'écran.
-        previousPos (list): TODO : Collisions
+        radius (float): Rayon du cercle qui contient l'image quel que soit son angle, pour la broad-phase
+        previousX (float): Coordonnée X de l'objet au tick précédent, pour interpoler l'affichage
+        previousY (float): Coordonnée Y de l'objet au tick précédent, pour interpoler l'affichage
         rect (rect): Surface d'affichage de l'objet, utile internement
-        relative_x (int): Distance relative entre le joueur et l'objet sur l'axe X
-        relative_y (int): Distance relative entre le joueur et l'objet sur l'axe Y
-        savedRect (pygame.rect.Rect): TODO : Collisions
+        rotationSource (Image): Image source utilisée lors de la dernière rotation, pour retrouver le masque associé
+        renderPos (tuple): Position d'affichage interpolée, calculée par snapshot()
         spriteExplosionCounter (int): Temps entre chaque frame de l'explosion
-        vectDistanceToPlayer (Vector2): Vecteur distance allant de l'objet au joueur
-        velocity (Vector2): Vecteur vitesse de l'objet
+        team (int): Équipe de l'objet : pas de dégâts entre membres d'une même équipe
+        vectDistanceToPlayer (Vector2): Vecteur distance allant de l'objet au joueur, en coordonnées du monde
         x (int): Coordonnée X de l'objet
+        world (World): Monde auquel appartient l'objet
         y (int): Coordonnée Y de l'objet
     
     Deleted Attributes:
@@ -39,12 +57,28 @@ class Object(pygame.sprite.Sprite):
         Ec (float): Énergie cinétique en Newton
         mask (mask): Hitbox de l'objet
         angleAbsolu (float): L'angle toujours positif du vaisseau, relatif à l'axe horizontal, et clockwise
+        drawPos (tuple): Position d'affichage de l'objet, relatif au vaisseau joueur, voir renderPos
+        pos (list): Position de l'objet sur l'écran, voir x et y
+        previousPos (list): TODO : Collisions
+        relative_x (int): Distance relative entre le joueur et l'objet sur l'axe X
+        relative_y (int): Distance relative entre le joueur et l'objet sur l'axe Y
+        savedRect (pygame.rect.Rect): TODO : Collisions
+        velocity (Vector2): Vecteur vitesse de l'objet, toujours égal à forces
     """
 
-    def __init__(self, life, pos, groupe, image, mass):
+    category = None
+    team = NEUTRAL
+
+    __slots__ = ("angle", "angleMomentum", "direction", "dying", "dyingCounter", "explosionFrame", "explosionSprites",
+                 "forces", "HP", "image", "lod", "mass", "originalImage", "originalOriginalImage", "previousX",
+                 "previousY", "radius", "rect", "renderPos", "rotationSource", "spriteExplosionCounter",
+                 "vectDistanceToPlayer", "world", "x", "y")
+
+    def __init__(self, world, life, pos, groupe, image, mass):
         """Constructeur de l'objet
         
         Args:
+            world (World): Monde auquel appartient l'objet
             life (int): PV de l'objet
             pos (tuple): Position de départ
             groupe (list): Groupe Pygame où mettre l'objet
@@ -54,41 +88,54 @@ class Object(pygame.sprite.Sprite):
 
         super().__init__(groupe)
 
-        objects.add(self)
+        self.world = world
+        world.objects.add(self)
+
+        self.vectDistanceToPlayer = Vector2()
+        self.direction = Vector2()
+        self.rect = image.get_rect()
+        # Alloués une seule fois : reset() et update() les modifient sur place
+
+        self.reset(life, pos, image, mass)
+
+    def reset(self, life, pos, image, mass):
+        """Remet l'objet à neuf : appelé par le constructeur, et pour réutiliser un objet mort depuis un pool
+
+        Args:
+            life (int): PV de l'objet
+            pos (tuple): Position de départ
+            image (image): Image de l'objet à afficher
+            mass (int): Masse de l'objet en tonnes
+        """
+        world = self.world
 
         self.forces = [0, 0]  # [x, y]
         self.HP = life
 
         self.x = pos[0]
         self.y = pos[1]
-        self.pos = pos  # La 'vraie' position de l'objet
+        self.previousX = self.x
+        self.previousY = self.y
 
-        self.velocity = Vector2(self.forces)
+        self.renderPos = (self.x + world.centered_screenWidth, self.y + world.centered_screenHeight)
+        # Remplacée par la position interpolée au premier snapshot()
 
-        self.relative_x = self.x  # - player.x
-        self.relative_y = self.y  # - player.y
-
-        # Position relative au vaisseau Joueur
-        self.drawPos = (self.relative_x + centered_screenWidth,
-                        self.relative_y + centered_screenHeight)
-        # Il s'agit de la position d'affichage de l'objet sur l'écran
-        # Relative car le vaisseau est au milieu de l'écran en tout temps
-
-        self.vectDistanceToPlayer = - \
-            Vector2(self.drawPos[0] - centered_screenWidth, self.drawPos[1] - centered_screenHeight)
+        self.vectDistanceToPlayer.update(-self.x, -self.y)
+        # Comme avant le premier tick : le joueur n'est pas encore pris en compte
 
         self.image = image
         self.originalImage = image
+        self.rotationSource = image
+        self.radius = 0.5 * hypot(*image.get_size())
 
-        # self.rect = self.image.get_rect(center=self.pos)
-        self.rect = self.image.get_rect(center=self.pos)
+        self.rect.size = image.get_size()
+        self.rect.center = pos
         self.angleMomentum = 0.0
         self.angle = 0.0  # à droite !
+        self.lod = FULL
 
         self.dying = False
-        self.dyingCounter = len(explosionImages) - 1
-        self.spriteExplosionCounter = 0
-        self.explosionSprites = iter(explosionImages)
+        self.resetExplosion()
 
         self.originalOriginalImage = image
 
@@ -96,11 +143,8 @@ class Object(pygame.sprite.Sprite):
         if int(self.mass) == self.mass:  # si la masse n'a pas de virgules
             self.mass = int(self.mass)
 
-        # self.Ec = 0.5 * self.mass * self.velocity.magnitude_squared()
-        # 1/2 * m * v² , vive la physique
-
         # Initialise la direction vers la droite
-        self.direction = Vector2(cos(self.angle), sin(self.angle))
+        self.direction.update(cos(self.angle), sin(self.angle))
         #  Utilise l'angle pour former un vecteur direction normalisé en utilisant le cercle trigonométrique
         #  cos(angle) retourne la longueur X du vecteur, sin(angle) la longueur Y, selon les axes du cercle.
 
@@ -113,11 +157,19 @@ class Object(pygame.sprite.Sprite):
         Position is {round(self.x, 2), round(self.y, 2)}
         Forces are {round(self.forces[0], 2), round(self.forces[1], 2)}
         Angle : {round(self.angle, 2)} | AngleMomentum : {round(self.angleMomentum, 2)}
-        Absolute Angle : {round(self.angleAbsolu, 2)}
-        Velocity : {round(self.velocity.magnitude(), 2)} | Kinetic Energy : {round(self.Ec, 2)}
+        Velocity : {round(hypot(*self.forces), 2)}
 ---------------------------------------------------------------------------
         """
 
+    def resetExplosion(self):
+        """Remet l'explosion au début : un simple indice dans les images partagées, rien n'est alloué
+        """
+        images = self.world.images
+        self.dyingCounter = len(images.explosionImages) - 1
+        self.spriteExplosionCounter = 0
+        self.explosionFrame = 0
+        self.explosionSprites = images.explosion(self.originalImage)
+
     def die(self):
         """Fonction qui supprime l'objet
         """
@@ -139,7 +191,8 @@ class Object(pygame.sprite.Sprite):
                 self.die()
             self.spriteExplosionCounter = 8
             self.dyingCounter -= 1
-            self.originalImage = next(self.explosionSprites)
+            self.explosionFrame += 1
+            # L'image change au prochain rotate()
 
         self.spriteExplosionCounter -= 1
 
@@ -152,213 +205,150 @@ class Object(pygame.sprite.Sprite):
 
     def rotate(self):
         """Permet de tourner l'objet
+
+        Loin de la caméra, seuls l'angle et la direction avancent : l'image tournée et son masque attendent que
+        l'objet revienne près de l'écran. Une explosion n'est pas tournée : son image est déjà à la bonne taille.
         """
         self.angle += self.angleMomentum
-
-        self.image = pygame.transform.rotate(
-            self.originalImage, - degrees(self.angle))  # Pourquoi ?
-        self.rect = self.image.get_rect(center=self.drawPos)
-        # self.rect = self.image.get_rect(center=self.pos)
-        # redéfinition des attributs rect, image pour appliquer la rotation
-
         self.direction.update((cos(self.angle), sin(self.angle)))
+        if self.lod == FULL:
+            self.orient()
 
-    def getCollideTime(self, other):
-        """Fonction qui rend le multiple du vecteur vitesse de chacun où la collision aurait eu lieu
-        
-        Args:
-            other (Object): Objet avec qui trouver le temps de collision exact
+    def orient(self):
+        """Choisit l'image tournée selon l'angle, ou l'image de l'explosion, et le rayon qui va avec. Appelée par
+        rotate(), ou par la passe de la flotte rouge pour ses vaisseaux (voir lib.red.fleet), près de la caméra
         """
+        explosionFrame = self.explosionFrame
+        if explosionFrame:
+            self.rotationSource = self.world.images.explosionImages[explosionFrame - 1]
+            # L'image d'origine, pas celle à la taille de l'objet : elle seule donne le rayon, comme avant
+        else:
+            self.rotationSource = self.originalImage
+        self.radius = 0.5 * hypot(*self.rotationSource.get_size())
+        # Ne dépend pas de l'affichage : les collisions sont les mêmes avec ou sans écran
+        if self.world.headless:
+            self.rect.size = self.rotationSource.get_size()
+            # Sans affichage, l'image n'est tournée que si son masque est demandé par une collision
+        elif explosionFrame:
+            self.image = self.explosionSprites[explosionFrame - 1]
+            self.rect.size = self.image.get_size()
+        else:
+            self.image = self.world.rotationCache.get(self.rotationSource, self.angle)
+            # Angle quantifié : la rotation est un simple accès au cache la plupart du temps
+            self.rect.size = self.image.get_size()
+        # Le même Rect est gardé, seule sa taille change : snapshot() le place sur la position interpolée
 
-        self.savedRect = self.rect
-        other.savedRect = other.rect
-
-        self.previousPos = (self.pos[0] - self.velocity[0], self.pos[1] - self.velocity[1])
-        other.previousPos = (other.pos[0] - other.velocity[0], other.pos[1] - other.velocity[1])
-
-        self.savedRect.center = self.previousPos
-        other.savedRect.center = other.previousPos
-
-        while not pygame.sprite.collide_mask(self, other):
+    def contact(self, other):
+        """Test précis de collision entre l'objet et other, pixel par pixel
 
-            self.savedRect.move_ip(self.velocity.elementwise() * 0.1)
-            other.savedRect.move_ip(other.velocity.elementwise() * 0.1)
+        Appelée par manageCollisions() pour chaque paire dont les cercles se touchent : la réponse est ensuite
+        appliquée une seule fois pour les deux objets, voir lib.collision et lib.physics.
 
-    def getNormalToSurface(self, myMask, other, collidePos):
-        """Fonction qui retourne le vecteur normale à la surface fournie
-        
         Args:
-            myMask (Mask): Mask de l'objet qui appelle cette fonction
-            other (Mask): Mask de l'autre objet
-            collidePos (tuple): Position du point de collision entre les deux masks
-        
-        No Longer Returned:
-            Vector2: Vecteur normal relatif à la collision
-        """
-        x, y = collidePos
-
-        dx = myMask.overlap_area(other, (x + 1, y)) - myMask.overlap_area(other, (x - 1, y))
-        dy = myMask.overlap_area(other, (x, y + 1)) - myMask.overlap_area(other, (x, y - 1))
-
-        normal = -Vector2(dx, dy)
-        """
-        if normal.magnitude_squared() == 0:
+            other (Object): Objet candidat à la collision
 
-            # sweep alg
+        Returns:
+            tuple: Normale de contact unitaire (x, y), de l'objet vers other, None si les masques ne se touchent pas
         """
 
-    def collisionManage(self):
-        """Fonction qui vérifie la collision contre les autres objets
-        """
-
-        objects.remove(self)
-        # Pour empêcher une collision avec soi-même
-
-        collisionsPotentielles = pygame.sprite.spritecollide(self, objects, False, pygame.sprite.collide_circle)
-        # Regarde les objets enfreignant le rectangle de self, pour éviter de générer les masks de tout les objets
-
-        objects.add(self)
-
-        if collisionsPotentielles:
-
-            self.mask = pygame.mask.from_surface(self.image, threshold=254)
-
-        for other in collisionsPotentielles:
-
-            other.mask = pygame.mask.from_surface(other.image, threshold=254)
-
-            if other.dying:
-                continue
-
-            if pygame.sprite.collide_mask(self, other) is not None:
-
-                """
-                self.mask = pygame.mask.from_surface(self.image, threshold=254)
-                other.mask = pygame.mask.from_surface(other.image, threshold=254)
-
-                collide_position = self.getCollideTime(other)
-                normal = self.getNormalToSurface(self.mask, other.mask, collide_position)
-
-                drawVector(normal, centeredPos(collide_position), "normal", (0, 200, 200))
-
-                if normal.magnitude_squared() == 0:
-
-                    continue
-
-                normal.normalize_ip()
-
-                self.normalVelocity = self.velocity.project(normal)
-                other.normalVelocity = other.velocity.project(normal)
-
-                self.finalNormalVel = None
-                other.finalNormalVel = None
-
-                self.finalNormalVel = (self.mass - other.mass) * self.normalVelocity + 2 * other.mass * other.normalVelocity
-                self.finalNormalVel /= self.mass + other.mass
-
-                other.finalNormalVel = (other.mass - self.mass) * other.normalVelocity + 2 * self.mass * self.normalVelocity
-                other.finalNormalVel /= other.mass + self.mass
-
-                damage = (self.finalNormalVel - other.finalNormalVel).magnitude()
-
-                self.velocity = -self.finalNormalVel
-                self.forces = self.velocity.xy
-
-                other.velocity = other.finalNormalVel
-                other.forces = other.velocity.xy
-                """
-
-                global score
+        rotationCache = self.world.rotationCache
+        mask = rotationCache.getMask(self.rotationSource, self.angle)
+        otherMask = rotationCache.getMask(other.rotationSource, other.angle)
+        # Masques pré-calculés avec l'image tournée, plus de pygame.mask.from_surface à chaque tick
 
-                damage = (self.velocity - other.velocity).magnitude()
+        (width, height), (otherWidth, otherHeight) = mask.get_size(), otherMask.get_size()
+        offset = (int(other.x - otherWidth / 2) - int(self.x - width / 2),
+                  int(other.y - otherHeight / 2) - int(self.y - height / 2))
+        # Décalage entre les deux masques en coordonnées du monde, indépendant de l'affichage
 
-                if isinstance(self, Bullet):
-                    if self.owner == "player":
-                        player.HP += 2 if isinstance(other, Asteroid) else 6
-                        player.ammo += 4
-                        player.fuel += 8
-                        if isinstance(other, redTeam) and other.HP - damage <= 0:
-                            score += 25
-                        elif isinstance(other, Asteroid) and other.HP - damage <= 0:
-                            score += 5
-                    if isinstance(other, redTeam):
-                        if self.owner == other.ownership:
-                            continue
-
-                if isinstance(self, redTeam):
-                    if isinstance(other, Bullet):
-                        if self.ownership == other.owner:
-                            continue
-
-                if isinstance(self, Player):
-                    if other.HP - damage <= 0:
-                        if isinstance(other, redTeam):
-                            player.HP += 3
-                            score += 25
-
-                if isinstance(self, Player):
-                    self.shieldCounter = 300
-                    if self.shieldHP > 0:
-                        self.shieldHP -= damage
-                        self.shieldAlphaCounter = 255
-                        other.HP -= damage
-                        continue
-                elif isinstance(other, Player):
-                    other.shieldCounter = 300
-                    if other.shieldHP > 0:
-                        other.shieldHP -= damage
-                        other.shieldAlphaCounter = 255
-                        self.HP -= damage
-                        continue
-
-                self.HP -= damage
-                other.HP -= damage
+        if mask.overlap(otherMask, offset) is None:
+            return None
+        return contactNormal(mask, otherMask, offset, self, other)
 
     def update(self):
         """Actualise la position de l'objet selon les forces appliquées.
         """
+        self.previousX = self.x
+        self.previousY = self.y
+
         self.x += self.forces[0]  # pos X += force X
         self.y += self.forces[1]  # pos Y += force Y
-        self.pos = (self.x, self.y)
-
-        self.relative_x = self.x - player.x
-        self.relative_y = self.y - player.y
-        self.drawPos = (self.relative_x + centered_screenWidth,
-                        self.relative_y + centered_screenHeight)
 
-        # self.rect.center = self.pos
-        self.rect.center = self.drawPos  # modifie l'emplacement d'affichage vers ces coordonéees
-        self.velocity = Vector2(self.forces)
+        player = self.world.player
+        self.vectDistanceToPlayer.update(player.x - self.x, player.y - self.y)
+        # En coordonnées du monde : ne dépend plus de la taille de l'écran ni de l'échelle de rendu
 
-        self.vectDistanceToPlayer = - \
-            Vector2(self.drawPos[0] - centered_screenWidth, self.drawPos[1] - centered_screenHeight)
+        self.lod = self.world.camera.tier(self)
 
-        # self.Ec = 0.5 * self.mass * self.velocity.magnitude_squared()  # TODO : Calculer ça avant collision
-
-        self.rotate()
+        profiler = self.world.profiler
+        if profiler is None:
+            self.rotate()
+        else:
+            start = perf_counter_ns()
+            self.rotate()
+            profiler.add("rotation", perf_counter_ns() - start)
         self.willExpire()
 
-        if not self.dying:
+        if self.dying or self.HP <= 0:
+            self.explode()
+        # Les collisions sont gérées après l'actualisation de tout les objets, voir manageCollisions()
 
-            self.collisionManage()
+    def renderPosition(self, alpha):
+        """Position de l'objet entre les deux derniers ticks
+        
+        Args:
+            alpha (float): Avancement entre le tick précédent (0) et le tick actuel (1)
 
-            if self.HP <= 0:
-                self.explode()
+        Returns:
+            tuple: (x, y) interpolés
+        """
+        return (self.previousX + (self.x - self.previousX) * alpha,
+                self.previousY + (self.y - self.previousY) * alpha)
 
-        else:
-            self.explode()
+    def snapshot(self, frame, alpha=1.0, camera=None):
+        """Ajoute l'image de l'objet à la frame, sur sa position interpolée, s'il est à l'écran
 
-    def draw(self):
-        """Fonction qui dessine l'objet sur sa position
-        """
+        Args:
+            frame (Frame): Frame à remplir, voir lib.pipeline
+            alpha (float, optional): Avancement entre le tick précédent et le tick actuel
+            camera (tuple, optional): Position interpolée de la caméra, celle du joueur par défaut
 
-        if abs(self.relative_x) - self.rect.w < centered_screenWidth and\
-           abs(self.relative_y) - self.rect.h < centered_screenHeight:
-            screen.blit(self.image, self.rect)
+        Returns:
+            bool: True si l'objet est à l'écran et a été ajouté
+        """
+        world = self.world
+        if camera is None:
+            camera = world.player.renderPosition(alpha)
+
+        x, y = self.renderPosition(alpha)
+        relative_x, relative_y = x - camera[0], y - camera[1]
+        self.renderPos = (relative_x + world.centered_screenWidth,
+                          relative_y + world.centered_screenHeight)
+
+        if abs(relative_x) - self.rect.w < world.centered_screenWidth and\
+           abs(relative_y) - self.rect.h < world.centered_screenHeight:
+            self.rect.center = self.renderPos
+            frame.sprites.append((self.image, self.rect.topleft))
+            return True
+        return False
 
     def debug(self):
-        """Affiche les vecteurs relatifs à l'objet
+        """Vecteurs relatifs à l'objet, copiés pour la frame : dessinés par drawDebug()
+
+        Returns:
+            tuple: (position d'affichage, direction, vitesse), à l'échelle de l'écran
         """
-        drawVector(self.direction * 50, self.drawPos, "Direction")
-        drawVector(self.velocity * 15, self.drawPos, "Velocity", color=(200, 50, 70))
-        # drawVector(self.vectDistanceToPlayer, self.drawPos, "Dist", color=(0, 255, 0))
+        return self.renderPos, self.direction * 50, Vector2(self.forces) * 15
+
+
+def drawDebug(world, vectors):
+    """Dessine les vecteurs des objets copiés par Object.debug()
+
+    Args:
+        world (World): Monde où se trouve l'écran
+        vectors (list): Vecteurs de chaque objet, voir Object.debug()
+    """
+    for renderPos, direction, velocity in vectors:
+        drawVector(world, direction, renderPos, "Direction")
+        drawVector(world, velocity, renderPos, "Velocity", color=(200, 50, 70))
+
@@ -0,0 +1,87 @@
+"""Fichier contenant la physique des chocs : normale de contact estimée sur les masques, et rebond élastique
+
+Les objets qui se touchent échangent une impulsion le long de la normale de contact, selon leurs masses :
+la quantité de mouvement est conservée. Le coût par paire est borné : quatre overlap_area() pour la normale.
+Les balles ne rebondissent pas, elles sont testées sur tout leur trajet du tick, voir BulletPool.collide().
+"""
+
+from math import hypot
+
+
+RESTITUTION = 1.0  # 1 == choc parfaitement élastique, 0 == les deux objets repartent ensemble
+
+
+def contactNormal(mask, otherMask, offset, first, second):
+    """Estime la normale de contact à partir de la variation de la zone de chevauchement des masques
+
+    Décaler other d'un pixel dans le sens de la normale réduit le chevauchement : le gradient de la zone
+    commune pointe vers first. Si les masques ne donnent pas de direction (chevauchement symétrique),
+    la normale va d'un centre à l'autre, voir centerNormal().
+
+    Args:
+        mask (pygame.mask.Mask): Masque de first
+        otherMask (pygame.mask.Mask): Masque de second
+        offset (tuple): Position de otherMask dans mask
+        first (Object): Premier objet
+        second (Object): Second objet
+
+    Returns:
+        tuple: Normale (x, y) unitaire, de first vers second, None si les deux objets sont au même endroit
+    """
+    offsetX, offsetY = offset
+    normalX = mask.overlap_area(otherMask, (offsetX - 1, offsetY)) - mask.overlap_area(otherMask, (offsetX + 1, offsetY))
+    normalY = mask.overlap_area(otherMask, (offsetX, offsetY - 1)) - mask.overlap_area(otherMask, (offsetX, offsetY + 1))
+
+    if normalX == normalY == 0:
+        return centerNormal(first, second)
+
+    length = hypot(normalX, normalY)
+    return normalX / length, normalY / length
+
+
+def centerNormal(first, second):
+    """Normale de contact entre deux cercles : la direction d'un centre à l'autre, sans regarder les masques
+
+    Utilisée loin de la caméra, où les cercles de la grille spatiale suffisent (voir lib.camera).
+
+    Returns:
+        tuple: Normale (x, y) unitaire, de first vers second, None si les deux objets sont au même endroit
+    """
+    normalX, normalY = second.x - first.x, second.y - first.y
+    length = hypot(normalX, normalY)
+    if length == 0:
+        return None
+    return normalX / length, normalY / length
+
+
+def closingSpeed(first, second, normal):
+    """Vitesse à laquelle les deux objets se rapprochent le long de la normale
+
+    Returns:
+        float: Positive si les objets se rapprochent, négative ou nulle s'ils s'éloignent déjà
+    """
+    firstForces, secondForces = first.forces, second.forces
+    return ((firstForces[0] - secondForces[0]) * normal[0] +
+            (firstForces[1] - secondForces[1]) * normal[1])
+
+
+def bounce(first, second, normal):
+    """Fait rebondir deux objets qui se rapprochent, en conservant leur quantité de mouvement
+
+    Args:
+        first (Object): Premier objet
+        second (Object): Second objet
+        normal (tuple): Normale de contact unitaire, de first vers second
+    """
+    speed = closingSpeed(first, second, normal)
+    if speed <= 0:
+        return
+
+    impulse = (1 + RESTITUTION) * speed / (1 / first.mass + 1 / second.mass)
+    # Impulsion échangée le long de la normale, en kg.px/tick
+
+    firstForces, secondForces = first.forces, second.forces
+    firstForces[0] -= impulse / first.mass * normal[0]
+    firstForces[1] -= impulse / first.mass * normal[1]
+    secondForces[0] += impulse / second.mass * normal[0]
+    secondForces[1] += impulse / second.mass * normal[1]
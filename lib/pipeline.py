@@ -0,0 +1,144 @@
+"""Fichier contenant les frames à dessiner, copiées depuis la simulation, et le thread qui peut les dessiner
+
+Une frame (Frame) contient tout ce qu'il faut pour dessiner l'écran : images et positions interpolées des objets
+à l'écran, balles, barres de vie, jauges du joueur, textes. Elle est remplie par game.snapshotGame() à partir de la
+simulation, puis n'est plus jamais modifiée : game.renderFrame() la dessine sans lire aucun objet du jeu.
+Sans thread, les deux se suivent. Avec RenderThread, la simulation continue au tick suivant pendant que le thread
+dessine la frame précédente : pygame relâche le GIL pendant les blits, les remplissages et l'envoi à l'écran.
+"""
+
+import threading
+
+from collections import deque
+from time import perf_counter
+
+
+class Frame:
+    """Tout ce qu'il faut pour dessiner une frame, copié depuis la simulation
+
+    Les listes sont remplies pendant game.snapshotGame(), puis la frame n'est plus modifiée.
+
+    Attributes:
+        bars (list): Barres de vie ((x, y), PV max, PV) des vaisseaux à l'écran
+        bullets (list): (image tournée, position du coin haut gauche) des balles à l'écran
+        camera (tuple): Position interpolée de la caméra
+        debug (tuple): (vecteurs de chaque objet, texte des masques) si F1 est appuyée, None sinon
+        gameOver (tuple): (score, highscore) si la partie est finie, None sinon
+        gauges (tuple): Jauges du joueur, voir Player.healthbar(), None s'il n'est pas à l'écran
+        overlay (tuple): Graphe et moyennes du profileur, voir Profiler.overlay(), None s'il est caché
+        shields (list): (centre, opacité) des boucliers, dessinés sous les sprites
+        sprites (list): (image, position du coin haut gauche) des objets à l'écran, dans l'ordre d'affichage
+    """
+
+    __slots__ = ("bars", "bullets", "camera", "debug", "gameOver", "gauges", "overlay", "shields", "sprites")
+
+    def __init__(self, camera):
+        """Constructeur d'une frame vide
+
+        Args:
+            camera (tuple): Position interpolée de la caméra
+        """
+        self.camera = camera
+
+        self.sprites = []
+        self.bullets = []
+        self.shields = []
+        self.bars = []
+        self.gauges = None
+        self.debug = None
+        self.gameOver = None
+        self.overlay = None
+
+
+class RenderThread:
+    """Dessine les frames dans un thread à part, pendant que la simulation continue
+
+    Double tampon : la frame en cours de dessin, et la dernière frame prête. Si la simulation en prépare une autre
+    avant que le thread ait pris la précédente, la plus récente la remplace : la simulation n'attend jamais
+    l'affichage. Les évènements restent lus par le thread principal, seul le dessin et l'envoi à l'écran sont ici.
+    Seul le thread touche au moteur d'affichage et à l'échelle de rendu automatique : les frames sont à l'échelle de
+    l'écran, et restent justes quand l'échelle de rendu change.
+
+    Attributes:
+        condition (threading.Condition): Protège pending et running, réveille le thread
+        dropped (int): Frames remplacées par une plus récente, jamais dessinées
+        error (BaseException): Exception levée dans le thread, relancée dans le thread principal
+        pending (Frame): Dernière frame prête, None si le thread l'a déjà prise
+        render (callable): Fonction qui dessine une frame : render(world, frame)
+        renderTimes (deque): Temps de dessin des dernières frames, en secondes
+        running (bool): False quand le thread doit s'arrêter
+        thread (threading.Thread): Thread de dessin
+        world (World): Monde affiché
+    """
+
+    def __init__(self, world, render, historySize=240):
+        """Constructeur du thread de dessin, qui démarre tout de suite
+
+        Args:
+            world (World): Monde affiché
+            render (callable): Fonction qui dessine une frame : render(world, frame)
+            historySize (int, optional): Nombre de temps de dessin gardés
+        """
+        self.world = world
+        self.render = render
+
+        self.condition = threading.Condition()
+        self.pending = None
+        self.running = True
+        self.error = None
+
+        self.dropped = 0
+        self.renderTimes = deque(maxlen=historySize)
+
+        self.thread = threading.Thread(target=self._loop, name="render", daemon=True)
+        self.thread.start()
+
+    def submit(self, frame):
+        """Donne la dernière frame au thread, en remplaçant celle qu'il n'a pas encore prise
+
+        Args:
+            frame (Frame): Frame à dessiner
+        """
+        if self.error is not None:
+            raise self.error
+
+        with self.condition:
+            if self.pending is not None:
+                self.dropped += 1
+            self.pending = frame
+            self.condition.notify()
+
+    def _loop(self):
+        """Boucle du thread : attend une frame, la dessine, recommence
+        """
+        world = self.world
+        try:
+            while True:
+                with self.condition:
+                    while self.pending is None and self.running:
+                        self.condition.wait()
+                    if self.pending is None:
+                        return
+                    frame, self.pending = self.pending, None
+
+                start = perf_counter()
+                self.render(world, frame)
+                renderTime = perf_counter() - start
+                self.renderTimes.append(renderTime)
+
+                if world.autoScale is not None:
+                    world.autoScale.update(renderTime)
+
+        except BaseException as error:
+            self.error = error
+
+    def close(self):
+        """Dessine la dernière frame prête, arrête le thread et relance son exception s'il en a levé une
+        """
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        self.thread.join()
+
+        if self.error is not None:
+            raise self.error
@@ -1,6 +1,14 @@
 """Fichier contenant les méthodes relatives au joueur
 """
 
+import pygame
+import pygame.gfxdraw
+
+from math import cos, sin
+
+from lib.collision import PLAYER, TEAM_PLAYER
+from lib.ship import Ship
+
 
 class Player(Ship):
 
@@ -8,12 +16,17 @@ class Player(Ship):
     
     Attributes:
         ammoClock (int): Horlorge qui règle la cadence de tire sans utiliser de "multithreading"
-        firingImage (TYPE): Description
-        firingMouvementImages (list): Liste des images du vaisseau avec le propulseur ET les éclats des canons
+        firingImage (Surface): Image du vaisseau avec les éclats des canons, partagée par world.images
+        firingMouvementFrame (int): Indice de la prochaine image de firingMouvementImages
+        firingMouvementImages (list): Liste des images du vaisseau avec le propulseur ET les éclats des canons,
+            partagée par world.images
         image (image): Image actuelle du vaisseau joueur
-        mouvementImages (list): Liste des images du vaisseau avec le propulseur activé
+        mouvementFrame (int): Indice de la prochaine image de mouvementImages
+        mouvementImages (list): Liste des images du vaisseau avec le propulseur activé, partagée par world.images
         originalImage (image): Sert d'image "anchor" à tourner pour générer l'image actuelle, susceptible de changer
         spriteFiringCounter (int): Clock qui va définir le temps d'affichage des éclats des canons lors du tir
+        stats (dict): Réglages de la classe : essence, munitions et bouclier au départ (et au maximum), changés par
+            le simulateur par lots pour l'équilibrage (voir lib.sweep)
     
     Deleted Attributes:
         angle (float): Angle du joueur en rad counter-clockwise
@@ -23,10 +36,19 @@ class Player(Ship):
         spriteChangeCounter (int): Clock qui va delayer l'affichage des futurs sprites de propulsion
     """
 
-    def __init__(self, life, pos, groupe, mass, puissanceCanon):
+    __slots__ = ("ammo", "ammoReloadTimer", "firingImage", "firingMouvementFrame", "fuel", "fuelTimer", "max_ammo",
+                 "max_fuel", "max_shieldHP", "mouvementFrame", "shieldAlphaCounter", "shieldCounter", "shieldHP")
+
+    category = PLAYER
+    team = TEAM_PLAYER
+
+    stats = {"fuel": 600, "ammo": 40, "shieldHP": 150}
+
+    def __init__(self, world, life, pos, groupe, mass, puissanceCanon):
         """Constructeur du joueur
         
         Args:
+            world (World): Monde auquel appartient le joueur
             life (int): PV du joueur
             pos (tuple): Position de départ
             groupe (list): Groupe Pygame où mettre le vaisseau
@@ -34,26 +56,26 @@ class Player(Ship):
             puissanceCanon (int): Puissance des canons du joueur
         """
 
-        self.image = VaisseauJoueur
+        self.image = world.images.VaisseauJoueur
 
-        super().__init__(life, pos, groupe, self.image, mass, puissanceCanon, 30, 20)
+        super().__init__(world, life, pos, groupe, self.image, mass, puissanceCanon, 30, 20)
 
-        self.mouvementImages = cycle([pygame.transform.scale(pygame.image.load(i).convert_alpha(), (64, 64))
-                                      for i in glob.glob("assets/playerSprites/vaisseau*.png")])
-        self.firingMouvementImages = cycle([pygame.transform.scale(pygame.image.load(i).convert_alpha(), (64, 64))
-                                            for i in glob.glob("assets/playerSprites/firingvaisseau*.png")])
-        self.firingImage = pygame.transform.scale(
-            pygame.image.load("assets/playerSprites/firing.png").convert_alpha(), (64, 64))
+        self.mouvementImages = world.images.mouvementImages
+        self.firingMouvementImages = world.images.firingMouvementImages
+        self.mouvementFrame = 0
+        self.firingMouvementFrame = 0
+        # Un indice par animation, et pas d'itérateur : chacune reprend où elle en était
+        self.firingImage = world.images.firingImage
 
-        self.fuel = 600  # 5 secondes continues
+        self.fuel = self.stats["fuel"]  # 5 secondes continues
         self.max_fuel = self.fuel
         self.fuelTimer = 0
 
-        self.ammo = 40
+        self.ammo = self.stats["ammo"]
         self.ammoReloadTimer = 300
         self.max_ammo = self.ammo
 
-        self.shieldHP = 150
+        self.shieldHP = self.stats["shieldHP"]
         self.max_shieldHP = self.shieldHP
         self.shieldCounter = 0
 
@@ -76,12 +98,14 @@ class Player(Ship):
         """
         if self.spriteFiringCounter != 0 and utiliseLePropulseur:  # si le vaisseau tire et bouge
             if self.spriteChangeCounter == 0:  # Si il temps de changer le sprite
-                self.originalImage = next(self.firingMouvementImages)
+                self.originalImage = self.firingMouvementImages[self.firingMouvementFrame]
+                self.firingMouvementFrame = (self.firingMouvementFrame + 1) % len(self.firingMouvementImages)
         elif self.spriteFiringCounter != 0 and not utiliseLePropulseur:  # si le vaisseau tire juste
             self.originalImage = self.firingImage
         elif not self.spriteFiringCounter != 0 and utiliseLePropulseur:  # si le vaisseau bouge
             if self.spriteChangeCounter == 0:
-                self.originalImage = next(self.mouvementImages)
+                self.originalImage = self.mouvementImages[self.mouvementFrame]
+                self.mouvementFrame = (self.mouvementFrame + 1) % len(self.mouvementImages)
         else:
             self.originalImage = self.originalOriginalImage
 
@@ -93,12 +117,12 @@ class Player(Ship):
 
             self.ammoReloadTimer = 300
 
-            bullets.add(Bullet(1, (self.pos[0] + cos(self.angle) * 20 + 20 * sin(self.angle),
-                                   self.pos[1] + sin(self.angle) * 20 - 20 * cos(self.angle)),
-                               bullets, bulletImage, self.forceTir, self.angle, 0.05, "player"))
-            bullets.add(Bullet(1, (self.pos[0] + cos(self.angle) * 20 - 20 * sin(self.angle),
-                                   self.pos[1] + sin(self.angle) * 20 + 20 * cos(self.angle)),
-                               bullets, bulletImage, self.forceTir, self.angle, 0.05, "player"))
+            bullets = self.world.bullets
+
+            bullets.spawn((self.x + cos(self.angle) * 20 + 20 * sin(self.angle),
+                           self.y + sin(self.angle) * 20 - 20 * cos(self.angle)), self.forceTir, self.angle, self.team)
+            bullets.spawn((self.x + cos(self.angle) * 20 - 20 * sin(self.angle),
+                           self.y + sin(self.angle) * 20 + 20 * cos(self.angle)), self.forceTir, self.angle, self.team)
             self.ammoClock = 30
             self.ammo -= 2
 
@@ -107,6 +131,8 @@ class Player(Ship):
     def kbControl(self):
         """Touches de contrôle du vaisseau
         """
+        key = self.world.key
+
         if key[pygame.K_UP] and self.fuel > 0:
 
             self.propulseur += 0.001 if self.propulseur < 0.2 else 0
@@ -156,25 +182,91 @@ class Player(Ship):
         if self.shieldHP > self.max_shieldHP:
             self.shieldHP = self.max_shieldHP
 
-        pygame.gfxdraw.filled_circle(screen, int(self.drawPos[0]), int(self.drawPos[1]), 36,
-                                     (0, 255, 255, self.shieldAlphaCounter))
-
         self.shieldAlphaCounter -= 5 if self.shieldAlphaCounter > 0 else 0
 
+    def snapshot(self, frame, alpha=1.0, camera=None):
+        """Ajoute le bouclier à la frame, dessiné sous les sprites, puis le joueur
+
+        Args:
+            frame (Frame): Frame à remplir, voir lib.pipeline
+            alpha (float, optional): Avancement entre le tick précédent et le tick actuel
+            camera (tuple, optional): Position interpolée de la caméra
+
+        Returns:
+            bool: True si le joueur est à l'écran
+        """
+        if not self.dying and self.shieldAlphaCounter > 0:
+            world = self.world
+            x, y = self.renderPosition(alpha)
+            cameraX, cameraY = camera if camera is not None else (x, y)
+            frame.shields.append(((int(x - cameraX + world.centered_screenWidth),
+                                   int(y - cameraY + world.centered_screenHeight)), self.shieldAlphaCounter))
+
+        return super().snapshot(frame, alpha, camera)
+
+    def healthbar(self, frame):
+        """Ajoute la barre de vie à la frame, et les jauges d'essence, de munitions et de bouclier
+
+        Args:
+            frame (Frame): Frame à remplir, voir lib.pipeline
+
+        Returns:
+            tuple: Position de la barre de vie
+        """
+        drawRectPos = super().healthbar(frame)
+        frame.gauges = (drawRectPos, self.maxHP, self.fuel / self.max_fuel, self.ammo,
+                        self.shieldHP / self.max_shieldHP)
+        return drawRectPos
+
     def update(self):
         """Actualise le joueur !
         """
-        global restart, score
 
         super().update()
 
         if not self.dying:
             self.manageCounters()
-            self.updateSpriteMouvement(key[pygame.K_UP] and self.fuel > 0)
+            self.updateSpriteMouvement(self.world.key[pygame.K_UP] and self.fuel > 0)
             self.kbControl()
             self.manageFuel()
             self.manageAmmo()
             self.manageShield()
 
         else:
-            restart = True
+            self.world.restart = True
+
+
+def drawShield(world, shield):
+    """Dessine le bouclier copié par Player.snapshot()
+
+    Args:
+        world (World): Monde où se trouve l'écran
+        shield (tuple): (centre, opacité)
+    """
+    (x, y), alpha = shield
+    factor = world.renderFactor
+    x, y, radius = x // factor, y // factor, 36 // factor
+    # Centre à l'échelle de l'écran, ramené à la résolution de rendu
+    pygame.gfxdraw.filled_circle(world.screen, x, y, radius, (0, 255, 255, alpha))
+    world.renderer.mark(pygame.Rect(x - radius, y - radius, 2 * radius + 1, 2 * radius + 1))
+    # gfxdraw ne retourne pas la zone dessinée
+
+
+def hudGauges(world, gauges):
+    """Images et positions des jauges d'essence, de munitions et de bouclier copiées par Player.healthbar(), à mettre
+    sur la barre de vie dans la passe du HUD
+
+    Args:
+        world (World): Monde où se trouve le HUD
+        gauges (tuple): (position de la barre de vie, PV max, part d'essence, munitions, part de bouclier)
+
+    Returns:
+        list: (image, position) dans l'ordre d'affichage, voir Hud.draw()
+    """
+    hud = world.hud
+    (x, y), maxHP, fuel, ammo, shield = gauges
+
+    return [(hud.bar(world, (x, y), ((255, 0, 255), (0, 0, fuel * (maxHP / 10), 2))), (x, y)),
+            (hud.text(f"{ammo}", 10, (255, 255, 255)), (x - 10, y)),
+            (hud.bar(world, (x, y + 2), ((0, 70, 255), (0, 0, shield * (maxHP / 10), 3))), (x, y + 2))]
+    # Le bouclier par-dessus le nombre de munitions, comme avant
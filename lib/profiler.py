@@ -0,0 +1,228 @@
+"""Fichier contenant le profileur : temps de chaque phase d'une frame, graphe à l'écran et export des mesures
+
+Le profileur n'existe que s'il est demandé (--profile) : sinon world.profiler vaut None, et chaque phase
+ne coûte qu'un test. Il compte aussi les objets de chaque niveau de détail de la caméra (voir lib.camera).
+"""
+
+import csv
+import json
+
+from collections import deque
+from time import perf_counter_ns
+
+import pygame
+
+from lib.camera import TIER_NAMES
+
+PHASES = ("stars", "spawning", "physics", "rotation", "collision", "hud", "draw", "flip")
+# Ordre des colonnes du fichier exporté et des couches du graphe
+
+COLORS = {"stars": (120, 120, 160), "spawning": (230, 200, 60), "physics": (60, 140, 230), "rotation": (40, 210, 210),
+          "collision": (230, 80, 60), "hud": (200, 200, 200), "draw": (80, 200, 80), "flip": (190, 80, 200)}
+
+GRAPH_HEIGHT = 100  # Hauteur du graphe en pixels, deux fois le budget d'une frame à 60 ticks/s
+NS_PER_PIXEL = 2 * 1_000_000_000 // 60 // GRAPH_HEIGHT
+
+
+class Profiler:
+    """Mesure le temps passé dans chaque phase de chaque frame, avec perf_counter_ns
+
+    Le jeu appelle begin() au début d'une suite de phases, puis lap(phase) à la fin de chacune : le temps depuis
+    l'appel précédent est compté pour cette phase. Les phases imbriquées (la rotation, mesurée objet par objet dans
+    Object.update()) sont ajoutées avec add() et retirées de la phase qui les contient.
+
+    Attributes:
+        current (dict): Nanosecondes passées dans chaque phase pendant la frame en cours
+        file (file): Fichier où chaque frame est écrite, None sans export
+        frames (int): Nombre de frames mesurées
+        graph (Surface): Graphe des dernières frames, décalé d'un pixel à chaque frame, None sans affichage
+        history (deque): Temps des phases (tuple dans l'ordre de PHASES) des dernières frames
+        last (int): Instant du dernier begin() ou lap(), en nanosecondes
+        lodTotals (list): Nombre d'objets dans chaque niveau de détail, additionné sur toutes les frames
+        nested (int): Nanosecondes ajoutées par add() depuis le dernier lap()
+        pressed (bool): True si la touche du graphe était appuyée à la frame précédente
+        totals (dict): Nanosecondes passées dans chaque phase depuis le lancement
+        visible (bool): Si True, le graphe est affiché
+        world (World): Monde mesuré
+        writer (csv.writer): Écrit les lignes du fichier CSV, None si l'export est en JSONL ou désactivé
+    """
+
+    def __init__(self, world, path=None, historySize=240):
+        """Constructeur du profileur
+
+        Args:
+            world (World): Monde mesuré
+            path (str, optional): Fichier .csv ou .jsonl où écrire les temps de chaque frame, None sans export
+            historySize (int, optional): Nombre de frames gardées pour le graphe et les moyennes
+        """
+        self.world = world
+        self.current = dict.fromkeys(PHASES, 0)
+        self.totals = dict.fromkeys(PHASES, 0)
+        self.lodTotals = [0] * len(TIER_NAMES)
+        self.history = deque(maxlen=historySize)
+        self.frames = 0
+
+        self.last = perf_counter_ns()
+        self.nested = 0
+
+        self.visible = False
+        self.pressed = False
+        self.graph = None
+
+        self.file = self.writer = None
+        if path is not None:
+            self.file = open(path, "w", newline="")
+            if not path.endswith(".jsonl"):
+                self.writer = csv.writer(self.file)
+                self.writer.writerow(("frame", "tick", *PHASES, *(f"lod_{name}" for name in TIER_NAMES)))
+                # Une ligne par frame, en nanosecondes, puis le nombre d'objets de chaque niveau de détail
+
+    def begin(self):
+        """Repart de maintenant : le temps écoulé depuis le dernier lap() n'est compté dans aucune phase
+        """
+        self.last = perf_counter_ns()
+        self.nested = 0
+
+    def lap(self, phase):
+        """Compte le temps écoulé depuis le dernier begin() ou lap() pour phase, sans les phases imbriquées
+
+        Args:
+            phase (str): Nom de la phase qui vient de finir, voir PHASES
+        """
+        now = perf_counter_ns()
+        self.current[phase] += now - self.last - self.nested
+        self.last = now
+        self.nested = 0
+
+    def add(self, phase, duration):
+        """Ajoute le temps d'une phase imbriquée dans une autre
+
+        Args:
+            phase (str): Nom de la phase imbriquée, voir PHASES
+            duration (int): Temps passé, en nanosecondes
+        """
+        self.current[phase] += duration
+        self.nested += duration
+
+    def endFrame(self):
+        """Range les temps de la frame finie dans l'historique et le fichier, puis remet les compteurs à zéro
+        """
+        current = self.current
+        row = tuple(current[phase] for phase in PHASES)
+        self.history.append(row)
+        self.frames += 1
+
+        for phase in PHASES:
+            self.totals[phase] += current[phase]
+            current[phase] = 0
+
+        counts = self.world.camera.counts  # Ceux du dernier tick de la frame
+        for tier, count in enumerate(counts):
+            self.lodTotals[tier] += count
+
+        if self.writer is not None:
+            self.writer.writerow((self.frames, self.world.tick, *row, *counts))
+        elif self.file is not None:
+            self.file.write(json.dumps({"frame": self.frames, "tick": self.world.tick, **dict(zip(PHASES, row)),
+                                        **{f"lod_{name}": count for name, count in zip(TIER_NAMES, counts)}}))
+            self.file.write("\n")
+
+        if self.graph is not None:
+            self._scrollGraph(row)
+
+    def toggle(self, pressed):
+        """Affiche ou cache le graphe quand la touche vient d'être appuyée
+
+        Args:
+            pressed (bool): True si la touche du graphe est appuyée à cette frame
+        """
+        if pressed and not self.pressed:
+            self.visible = not self.visible
+            if self.visible:
+                self.graph = pygame.Surface((self.history.maxlen, GRAPH_HEIGHT)).convert()
+                self.graph.fill((0, 0, 0))
+                for row in self.history:
+                    self._scrollGraph(row)
+            else:
+                self.graph = None
+        self.pressed = pressed
+
+    def _scrollGraph(self, row):
+        """Décale le graphe d'un pixel vers la gauche et dessine la dernière frame à droite, phases empilées
+
+        Args:
+            row (tuple): Temps des phases de la frame, dans l'ordre de PHASES
+        """
+        graph = self.graph
+        x = graph.get_width() - 1
+        graph.scroll(-1, 0)
+        graph.fill((0, 0, 0), (x, 0, 1, GRAPH_HEIGHT))
+
+        bottom = GRAPH_HEIGHT
+        for phase, duration in zip(PHASES, row):
+            height = duration // NS_PER_PIXEL
+            if height:
+                graph.fill(COLORS[phase], (x, bottom - height, 1, height))
+                bottom -= height
+                if bottom <= 0:
+                    break
+
+        graph.set_at((x, GRAPH_HEIGHT // 2), (255, 255, 255))
+        # Ligne du budget d'une frame, 1 / 60 s
+
+    def overlay(self):
+        """Copie de quoi dessiner le graphe pour la frame : le profileur continue de mesurer pendant le dessin
+
+        Returns:
+            tuple: (copie du graphe, temps moyen de chaque phase en ms, nombre d'objets de chaque niveau de détail),
+                None si le graphe est caché
+        """
+        if not self.visible or not self.history:
+            return None
+
+        averages = [sum(column) / len(self.history) / 1_000_000 for column in zip(*self.history)]
+        return self.graph.copy(), averages, tuple(self.world.camera.counts)
+
+    def draw(self, overlay):
+        """Dessine le graphe des dernières frames et le temps moyen de chaque phase, en bas à gauche
+
+        Args:
+            overlay (tuple): Copie faite par overlay()
+        """
+        graph, averages, counts = overlay
+
+        world = self.world
+        screen, myFont, mark = world.display, world.myFont, world.renderer.mark
+        left, top = 10, world.screenHeight - GRAPH_HEIGHT - 10
+        # Sur l'écran, après l'agrandissement de la surface de rendu : toujours en pleine résolution
+
+        mark(screen.blit(graph, (left, top)))
+
+        legendX = left + graph.get_width() + 10
+        for index, (phase, average) in enumerate(zip(PHASES, averages)):
+            mark(myFont.render_to(screen, (legendX, top + index * 12), f"{phase} {average:.2f} ms",
+                                  fgcolor=COLORS[phase], size=11))
+        mark(myFont.render_to(screen, (legendX, top + len(PHASES) * 12), f"total {sum(averages):.2f} ms",
+                              fgcolor=(255, 255, 255), size=11))
+
+        lod = ", ".join(f"{name} {count}" for name, count in zip(TIER_NAMES, counts))
+        mark(myFont.render_to(screen, (left, top - 14), f"objets : {lod}",
+                              fgcolor=(255, 255, 255), size=11))
+
+    def summary(self):
+        """Temps moyen de chaque phase depuis le lancement
+
+        Returns:
+            str: Millisecondes par frame de chaque phase, puis nombre moyen d'objets de chaque niveau de détail
+        """
+        frames = max(self.frames, 1)
+        phases = ", ".join(f"{phase} {self.totals[phase] / frames / 1_000_000:.3f} ms" for phase in PHASES)
+        lod = ", ".join(f"{name} {total / frames:.1f}" for name, total in zip(TIER_NAMES, self.lodTotals))
+        return f"{phases} | objets : {lod}"
+
+    def close(self):
+        """Ferme le fichier d'export
+        """
+        if self.file is not None:
+            self.file.close()
+            self.file = self.writer = None
@@ -0,0 +1,2 @@
+"""Paquet contenant les vaisseaux de l'équipe rouge
+"""
@@ -1,17 +1,26 @@
 """Fichier relatif au 'blaster'
 """
 
+from lib.red.redTeam import redTeam
+
 
 class redBlaster(redTeam):
 	"""Classe relative au 'blaster' rouge
 	"""
 
-	def __init__(self, pos):
+	__slots__ = ()
+
+	stats = {"HP": 150, "mass": 600, "puissanceCanon": 30, "ammoTimer": 40}
+
+	def __init__(self, world, pos):
 		"""Redéfinition des certaines fonctions
 		
 		Args:
+		    world (World): Monde auquel appartient le vaisseau
 		    pos (tuple): Position d'apparition (x, y) du vaisseau
 		"""
-		super().__init__(150, pos, ships, blasterRedSprite, 600, 30, 40)
+		stats = self.stats
+		super().__init__(world, stats["HP"], pos, world.ships, world.images.blasterRedSprite, stats["mass"],
+		                 stats["puissanceCanon"], stats["ammoTimer"])
 
 		# self.ownership = "redblaster"
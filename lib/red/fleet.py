@@ -0,0 +1,233 @@
+"""Fichier contenant la flotte rouge : mouvement et IA de tout les vaisseaux rouges, calculés à la fois
+
+Comme les balles (voir lib.bullet), ce qui change à chaque tick (position, forces, angle, moment angulaire,
+propulseur...) est gardé dans les tableaux NumPy d'une seule Fleet, une colonne par attribut, et n'est pas
+rassemblé à chaque tick. Une passe par tick, après les autres objets, fait ce que Object.update(), Ship.update()
+et l'IA faisaient vaisseau par vaisseau, avec les mêmes opérations dans le même ordre : une partie se rejoue à
+l'identique. Les valeurs calculées sont rendues aux vaisseaux, que le reste du jeu (collisions, balles, affichage)
+continue de lire.
+"""
+
+from itertools import compress
+from math import atan2, cos, sin
+from time import perf_counter_ns
+
+import numpy as np
+
+from lib.camera import FAR as FAR_TIER, FULL
+
+
+FIRING_DOT = 0.90  # Produit scalaire minimum entre la direction et le joueur pour tirer
+TURN_RATE = 0.01  # Part de l'angle vers le joueur ajoutée au moment angulaire à chaque tick
+TURN_DAMPING = 0.7  # Freinage de la rotation quand le joueur est devant
+THRUST_STEP = 0.0005  # Variation du propulseur à chaque tick
+THRUST_MAX = 0.12  # Valeur absolue maximum du propulseur
+FAR, NEAR = 500, 300  # Au-delà, le vaisseau accélère vers le joueur, en deçà il recule, entre les deux il freine
+RANGE_SQUARED = 3686400  # 1920 ** 2, comme Object.willExpire()
+
+COLUMNS = ("x", "y", "vx", "vy", "angle", "momentum", "thrust", "firingDistance", "puissanceCanon", "radius",
+           "distance", "dotFront")
+
+
+class Fleet:
+    """Tout les vaisseaux rouges du monde, en structure de tableaux
+
+    Un vaisseau entre dans les tableaux à la passe qui suit sa création (son constructeur peut encore changer ses
+    réglages, comme la distance de tir du sniper), et en sort à la passe qui suit sa mort.
+
+    Attributes:
+        angle (np.ndarray): Angle de chaque vaisseau, en rad
+        distance (np.ndarray): Distance au joueur, de la dernière décision de l'IA
+        dotFront (np.ndarray): Produit scalaire entre la direction et le joueur, de la dernière décision de l'IA
+        firingDistance (np.ndarray): Distance de tir maximum
+        joining (list): Vaisseaux créés depuis la dernière passe, dans l'ordre de création
+        leaving (set): Vaisseaux morts depuis la dernière passe
+        momentum (np.ndarray): Moment angulaire
+        puissanceCanon (np.ndarray): Vitesse donnée aux balles tirées
+        radius (np.ndarray): Rayon du cercle de chaque vaisseau, changé par son image tournée
+        ships (list): Vaisseaux des tableaux, dans l'ordre de world.ships : le vaisseau i est à la case i
+        thrust (np.ndarray): Propulseur
+        vx (np.ndarray): Force X de chaque vaisseau
+        vy (np.ndarray): Force Y de chaque vaisseau
+        world (World): Monde auquel appartient la flotte
+        x (np.ndarray): Coordonnée X de chaque vaisseau
+        y (np.ndarray): Coordonnée Y de chaque vaisseau
+    """
+
+    def __init__(self, world):
+        """Constructeur de la flotte, vide
+
+        Args:
+            world (World): Monde auquel appartient la flotte
+        """
+        self.world = world
+        self.ships = []
+        self.joining = []
+        self.leaving = set()
+        for name in COLUMNS:
+            setattr(self, name, np.zeros(0))
+
+    def __len__(self):
+        """Nombre de vaisseaux dans les tableaux
+        """
+        return len(self.ships)
+
+    def join(self, ship):
+        """Ajoute un vaisseau à la flotte, à la prochaine passe
+
+        Args:
+            ship (redTeam): Vaisseau créé
+        """
+        ship.slot = None
+        self.joining.append(ship)
+
+    def leave(self, ship):
+        """Retire un vaisseau mort de la flotte, à la prochaine passe : les cases ne bougent pas pendant une passe
+
+        Args:
+            ship (redTeam): Vaisseau mort
+        """
+        slot = ship.slot
+        if slot is None:
+            if ship in self.joining:
+                self.joining.remove(ship)
+        elif slot < len(self.ships) and self.ships[slot] is ship:
+            # Un vaisseau d'une partie finie n'est plus dans les tableaux
+            self.leaving.add(ship)
+
+    def pull(self, ship):
+        """Reprend les forces d'un vaisseau changées hors de la passe, par un rebond (voir game.manageCollisions())
+
+        Args:
+            ship (redTeam): Vaisseau dont les forces ont changé
+        """
+        slot = ship.slot
+        if slot is not None:
+            self.vx[slot], self.vy[slot] = ship.forces
+
+    def _refresh(self):
+        """Retire les vaisseaux morts et ajoute les nouveaux, en gardant l'ordre de world.ships
+        """
+        if self.leaving:
+            keep = [ship not in self.leaving for ship in self.ships]
+            mask = np.array(keep, dtype=bool)
+            for name in COLUMNS:
+                setattr(self, name, getattr(self, name)[mask])
+            self.ships = list(compress(self.ships, keep))
+            for slot, ship in enumerate(self.ships):
+                ship.slot = slot
+            self.leaving.clear()
+
+        if self.joining:
+            rows = np.array([(ship.x, ship.y, ship.forces[0], ship.forces[1], ship.angle, ship.angleMomentum,
+                              ship.propulseur, ship.firingDistance, ship.puissanceCanon, ship.radius, 0.0, 0.0)
+                             for ship in self.joining], dtype=np.float64)
+            for name, column in zip(COLUMNS, rows.T):
+                setattr(self, name, np.concatenate((getattr(self, name), column)))
+            for slot, ship in enumerate(self.joining, len(self.ships)):
+                ship.slot = slot
+            self.ships += self.joining
+            self.joining = []
+
+    def update(self):
+        """Actualise tout les vaisseaux rouges : mouvement, rotation, explosion, propulseur, puis IA (tir si le
+        joueur est devant, rotation vers lui, propulseur). Appelée une fois par tick, après les autres objets
+        """
+        self._refresh()
+        ships = self.ships
+        if not ships:
+            return
+        world = self.world
+        player, profiler = world.player, world.profiler
+        count = len(ships)
+
+        previousX, previousY = self.x, self.y
+        x = self.x = previousX + self.vx
+        y = self.y = previousY + self.vy
+        toPlayerX, toPlayerY = player.x - x, player.y - y
+        full = world.camera.tiers(x, y, self.radius)
+
+        angle = self.angle = self.angle + self.momentum
+        angles = angle.tolist()
+        cosines = np.fromiter(map(cos, angles), np.float64, count)
+        sines = np.fromiter(map(sin, angles), np.float64, count)
+        # math.cos et pas np.cos : la version SIMD de NumPy peut différer d'un ulp, et la partie ne se rejouerait plus
+
+        squared = toPlayerX * toPlayerX + toPlayerY * toPlayerY
+        expired = squared > RANGE_SQUARED
+        exploding = np.array([ship.dying or ship.HP <= 0 for ship in ships], dtype=bool) | expired
+        # Les PV ne changent qu'aux collisions : ceux lus ici sont ceux que Object.update() lisait
+
+        vx, vy, thrust = self.vx, self.vy, self.thrust
+        if exploding.any():
+            vx = np.where(exploding, vx * 0.96, vx)
+            vy = np.where(exploding, vy * 0.96, vy)
+            # Le freinage de Object.explode(), avant la poussée comme avant
+        vx = self.vx = vx + cosines * thrust
+        vy = self.vy = vy + sines * thrust
+        shotX = self.puissanceCanon * cosines + vx
+        shotY = self.puissanceCanon * sines + vy
+
+        distance = np.sqrt(squared)
+        thinking = ~exploding & (distance > 0)
+        # Un vaisseau qui explose ne décide plus rien, un vaisseau pile sur le joueur n'a pas de direction vers lui
+        safeDistance = np.where(thinking, distance, 1.0)
+        dotFront = cosines * (toPlayerX / safeDistance) + sines * (toPlayerY / safeDistance)
+
+        cross = cosines * toPlayerY - sines * toPlayerX
+        dot = cosines * toPlayerX + sines * toPlayerY
+        turn = np.fromiter(map(atan2, cross.tolist(), dot.tolist()), np.float64, count)
+        momentum = self.momentum + turn * TURN_RATE
+        momentum = np.where(dotFront >= 0, momentum * TURN_DAMPING, momentum)
+
+        thrust = np.where(distance > FAR, thrust + THRUST_STEP,
+                          np.where(distance < NEAR, thrust - THRUST_STEP, thrust * 0.8))
+        thrust = np.where(np.abs(thrust) > THRUST_MAX, np.copysign(THRUST_MAX, thrust), thrust)
+
+        firing = thinking & (dotFront > FIRING_DOT) & (distance < self.firingDistance)
+        momentum = self.momentum = np.where(thinking, momentum, self.momentum)
+        thrust = self.thrust = np.where(thinking, thrust, self.thrust)
+        distance = self.distance = np.where(thinking, distance, self.distance)
+        dotFront = self.dotFront = np.where(thinking, dotFront, self.dotFront)
+        # Le propulseur et le moment angulaire décidés ici ne servent qu'au tick suivant, comme avant
+
+        radius = self.radius
+        for (slot, ship, shipPreviousX, shipPreviousY, shipX, shipY, shipToPlayerX, shipToPlayerY, shipAngle,
+             shipCos, shipSin, shipFull, shipExpired, shipExploding, shipVx, shipVy, shipShotX, shipShotY,
+             shipMomentum, shipThrust, shipDistance, shipDot, shipFiring) in zip(
+                range(count), ships, previousX.tolist(), previousY.tolist(), x.tolist(), y.tolist(),
+                toPlayerX.tolist(), toPlayerY.tolist(), angles, cosines.tolist(), sines.tolist(), full.tolist(),
+                expired.tolist(), exploding.tolist(), vx.tolist(), vy.tolist(), shotX.tolist(), shotY.tolist(),
+                momentum.tolist(), thrust.tolist(), distance.tolist(), dotFront.tolist(), firing.tolist()):
+            # Des float Python : les tableaux ne restent pas dans les vaisseaux
+            ship.previousX, ship.previousY, ship.x, ship.y = shipPreviousX, shipPreviousY, shipX, shipY
+            ship.vectDistanceToPlayer.update(shipToPlayerX, shipToPlayerY)
+            ship.angle = shipAngle
+            ship.direction.update(shipCos, shipSin)
+
+            if shipFull:
+                ship.lod = FULL
+                if profiler is None:
+                    ship.orient()
+                else:
+                    start = perf_counter_ns()
+                    ship.orient()
+                    profiler.add("rotation", perf_counter_ns() - start)
+                radius[slot] = ship.radius
+            else:
+                ship.lod = FAR_TIER
+
+            if shipExpired:
+                ship.die()
+            if shipExploding:
+                ship.explode()  # Son freinage est déjà dans vx et vy, qui remplacent les forces juste après
+
+            forces, forceTir = ship.forces, ship.forceTir
+            forces[0], forces[1] = shipVx, shipVy
+            forceTir[0], forceTir[1] = shipShotX, shipShotY
+            if ship.HP > ship.maxHP:
+                ship.HP = ship.maxHP
+            ship.angleMomentum, ship.propulseur, ship.distToPlayer, ship.dotFront = (shipMomentum, shipThrust,
+                                                                                     shipDistance, shipDot)
+            if shipFiring:
+                ship.fire()  # Dans l'ordre des vaisseaux : les balles prennent les mêmes places dans le pool
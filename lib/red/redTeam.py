@@ -1,9 +1,16 @@
 """Fichier relative aux vaisseaux rouges
 """
 
+from lib.collision import ENEMY, TEAM_RED
+from lib.ship import Ship
+from lib.vectors import pi_mul_2
+
 
 class redTeam(Ship):
     """Classe relative au 'shooter' rouge
+
+    Son mouvement et son IA (tir, rotation vers le joueur, propulseur) sont calculés pour tout les vaisseaux rouges
+    à la fois, voir lib.red.fleet.Fleet.update().
     
     Attributes:
         angle (float): Angle de l'objet, relatif à l'axe horizontal vers la droite, counter-clockwise == positif, en rad
@@ -11,14 +18,25 @@ class redTeam(Ship):
         dotFront (float): Valeur du produit scalaire entre direction et vecDistToPlayer
         firingDistance (int): Distance de tir maximum
         forces (list): Forces du vaisseau
-        ownership (str): Nom d'appartenance donné à la balle tirée
         propulseur (float): Accélération actuelle du propulseur
+        slot (int): Case du vaisseau dans les tableaux de world.fleet, None avant sa première passe
+        stats (dict): Réglages de la classe : PV ("HP"), masse, puissanceCanon et ammoTimer, changés par le
+            simulateur par lots pour l'équilibrage (voir lib.sweep)
+
+    Deleted Attributes:
+        ownership (str): Nom d'appartenance donné à la balle tirée, voir team
     """
 
-    def __init__(self, life, pos, groupe, image, mass, puissanceCanon, ammoTimer):
+    __slots__ = ("distToPlayer", "dotFront", "firingDistance", "slot")
+
+    category = ENEMY
+    team = TEAM_RED
+
+    def __init__(self, world, life, pos, groupe, image, mass, puissanceCanon, ammoTimer):
         """Redéfinition des certaines fonctions
         
         Args:
+            world (World): Monde auquel appartient le vaisseau
             life (int): PV du vaisseau
             pos (tuple): Position de départ
             groupe (list): Groupe Pygame où mettre le vaisseau
@@ -26,50 +44,23 @@ class redTeam(Ship):
             mass (int): Masse du vaisseau en kilogrammes (introduit en tonnes)
             puissanceCanon (TYPE): Description
         """
-        super().__init__(life, pos, groupe, image, mass, puissanceCanon, ammoTimer)
+        super().__init__(world, life, pos, groupe, image, mass, puissanceCanon, ammoTimer)
 
         self.distToPlayer: float
         self.firingDistance = 1000
 
-        self.ownership = "red"
-        self.forces = [player.forces[0], player.forces[1]]
+        self.forces = [world.player.forces[0], world.player.forces[1]]
 
-        self.angle = uniform(-pi_mul_2, pi_mul_2)
+        self.angle = world.rng.uniform(-pi_mul_2, pi_mul_2)
 
-    def fire_if_player_in_front(self):
-        """Fonction qui fait tirer le vaisseau si le joueur est devant
-        """
-        self.dotFront = self.direction * self.vectDistanceToPlayer.normalize()
-        if self.dotFront > 0.90 and self.distToPlayer < self.firingDistance:
-            self.fire()
-
-    def turn_to_player(self):
-        """Fonction qui fait tourner l'ennemi vers le joueur
-        """
-
-        self.angleMomentum += (angleBetweenVectors(self.direction, self.vectDistanceToPlayer) * 0.01)
-        self.angleMomentum *= 0.7 if self.dotFront >= 0 else 1
-
-    def move(self):
-        """Fonction qui fait bouger le vaisseau
-        """
-        if self.distToPlayer > 500:
-            self.propulseur += 0.0005
-        elif self.distToPlayer < 300:
-            self.propulseur -= 0.0005
-        else:
-            self.propulseur *= 0.8
-        if abs(self.propulseur) > 0.12:
-            self.propulseur = copysign(0.12, self.propulseur)
+        world.fleet.join(self)
 
     def update(self):
-        """Fonction qui actualise l'ennemi
+        """Rien : le vaisseau est actualisé par la passe de la flotte, voir lib.red.fleet.Fleet.update()
         """
-        super().update()
-
-        self.distToPlayer = self.vectDistanceToPlayer.magnitude()
 
-        if not self.dying:
-            self.fire_if_player_in_front()
-            self.turn_to_player()
-            self.move()
+    def kill(self):
+        """Retire le vaisseau de ses groupes et de la flotte
+        """
+        self.world.fleet.leave(self)
+        super().kill()
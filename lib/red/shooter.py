@@ -1,17 +1,26 @@
 """Fichier relatif au 'shooter'
 """
 
+from lib.red.redTeam import redTeam
+
 
 class redShooter(redTeam):
 	"""Classe relative au 'shooter' rouge
 	"""
 
-	def __init__(self, pos):
+	__slots__ = ()
+
+	stats = {"HP": 90, "mass": 300, "puissanceCanon": 16, "ammoTimer": 15}
+
+	def __init__(self, world, pos):
 		"""Redéfinition des certaines fonctions
 		
 		Args:
+		    world (World): Monde auquel appartient le vaisseau
 		    pos (tuple): Position d'apparition (x, y) du vaisseau
 		"""
-		super().__init__(90, pos, ships, shooterRedSprite, 300, 16, 15)
+		stats = self.stats
+		super().__init__(world, stats["HP"], pos, world.ships, world.images.shooterRedSprite, stats["mass"],
+		                 stats["puissanceCanon"], stats["ammoTimer"])
 
 		# self.ownership = "redshooter"
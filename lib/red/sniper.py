@@ -1,18 +1,27 @@
 """Fichier relatif au 'sniper'
 """
 
+from lib.red.redTeam import redTeam
+
 
 class redSniper(redTeam):
 	"""Classe relative au 'shooter' rouge
 	"""
 
-	def __init__(self, pos):
+	__slots__ = ()
+
+	stats = {"HP": 100, "mass": 480, "puissanceCanon": 90, "ammoTimer": 75}
+
+	def __init__(self, world, pos):
 		"""Redéfinition des certaines fonctions
 		
 		Args:
+		    world (World): Monde auquel appartient le vaisseau
 		    pos (tuple): Position d'apparition (x, y) du vaisseau
 		"""
-		super().__init__(100, pos, ships, sniperRedSprite, 480, 90, 75)
+		stats = self.stats
+		super().__init__(world, stats["HP"], pos, world.ships, world.images.sniperRedSprite, stats["mass"],
+		                 stats["puissanceCanon"], stats["ammoTimer"])
 
 		# self.ownership = "redblaster"
 		self.firingDistance = 1600
@@ -0,0 +1,356 @@
+"""Fichier contenant les moteurs d'affichage : plein écran, ou rectangles modifiés seulement
+"""
+
+import pygame
+
+
+BACKGROUND = (20, 20, 20)
+MAX_SCALED = 2048  # Images réduites gardées par Renderer.downscale() avant de tout vider
+
+
+class Renderer:
+    """Affichage plein écran : le fond est redessiné et tout l'écran est envoyé à chaque frame
+
+    Tout ce qui dessine sur l'écran signale la zone touchée avec mark(), pour que DirtyRenderer sache quoi effacer.
+    Si le monde dessine à une résolution plus basse que l'écran (voir World.setRenderScale()), étoiles, boucliers,
+    sprites et balles sont réduits sur la surface de rendu, qui est agrandie sur l'écran avant le HUD.
+
+    Attributes:
+        dirty (list): Rectangles dessinés pendant la frame en cours
+        frames (int): Nombre de frames affichées
+        fullFrames (int): Nombre de frames où tout l'écran a été envoyé
+        pixelsPushed (int): Nombre de pixels envoyés à l'écran à la dernière frame
+        scaled (dict): Images réduites à la résolution de rendu, par image d'origine
+        smooth (bool): Si True, l'image est agrandie avec smoothscale (plus lent, moins pixelisé)
+        stars (tuple): (champ d'étoiles du monde, le même réduit à la résolution de rendu), None s'il n'est pas fait
+        totalPixelsPushed (int): Nombre de pixels envoyés depuis le lancement
+        world (World): Monde à afficher
+    """
+
+    def __init__(self, world, smooth=False):
+        """Constructeur du moteur d'affichage
+
+        Args:
+            world (World): Monde à afficher
+            smooth (bool, optional): Si True, agrandit l'image avec smoothscale
+        """
+        self.world = world
+        self.smooth = smooth
+        self.dirty = []
+        self.scaled = {}
+        self.stars = None
+
+        self.frames = 0
+        self.fullFrames = 0
+        self.pixelsPushed = 0
+        self.totalPixelsPushed = 0
+
+    def mark(self, rect):
+        """Signale une zone de l'écran modifiée pendant la frame
+
+        Args:
+            rect (pygame.Rect): Zone modifiée, telle que retournée par blit() ou pygame.draw
+        """
+        self.dirty.append(rect)
+
+    def beginFrame(self, camera):
+        """Efface l'écran et dessine les étoiles
+
+        Args:
+            camera (tuple): Position interpolée de la caméra
+        """
+        world = self.world
+        self.dirty = []
+
+        world.screen.fill(BACKGROUND)
+        self.drawStars(world.screen, camera)
+
+    def resize(self):
+        """Appelé quand la surface de rendu change de taille
+        """
+        self.dirty = []
+        self.scaled = {}
+        self.stars = None
+
+    def starField(self):
+        """Champ d'étoiles à la résolution de rendu : celui du monde, réduit si la surface de rendu est plus petite
+
+        Returns:
+            StarField: Étoiles à dessiner sur la surface de rendu
+        """
+        world = self.world
+        if world.renderFactor == 1:
+            return world.stars
+        if self.stars is None or self.stars[0] is not world.stars:
+            self.stars = (world.stars, world.stars.scaled(world.renderFactor))
+        return self.stars[1]
+
+    def starOffsets(self, camera):
+        """Décalages des couches d'étoiles à la résolution de rendu, voir StarField.offsets()
+
+        Args:
+            camera (tuple): Position interpolée de la caméra
+        """
+        factor = self.world.renderFactor
+        return self.starField().offsets(camera[0] / factor, camera[1] / factor)
+
+    def drawStars(self, surface, camera):
+        """Dessine les étoiles à la résolution de rendu
+
+        Args:
+            surface (Surface): Surface de la taille de la surface de rendu
+            camera (tuple): Position interpolée de la caméra
+        """
+        factor = self.world.renderFactor
+        self.starField().draw(surface, camera[0] / factor, camera[1] / factor)
+
+    def downscale(self, sequence):
+        """Ramène des (image, position) à l'échelle de l'écran à la résolution de rendu
+
+        Args:
+            sequence (list): (image, position du coin haut gauche) à l'échelle de l'écran, voir lib.pipeline.Frame
+
+        Returns:
+            list: Les mêmes, avec les images réduites (gardées d'une frame à l'autre) et les positions divisées
+        """
+        factor = self.world.renderFactor
+        if factor == 1:
+            return sequence
+
+        scaled = self.scaled
+        if len(scaled) > MAX_SCALED:
+            scaled.clear()  # Les images tournées changent avec les angles : les plus anciennes ne servent plus
+
+        downscaled = []
+        for image, (x, y) in sequence:
+            small = scaled.get(image)
+            if small is None:
+                width, height = image.get_size()
+                small = scaled[image] = pygame.transform.scale(image, (max(width // factor, 1),
+                                                                        max(height // factor, 1)))
+            downscaled.append((small, (x // factor, y // factor)))
+        return downscaled
+
+    def upscale(self):
+        """Agrandit la surface de rendu sur l'écran, si elle est plus petite. Le HUD est dessiné ensuite sur l'écran,
+        en pleine résolution
+        """
+        world = self.world
+        if world.screen is not world.display:
+            scale = pygame.transform.smoothscale if self.smooth else pygame.transform.scale
+            scale(world.screen, (world.screenWidth, world.screenHeight), world.display)
+            # Dans l'écran lui-même : aucune surface n'est allouée
+
+    def endFrame(self):
+        """Envoie la frame à l'écran
+        """
+        self.present()
+
+    def present(self, rects=None):
+        """Envoie l'image à l'écran, une fois agrandie par upscale()
+
+        Args:
+            rects (list, optional): Zones à envoyer, tout l'écran si None. Ignoré si l'image est agrandie
+        """
+        world = self.world
+
+        if world.screen is not world.display:
+            rects = None  # Agrandir des morceaux laisserait des coutures : toute l'image est envoyée
+
+        if rects is None:
+            pygame.display.flip()
+            self._count(world.screenWidth * world.screenHeight, True)
+        else:
+            pygame.display.update(rects)
+            self._count(sum(rect.w * rect.h for rect in rects), False)
+
+    def _count(self, pixels, full):
+        """Met à jour les compteurs de pixels envoyés
+
+        Args:
+            pixels (int): Pixels envoyés pendant la frame
+            full (bool): Si True, tout l'écran a été envoyé
+        """
+        self.frames += 1
+        self.fullFrames += full
+        self.pixelsPushed = pixels
+        self.totalPixelsPushed += pixels
+
+
+class DirtyRenderer(Renderer):
+    """Affichage partiel : seules les zones dessinées à cette frame ou à la précédente sont effacées et envoyées
+
+    Le fond (couleur et étoiles) ne change que si une couche d'étoiles se décale d'au moins un pixel :
+    la caméra a trop bougé, tout l'écran est alors redessiné et envoyé. Sinon, les zones de la frame précédente
+    sont effacées avec une copie du fond, préparée à la première frame partielle après un mouvement.
+
+    Attributes:
+        background (Surface): Copie du fond, pour effacer les zones de la frame précédente
+        backgroundKey (tuple): Décalages des couches d'étoiles utilisés pour dessiner background
+        screenKey (tuple): Décalages des couches d'étoiles du fond actuellement à l'écran
+        full (bool): Si True, la frame en cours redessine tout l'écran
+        maxDirtyRatio (float): Part de l'écran modifiée au-delà de laquelle tout l'écran est envoyé d'un coup
+        previous (list): Zones dessinées à la frame précédente, à effacer
+    """
+
+    def __init__(self, world, smooth=False, maxDirtyRatio=0.5):
+        """Constructeur du moteur d'affichage partiel
+
+        Args:
+            world (World): Monde à afficher
+            smooth (bool, optional): Si True, agrandit l'image avec smoothscale
+            maxDirtyRatio (float, optional): Part de l'écran modifiée au-delà de laquelle tout est envoyé
+        """
+        super().__init__(world, smooth)
+
+        self.maxDirtyRatio = maxDirtyRatio
+        self.resize()
+
+    def resize(self):
+        """Recrée la copie du fond à la taille de la surface de rendu, et redessine tout à la prochaine frame
+        """
+        super().resize()
+
+        self.background = self.world.screen.copy()
+        self.backgroundKey = None
+        self.screenKey = None
+        self.full = True
+        self.previous = []
+
+    def beginFrame(self, camera):
+        """Redessine le fond si la caméra l'a décalé, sinon efface seulement la frame précédente
+
+        Args:
+            camera (tuple): Position interpolée de la caméra
+        """
+        world = self.world
+        self.dirty = []
+
+        key = self.starOffsets(camera)
+        self.full = key != self.screenKey
+
+        if self.full:
+            world.screen.fill(BACKGROUND)
+            self.drawStars(world.screen, camera)
+            self.screenKey = key
+            # Le fond n'est copié que si la caméra s'arrête : en mouvement, c'est le même coût que Renderer
+        else:
+            if self.backgroundKey != key:
+                self.background.fill(BACKGROUND)
+                self.drawStars(self.background, camera)
+                self.backgroundKey = key
+
+            for rect in self.previous:
+                world.screen.blit(self.background, rect, rect)
+
+    def endFrame(self):
+        """Envoie tout l'écran, ou seulement les zones effacées et redessinées
+        """
+        world = self.world
+        screenRect = world.screen.get_rect()
+
+        dirty = [screenRect.clip(rect) for rect in self.dirty if rect is not None]
+
+        rects = None
+        if not self.full:
+            rects = mergeRects(self.previous + dirty)
+            if sum(rect.w * rect.h for rect in rects) > self.maxDirtyRatio * screenRect.w * screenRect.h:
+                rects = None  # Trop de petites zones : un seul envoi de tout l'écran coûte moins cher
+
+        self.present(rects)
+
+        self.previous = dirty
+
+
+def mergeRects(rects, margin=8):
+    """Fusionne les rectangles qui se touchent ou sont proches, pour envoyer moins de zones
+
+    Args:
+        rects (list): Rectangles à fusionner
+        margin (int, optional): Distance en pixels en dessous de laquelle deux rectangles sont fusionnés
+
+    Returns:
+        list: Rectangles fusionnés, sans chevauchement entre eux
+    """
+    merged = []
+    for rect in rects:
+        if not rect.w or not rect.h:
+            continue
+        rect = pygame.Rect(rect)
+
+        index = rect.inflate(margin, margin).collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.inflate(margin, margin).collidelist(merged)
+
+        merged.append(rect)
+    return merged
+
+
+class AutoScale:
+    """Baisse l'échelle de rendu quand les frames dépassent leur budget, et la remonte quand il y a de la marge
+
+    Le coût de l'affichage suit le nombre de pixels : l'échelle n'est remontée que si le temps moyen,
+    multiplié par le rapport des surfaces, reste sous le budget. Cela évite d'osciller entre deux échelles.
+    Agrandir l'image a aussi un coût fixe : si baisser l'échelle n'a pas rendu les frames plus rapides,
+    l'échelle précédente est remise et devient la plus basse utilisée.
+
+    Attributes:
+        budget (float): Temps maximum d'une frame (simulation et affichage), en secondes
+        frameTimes (list): Temps des frames depuis le dernier ajustement, en secondes
+        index (int): Indice de l'échelle actuelle dans steps
+        lastLowered (float): Temps moyen avant la dernière baisse d'échelle, None si la dernière mesure n'en a pas fait
+        lowest (int): Indice de la plus basse échelle encore utile dans steps
+        steps (tuple): Échelles possibles, de la meilleure à la plus basse
+        window (int): Nombre de frames moyennées avant chaque ajustement
+        world (World): Monde dont l'échelle de rendu est ajustée
+    """
+
+    def __init__(self, world, budget=1 / 60, steps=(1.0, 1 / 2, 1 / 3), window=30):
+        """Constructeur de l'ajustement automatique, qui commence à la meilleure échelle
+
+        Args:
+            world (World): Monde dont l'échelle de rendu est ajustée
+            budget (float, optional): Temps maximum d'une frame, en secondes
+            steps (tuple, optional): Échelles possibles, de la meilleure à la plus basse, en 1 / n (voir
+                World.setRenderScale())
+            window (int, optional): Nombre de frames moyennées avant chaque ajustement
+        """
+        self.world = world
+        self.budget = budget
+        self.steps = steps
+        self.window = window
+
+        self.index = 0
+        self.lowest = len(steps) - 1
+        self.lastLowered = None
+        self.frameTimes = []
+        world.setRenderScale(steps[0])
+
+    def update(self, frameTime):
+        """Ajoute le temps d'une frame, et change d'échelle si la moyenne le demande
+
+        Args:
+            frameTime (float): Temps passé à simuler et dessiner la frame, sans l'attente du framerate, en secondes
+        """
+        self.frameTimes.append(frameTime)
+        if len(self.frameTimes) < self.window:
+            return
+
+        average = sum(self.frameTimes) / len(self.frameTimes)
+        self.frameTimes = []
+
+        lowered, self.lastLowered = self.lastLowered, None
+
+        if lowered is not None and average >= lowered:
+            self.index -= 1
+            self.lowest = self.index
+        elif average > self.budget and self.index < self.lowest:
+            self.lastLowered = average
+            self.index += 1
+        elif self.index > 0 and average * (self.steps[self.index - 1] / self.steps[self.index]) ** 2 < 0.8 * self.budget:
+            self.index -= 1
+        else:
+            return
+
+        self.world.setRenderScale(self.steps[self.index])
@@ -0,0 +1,150 @@
+"""Fichier contenant l'enregistrement et la relecture des parties
+
+Une partie est entièrement déterminée par la graine du générateur aléatoire du monde et par les touches
+appuyées à chaque tick. Le fichier contient un en-tête (graine, taille d'écran logique) puis un octet
+par tick, un bit par touche, compressé avec zlib : une minute de jeu tient en quelques centaines d'octets.
+"""
+
+import struct
+import zlib
+
+import pygame
+
+
+MAGIC = b"SPRP"
+VERSION = 10
+# À augmenter aussi quand les règles de la simulation changent : une ancienne partie ne se rejouerait plus pareil
+HEADER = struct.Struct("<4sBQHH")  # magic, version, graine, largeur, hauteur
+
+KEYS = (pygame.K_UP, pygame.K_LEFT, pygame.K_RIGHT, pygame.K_SPACE,
+        pygame.K_RETURN, pygame.K_ESCAPE, pygame.K_F1)
+# Toutes les touches lues par le jeu, une par bit. Ne changer que l'ordre avec VERSION
+
+
+class ReplayKeys:
+    """État du clavier relu depuis un fichier, utilisable comme pygame.key.get_pressed()
+
+    Attributes:
+        bits (int): Un bit par touche de KEYS
+    """
+
+    __slots__ = ("bits",)
+
+    def __init__(self, bits):
+        """Constructeur de l'état du clavier
+
+        Args:
+            bits (int): Un bit par touche de KEYS
+        """
+        self.bits = bits
+
+    def __getitem__(self, key):
+        """Retourne True si la touche était appuyée
+        """
+        if key in KEYS:
+            return bool(self.bits >> KEYS.index(key) & 1)
+        return False
+
+
+def packKeys(key):
+    """Retourne l'octet représentant l'état des touches de KEYS
+
+    Args:
+        key (list): État du clavier, comme pygame.key.get_pressed()
+    """
+    bits = 0
+    for index, code in enumerate(KEYS):
+        if key[code]:
+            bits |= 1 << index
+    return bits
+
+
+class ReplayRecorder:
+    """Enregistre les touches de chaque tick
+
+    Attributes:
+        path (str): Chemin du fichier à écrire
+        seed (int): Graine du monde enregistré
+        size (tuple): Taille d'écran logique du monde (largeur, hauteur)
+        ticks (bytearray): Un octet par tick
+    """
+
+    def __init__(self, path, seed, size):
+        """Constructeur de l'enregistreur
+
+        Args:
+            path (str): Chemin du fichier à écrire
+            seed (int): Graine du monde enregistré
+            size (tuple): Taille d'écran logique du monde (largeur, hauteur)
+        """
+        self.path = path
+        self.seed = seed
+        self.size = size
+        self.ticks = bytearray()
+
+    def record(self, key):
+        """Ajoute l'état du clavier d'un tick
+
+        Args:
+            key (list): État du clavier, comme pygame.key.get_pressed()
+        """
+        self.ticks.append(packKeys(key))
+
+    def save(self):
+        """Écrit le fichier
+        """
+        with open(self.path, "wb") as file:
+            file.write(HEADER.pack(MAGIC, VERSION, self.seed, *self.size))
+            file.write(zlib.compress(bytes(self.ticks), 9))
+
+
+class ReplayPlayer:
+    """Relit les touches d'un fichier enregistré par ReplayRecorder
+
+    Attributes:
+        position (int): Indice du prochain tick à relire
+        seed (int): Graine du monde enregistré
+        size (tuple): Taille d'écran logique du monde enregistré (largeur, hauteur)
+        ticks (bytes): Un octet par tick
+    """
+
+    def __init__(self, path):
+        """Lit le fichier
+
+        Args:
+            path (str): Chemin du fichier enregistré
+
+        Raises:
+            ValueError: Si le fichier n'est pas une partie enregistrée, ou d'une autre version
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+
+        magic, version, self.seed, width, height = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} n'est pas une partie enregistrée compatible")
+
+        self.size = (width, height)
+        self.ticks = zlib.decompress(data[HEADER.size:])
+        self.position = 0
+
+    def __len__(self):
+        """Nombre de ticks enregistrés
+        """
+        return len(self.ticks)
+
+    @property
+    def finished(self):
+        """True si tout les ticks ont été relus
+        """
+        return self.position >= len(self.ticks)
+
+    def next(self):
+        """Retourne l'état du clavier du prochain tick
+
+        Returns:
+            ReplayKeys: État du clavier
+        """
+        bits = self.ticks[self.position]
+        self.position += 1
+        return ReplayKeys(bits)
@@ -0,0 +1,173 @@
+"""Fichier contenant le cache des sprites tournés et de leurs masques de collision
+"""
+
+import threading
+
+import pygame
+
+from collections import OrderedDict
+from math import pi
+
+
+MASK_THRESHOLD = 254  # Opacité minimale d'un pixel pour qu'il compte dans le masque de collision
+
+
+class RotationCache:
+    """Cache LRU des images tournées, indexé par image source et angle quantifié
+
+    Le masque de collision de chaque image tournée est gardé à côté d'elle, construit à la première demande.
+    Changer d'image source (propulseur, canons) change la clé : l'ancien masque n'est plus utilisé.
+    Les rotations précalculées dans l'atlas (bake) remplacent pygame.transform.rotate pour leur image source.
+
+    Attributes:
+        baked (dict): {image source: liste des images tournées, une par indice d'angle}
+        buckets (int): Nombre d'angles possibles sur un tour complet
+        entries (OrderedDict): {(image source, indice d'angle): [image tournée, masque]}, du plus ancien au plus récent
+        frameMaskBuilds (int): Masques construits depuis le dernier newFrame()
+        frameMaskRequests (int): Masques demandés depuis le dernier newFrame()
+        hits (int): Nombre de rotations trouvées dans le cache
+        lock (threading.Lock): Tenu pendant la construction d'un masque et pendant les blits du thread de dessin :
+            pygame.mask.from_surface verrouille l'image tournée, qui ne peut alors plus être blittée
+        maxBytes (int): Mémoire maximale occupée par les images du cache, en octets
+        maskBuilds (int): Nombre de masques construits avec pygame.mask.from_surface
+        maskRequests (int): Nombre de masques demandés, soit le nombre de masques construits avant le cache
+        misses (int): Nombre de rotations calculées
+        size (int): Mémoire actuellement occupée par les images du cache, en octets
+    """
+
+    def __init__(self, buckets=360, maxBytes=64 * 1024 * 1024):
+        """Constructeur du cache
+
+        Args:
+            buckets (int, optional): Nombre d'angles possibles sur un tour complet (360, 720...)
+            maxBytes (int, optional): Mémoire maximale du cache, en octets
+        """
+        self.buckets = buckets
+        self.maxBytes = maxBytes
+
+        self.entries = OrderedDict()
+        self.size = 0
+        self.baked = {}
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+        self.maskBuilds = 0
+        self.maskRequests = 0
+        self.frameMaskBuilds = 0
+        self.frameMaskRequests = 0
+
+    def quantize(self, angle):
+        """Retourne l'indice d'angle le plus proche
+
+        Args:
+            angle (float): Angle en radians, counter-clockwise
+        """
+        return round(angle * self.buckets / (2 * pi)) % self.buckets
+
+    def _entry(self, image, angle):
+        """Retourne l'entrée [image tournée, masque] du cache, en la créant si besoin
+
+        Args:
+            image (Surface): Image source
+            angle (float): Angle en radians, même convention que Object.angle
+        """
+        key = (image, self.quantize(angle))
+
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry
+
+        self.misses += 1
+        baked = self.baked.get(image)
+        rotated = pygame.transform.rotate(image, - key[1] * 360 / self.buckets) if baked is None else baked[key[1]]
+
+        entry = [rotated, None]
+        self.entries[key] = entry
+        self.size += _sizeOf(entry)
+
+        while self.size > self.maxBytes and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= _sizeOf(evicted)
+
+        return entry
+
+    def get(self, image, angle):
+        """Retourne l'image tournée de l'angle donné, depuis le cache si possible
+
+        Args:
+            image (Surface): Image source
+            angle (float): Angle en radians, même convention que Object.angle
+
+        Returns:
+            Surface: Image tournée
+        """
+        return self._entry(image, angle)[0]
+
+    def getMask(self, image, angle):
+        """Retourne le masque de collision de l'image tournée, construit une seule fois par entrée
+
+        Args:
+            image (Surface): Image source
+            angle (float): Angle en radians, même convention que Object.angle
+
+        Returns:
+            pygame.mask.Mask: Masque de l'image tournée
+        """
+        self.maskRequests += 1
+        self.frameMaskRequests += 1
+
+        entry = self._entry(image, angle)
+        if entry[1] is None:
+            self.maskBuilds += 1
+            self.frameMaskBuilds += 1
+
+            self.size -= _sizeOf(entry)
+            with self.lock:
+                entry[1] = pygame.mask.from_surface(entry[0], threshold=MASK_THRESHOLD)
+            self.size += _sizeOf(entry)
+
+        return entry[1]
+
+    def bake(self, image, rotations):
+        """Donne les rotations précalculées d'une image, utilisées au lieu de la tourner
+
+        Args:
+            image (Surface): Image source
+            rotations (list): Images tournées, une par indice d'angle, dans la convention de get()
+
+        Returns:
+            bool: False si le nombre de rotations ne correspond pas à buckets : elles sont alors ignorées
+        """
+        if len(rotations) != self.buckets:
+            return False
+        self.baked[image] = rotations
+        return True
+
+    def newFrame(self):
+        """Remet à zéro les compteurs de la frame
+        """
+        self.frameMaskBuilds = 0
+        self.frameMaskRequests = 0
+
+    def clear(self):
+        """Vide le cache
+        """
+        self.entries.clear()
+        self.size = 0
+
+
+def _sizeOf(entry):
+    """Mémoire approximative d'une entrée du cache, en octets
+
+    Args:
+        entry (list): [image tournée, masque ou None]
+    """
+    rotated, mask = entry
+    size = rotated.get_width() * rotated.get_height() * rotated.get_bytesize()
+    if mask is not None:
+        size += rotated.get_width() * rotated.get_height() // 8
+    return size
@@ -1,6 +1,10 @@
 """Fichier contenant les méthodes relatives aux vaisseaux
 """
 
+from math import cos, sin
+
+from lib.object import Object
+
 
 class Ship(Object):
 
@@ -19,15 +23,21 @@ class Ship(Object):
         puissanceCanon (int): Valeur de la puissance du ou des canon(s) du vaisseau
         spriteChangeCounter (int): Clock qui va delayer l'affichage des futurs sprites de propulsion
         spriteFiringCounter (int): Clock qui va définir le temps d'affichage des éclats des canons lors du tir
+        width (int): Largeur de l'image de départ, pour placer la barre de vie
+        height (int): Hauteur de l'image de départ, pour placer la barre de vie
 
     Deleted Attributes:
         angle (float): Direction du vaisseau en rad, counter-clockwise
     """
 
-    def __init__(self, life, pos, groupe, image, mass, puissanceCanon, ammoTimer, fireOffset=0):
+    __slots__ = ("ammoClock", "ammoTimer", "fireOffset", "firingMouvementImages", "forceTir", "height", "maxHP",
+                 "mouvementImages", "propulseur", "puissanceCanon", "spriteChangeCounter", "spriteFiringCounter", "width")
+
+    def __init__(self, world, life, pos, groupe, image, mass, puissanceCanon, ammoTimer, fireOffset=0):
         """Constructeur du vaisseau
 
         Args:
+            world (World): Monde auquel appartient le vaisseau
             life (int): PV du vaisseau
             pos (tuple): Position de départ
             groupe (list): Groupe Pygame où mettre le vaisseau
@@ -38,7 +48,7 @@ class Ship(Object):
             fireOffset (int, optional): Point d'apparition décalé de la balle tirée
         """
 
-        super().__init__(life, pos, groupe, image, mass)
+        super().__init__(world, life, pos, groupe, image, mass)
 
         self.propulseur = 0.0
         # La force du propulseur du vaisseau
@@ -77,27 +87,40 @@ class Ship(Object):
 
         if self.ammoClock == 0:
 
-            bullets.add(Bullet(1, (self.x + cos(self.angle) * self.fireOffset + self.fireOffset * sin(self.angle),
-                                   self.y + sin(self.angle) * self.fireOffset - self.fireOffset * cos(self.angle)),
-                               bullets, bulletImage, self.forceTir, self.angle, 0.05, self.ownership))
+            self.world.bullets.spawn((self.x + cos(self.angle) * self.fireOffset + self.fireOffset * sin(self.angle),
+                                      self.y + sin(self.angle) * self.fireOffset - self.fireOffset * cos(self.angle)),
+                                     self.forceTir, self.angle, self.team)
 
             self.ammoClock = self.ammoTimer
 
-    def healthbar(self):
-        """Affiche une barre de vie
+    def healthbar(self, frame):
+        """Ajoute la barre de vie à la frame, affichée par hudHealthbar()
+
+        Args:
+            frame (Frame): Frame à remplir, voir lib.pipeline
+
+        Returns:
+            tuple: Position de la barre de vie, pour que Player y ajoute ses jauges
         """
+        drawRectPos = (self.renderPos[0] - self.width * 0.33, self.renderPos[1] + self.height * 0.5)
+        frame.bars.append((drawRectPos, self.maxHP, self.HP))
+        return drawRectPos
+
+    def snapshot(self, frame, alpha=1.0, camera=None):
+        """Ajoute le vaisseau à la frame, puis sa barre de vie s'il est à l'écran
 
-        drawRectPos = (self.drawPos[0] - self.width * 0.33, self.drawPos[1] + self.height * 0.5)
-        pygame.draw.rect(screen, (190, 30, 30), (drawRectPos, (self.maxHP / 10, 5)))
-        pygame.draw.rect(screen, (0, 255, 0), (drawRectPos, (self.HP / 10, 5)))
+        Args:
+            frame (Frame): Frame à remplir, voir lib.pipeline
+            alpha (float, optional): Avancement entre le tick précédent et le tick actuel
+            camera (tuple, optional): Position interpolée de la caméra
 
-        if isinstance(self, Player):
-            pygame.draw.rect(screen, (255, 0, 255), (drawRectPos,
-                                                     (self.fuel / self.max_fuel * (self.maxHP / 10), 2)))
-            myFont.render_to(screen, (drawRectPos[0] - 10, drawRectPos[1]),
-                             f"{self.ammo}", fgcolor=(255, 255, 255), size=10)
-            pygame.draw.rect(screen, (0, 70, 255), ((drawRectPos[0], drawRectPos[1] + 2),
-                                                    (self.shieldHP / self.max_shieldHP * (self.maxHP / 10), 3)))
+        Returns:
+            bool: True si le vaisseau est à l'écran
+        """
+        visible = super().snapshot(frame, alpha, camera)
+        if visible and not self.dying:
+            self.healthbar(frame)
+        return visible
 
     def update(self):
         """Actualise le vaisseau
@@ -109,11 +132,24 @@ class Ship(Object):
         self.forces[1] += sin(self.angle) * self.propulseur
         # Permet d'ajouter aux forces le travail du propulseur !
 
-        if not self.dying:
-            self.healthbar()
-
         if self.HP > self.maxHP:
             self.HP = self.maxHP
 
-        self.forceTir = [self.puissanceCanon * cos(self.angle) + self.forces[0],
-                         self.puissanceCanon * sin(self.angle) + self.forces[1]]
+        self.forceTir[0] = self.puissanceCanon * cos(self.angle) + self.forces[0]
+        self.forceTir[1] = self.puissanceCanon * sin(self.angle) + self.forces[1]
+        # Modifiée sur place : les balles copient ces forces au tir
+
+
+def hudHealthbar(world, bar):
+    """Image et position d'une barre de vie copiée par Ship.healthbar(), pour la passe du HUD
+
+    Args:
+        world (World): Monde où se trouve le HUD
+        bar (tuple): (position, PV max, PV)
+
+    Returns:
+        tuple: (image, position), voir Hud.draw()
+    """
+    drawRectPos, maxHP, HP = bar
+    bar = world.hud.bar(world, drawRectPos, ((190, 30, 30), (0, 0, maxHP / 10, 5)), ((0, 255, 0), (0, 0, HP / 10, 5)))
+    return bar, drawRectPos
@@ -0,0 +1,84 @@
+"""Fichier contenant la grille spatiale utilisée pour trouver les collisions potentielles
+"""
+
+from math import floor, hypot
+
+
+class SpatialHash:
+    """Grille uniforme en coordonnées du monde, reconstruite une fois par tick
+
+    La taille des cellules vaut le diamètre du plus gros objet : deux objets qui se touchent sont
+    forcément dans la même cellule ou dans deux cellules voisines.
+
+    Attributes:
+        cells (dict): {(cellule x, cellule y): [(objet, x, y, rayon), ...]}
+        cellSize (float): Taille d'une cellule en pixels
+        minCellSize (float): Taille minimale d'une cellule, pour ne pas en créer trop
+    """
+
+    # Cellules voisines "en avant" : chaque paire de cellules n'est regardée que dans un sens
+    NEIGHBOURS = ((1, 0), (-1, 1), (0, 1), (1, 1))
+
+    def __init__(self, minCellSize=32):
+        """Constructeur de la grille
+
+        Args:
+            minCellSize (float, optional): Taille minimale d'une cellule en pixels
+        """
+        self.minCellSize = minCellSize
+        self.cellSize = minCellSize
+        self.cells = {}
+
+    def rebuild(self, objects):
+        """Range tout les objets dans la grille
+
+        Args:
+            objects (iter): Objets à ranger, avec x, y et radius (ou rect)
+        """
+        entries = []
+        maxRadius = 0
+        for instance in objects:
+            radius = getattr(instance, "radius", None)
+            if radius is None:
+                radius = 0.5 * hypot(instance.rect.w, instance.rect.h)
+                # Même rayon que pygame.sprite.collide_circle
+            if radius > maxRadius:
+                maxRadius = radius
+            entries.append((instance, instance.x, instance.y, radius))
+
+        self.cellSize = max(2 * maxRadius, self.minCellSize)
+        cellSize = self.cellSize
+
+        self.cells = cells = {}
+        for entry in entries:
+            cell = (floor(entry[1] / cellSize), floor(entry[2] / cellSize))
+            if cell in cells:
+                cells[cell].append(entry)
+            else:
+                cells[cell] = [entry]
+
+    def pairs(self):
+        """Génère chaque paire d'objets dont les cercles se touchent, une seule fois
+
+        Yields:
+            tuple: (objet, autre objet)
+        """
+        cells = self.cells
+
+        for (cellX, cellY), entries in cells.items():
+
+            for i, (a, ax, ay, ar) in enumerate(entries):
+                for b, bx, by, br in entries[i + 1:]:
+                    dx, dy, radii = ax - bx, ay - by, ar + br
+                    if dx * dx + dy * dy <= radii * radii:  # Test cercle contre cercle
+                        yield a, b
+
+            for offsetX, offsetY in self.NEIGHBOURS:
+                neighbours = cells.get((cellX + offsetX, cellY + offsetY))
+                if neighbours is None:
+                    continue
+                for a, ax, ay, ar in entries:
+                    for b, bx, by, br in neighbours:
+                        dx, dy, radii = ax - bx, ay - by, ar + br
+                        if dx * dx + dy * dy <= radii * radii:
+                            yield a, b
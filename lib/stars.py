@@ -0,0 +1,212 @@
+"""Fichier contenant le moteur du champ d'étoiles (parallaxe)
+
+Les étoiles sont rangées dans des tableaux NumPy, un groupe par couche de parallaxe.
+Chaque frame, les positions d'affichage d'une couche sont calculées en une seule opération
+vectorisée, puis écrites d'un coup dans l'écran : le nombre d'étoiles ne dicte plus le framerate.
+"""
+
+import pygame
+import pygame.surfarray
+import numpy as np
+
+from copy import copy
+from math import floor
+from random import Random
+
+
+def integers(generator, low, high, shape):
+    """Tire des entiers entre low (inclus) et high (exclu), d'un seul bloc d'octets aléatoires
+
+    Args:
+        generator (random.Random): Générateur aléatoire
+        low (int): Valeur minimum
+        high (int): Valeur maximum, exclue
+        shape (int | tuple): Forme du tableau
+
+    Returns:
+        np.ndarray: Tableau d'entiers
+    """
+    count = int(np.prod(shape))
+    values = np.frombuffer(generator.randbytes(4 * count), dtype=np.uint32).reshape(shape).astype(np.int64)
+    return low + values % (high - low)
+
+
+class StarField:
+    """Champ d'étoiles avec parallaxe
+
+    Attributes:
+        height (int): Hauteur de la zone où les étoiles se répètent
+        layers (list): Couches de parallaxe : [(facteur, xs, ys, couleurs), ...]
+        mode (str): "pixels" pour écrire les pixels via surfarray, "tiles" pour blitter des couches pré-rendues
+        tiles (list): Surfaces pré-rendues de chaque couche, utilisées en mode "tiles"
+        width (int): Largeur de la zone où les étoiles se répètent
+    """
+
+    def __init__(self, width, height, count, mode="pixels", rng=None):
+        """Génère les étoiles, avec le même rendu que l'ancien genStars()
+
+        Args:
+            width (int): Largeur de l'écran
+            height (int): Hauteur de l'écran
+            count (int): Nombre d'étoiles
+            mode (str, optional): "pixels" ou "tiles"
+            rng (random.Random, optional): Générateur aléatoire à utiliser, le module random par défaut
+        """
+
+        self.width = width
+        self.height = height
+        self.mode = mode
+
+        generator = Random(rng.getrandbits(64) if rng is not None else None)
+        # random.Random et pas numpy.random : son import ralentissait la première frame d'une quinzaine de ms
+
+        depths = integers(generator, 3, 13, count)  # layer = 1 / randint(3, 12)
+        xs = integers(generator, 0, width + 1, count) % width
+        ys = integers(generator, 0, height + 1, count) % height
+        colors = integers(generator, 170, 256, (count, 3))
+
+        self.layers = []
+        for depth in np.unique(depths):
+            selection = depths == depth
+            self.layers.append((1 / int(depth), xs[selection].astype(np.intp),
+                                ys[selection].astype(np.intp), colors[selection].astype(np.uint32)))
+        # Trié de la couche la plus lointaine à la plus proche
+        self.layers.sort(key=lambda layer: layer[0])
+
+        self._mapped = None  # Couleurs converties au format de la surface, calculées au premier affichage
+        self._mappedFormat = None
+        self.tiles = None
+
+    def __len__(self):
+        """Nombre total d'étoiles
+        """
+        return sum(len(xs) for _, xs, _, _ in self.layers)
+
+    def scaled(self, factor):
+        """Le même champ d'étoiles, réduit factor fois, pour une surface de rendu plus petite que l'écran
+
+        Dessiné avec la caméra divisée par factor, chaque étoile tombe au même endroit que sur l'écran une fois
+        l'image agrandie. Une étoile y devient un carré de factor x factor pixels : seule une étoile sur factor ** 2
+        est gardée, pour que le ciel ne soit pas plus chargé.
+
+        Args:
+            factor (int): Nombre de pixels de l'écran par pixel de rendu
+
+        Returns:
+            StarField: Champ d'étoiles réduit, qui partage les couleurs de celui-ci
+        """
+        stars = copy(self)
+        stars.width, stars.height = -(-self.width // factor), -(-self.height // factor)
+        step = factor * factor
+        stars.layers = [(layer, xs[::step] // factor, ys[::step] // factor, colors[::step])
+                        for layer, xs, ys, colors in self.layers]
+        stars._mapped = stars._mappedFormat = stars.tiles = None
+        return stars
+
+    def offsets(self, cameraX, cameraY):
+        """Décalages entiers de chaque couche : tant qu'ils ne changent pas, les étoiles restent au même endroit
+
+        Args:
+            cameraX (float): Position X de la caméra (le joueur)
+            cameraY (float): Position Y de la caméra (le joueur)
+
+        Returns:
+            tuple: ((décalage x, décalage y), ...) de la couche la plus lointaine à la plus proche
+        """
+        return tuple((floor(cameraX * layer), floor(cameraY * layer)) for layer, _, _, _ in self.layers)
+
+    def _mapColors(self, surface):
+        """Convertit les couleurs RGB en entiers au format de pixels de la surface
+
+        Args:
+            surface (Surface): Surface où les étoiles seront dessinées
+        """
+        surfaceFormat = (surface.get_bitsize(), surface.get_shifts(), surface.get_losses())
+        if self._mappedFormat == surfaceFormat:
+            return
+
+        shifts, losses = surface.get_shifts(), surface.get_losses()
+        self._mapped = []
+        for _, _, _, colors in self.layers:
+            mapped = np.zeros(len(colors), dtype=np.uint32)
+            for channel in range(3):
+                mapped |= (colors[:, channel] >> losses[channel]) << shifts[channel]
+            mapped |= surface.get_masks()[3]  # Opaque si la surface a un canal alpha
+            self._mapped.append(mapped)
+        self._mappedFormat = surfaceFormat
+
+    def _buildTiles(self, surface):
+        """Pré-rend chaque couche sur sa propre surface transparente
+
+        Les couches sont écrites en 32 bits, seul format que pixels3d accepte à coup sûr, puis converties au format
+        de la surface, quelle que soit sa profondeur (8, 16, 24 ou 32 bits).
+
+        Args:
+            surface (Surface): Surface de référence pour le format
+        """
+        self.tiles = []
+        for _, xs, ys, colors in self.layers:
+            tile = pygame.Surface((self.width, self.height), 0, 32)
+            tile.fill((0, 0, 0))
+            pixels = pygame.surfarray.pixels3d(tile)
+            pixels[xs, ys] = colors
+            del pixels  # Déverrouille la surface
+            tile = tile.convert(surface)
+            tile.set_colorkey((0, 0, 0))
+            self.tiles.append(tile)
+
+    def draw(self, surface, cameraX, cameraY):
+        """Dessine toutes les étoiles pour la position de caméra donnée
+
+        Args:
+            surface (Surface): Surface où dessiner
+            cameraX (float): Position X de la caméra (le joueur)
+            cameraY (float): Position Y de la caméra (le joueur)
+        """
+
+        if self.mode == "tiles" or surface.get_bytesize() != 4:
+            self._drawTiles(surface, cameraX, cameraY)
+        else:
+            self._drawPixels(surface, cameraX, cameraY)
+
+    def _drawPixels(self, surface, cameraX, cameraY):
+        """Écrit les étoiles directement dans les pixels de la surface, une opération par couche
+        """
+        self._mapColors(surface)
+
+        width, height = self.width, self.height
+        surfaceWidth, surfaceHeight = surface.get_size()
+        clip = surfaceWidth < width or surfaceHeight < height
+        # Surface de rendu plus petite que l'écran : seul le coin en haut à gauche des couches est visible
+        pixels = pygame.surfarray.pixels2d(surface)
+
+        for (layer, xs, ys, _), mapped in zip(self.layers, self._mapped):
+
+            drawX = (xs - floor(cameraX * layer)) % width
+            drawY = (ys - floor(cameraY * layer)) % height
+
+            if clip:
+                visible = (drawX < surfaceWidth) & (drawY < surfaceHeight)
+                drawX, drawY, mapped = drawX[visible], drawY[visible], mapped[visible]
+
+            pixels[drawX, drawY] = mapped
+
+        del pixels  # Déverrouille la surface
+
+    def _drawTiles(self, surface, cameraX, cameraY):
+        """Blitte les couches pré-rendues avec un décalage, en les répétant pour couvrir l'écran
+        """
+        if self.tiles is None:
+            self._buildTiles(surface)
+
+        width, height = self.width, self.height
+
+        for (layer, _, _, _), tile in zip(self.layers, self.tiles):
+
+            offsetX = -floor(cameraX * layer) % width
+            offsetY = -floor(cameraY * layer) % height
+
+            surface.blit(tile, (offsetX, offsetY))
+            surface.blit(tile, (offsetX - width, offsetY))
+            surface.blit(tile, (offsetX, offsetY - height))
+            surface.blit(tile, (offsetX - width, offsetY - height))
@@ -0,0 +1,258 @@
+"""Fichier contenant le simulateur par lots, pour l'équilibrage des vaisseaux
+
+Une grille de réglages (fichier JSON) donne, pour chaque réglage à faire varier, la liste de ses valeurs :
+    {"redShooter.puissanceCanon": [12, 16, 20], "redSniper.ammoTimer": [60, 75], "Player.shieldHP": [100, 150]}
+Les réglages sont ceux de l'attribut stats de redShooter, redSniper, redBlaster et Player. Chaque combinaison
+de la grille est jouée avec chaque graine : une partie sans affichage, pilotée par un pilote automatique (botKeys),
+jusqu'à la mort du joueur ou la limite de ticks. Les parties tournent dans un pool de processus, un par cœur, et
+chaque résultat est ajouté au fichier JSONL dès qu'il arrive : temps de survie, score, dégâts reçus, ticks/s.
+Une partie qui lève une exception est notée avec son erreur. Une partie qui fait tomber son processus casse le
+pool : il est recréé, et les parties en cours sont rejouées une par une. Celle qui le fait encore tomber est relancée
+au plus retries fois, puis notée en erreur.
+Lancer depuis la racine du projet : python -m lib.sweep grille.json --out resultats.jsonl
+"""
+
+import os
+import json
+import argparse
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from itertools import product
+from math import atan2, hypot
+from time import perf_counter
+
+import pygame
+
+from lib import game
+from lib.player import Player
+from lib.red.shooter import redShooter
+from lib.red.sniper import redSniper
+from lib.red.blaster import redBlaster
+
+
+TUNABLE = {cls.__name__: cls for cls in (redShooter, redSniper, redBlaster, Player)}
+# Classes dont l'attribut stats peut être changé par la grille
+DEFAULTS = {name: dict(cls.stats) for name, cls in TUNABLE.items()}
+# Réglages d'origine, remis avant chaque partie : un processus du pool en joue plusieurs
+
+AIM = 0.15  # Écart d'angle maximum avec la cible pour tirer, en rad
+FIRING_RANGE = 900  # Distance maximum de la cible pour tirer
+CRUISE = 400  # Le pilote accélère vers une cible plus loin que ça
+
+
+def botKeys(world):
+    """Touches du pilote automatique : se tourne vers l'ennemi le plus proche (à défaut l'astéroïde le plus proche),
+    tire quand il est devant et accélère vers lui quand il est loin, en gardant de l'essence
+
+    Args:
+        world (World): Monde où joue le pilote
+
+    Returns:
+        defaultdict: État du clavier pour ce tick, comme pygame.key.get_pressed()
+    """
+    key = defaultdict(bool)
+    player = world.player
+
+    targets = [ship for ship in world.ships if ship is not player and not ship.dying]
+    if not targets:
+        targets = [asteroid for asteroid in world.asteroids if not asteroid.dying]
+    if not targets:
+        return key
+
+    target = min(targets, key=lambda instance: (instance.x - player.x) ** 2 + (instance.y - player.y) ** 2)
+    toTargetX, toTargetY = target.x - player.x, target.y - player.y
+    direction = player.direction
+    turn = atan2(direction.x * toTargetY - direction.y * toTargetX, direction.x * toTargetX + direction.y * toTargetY)
+    distance = hypot(toTargetX, toTargetY)
+
+    steer = turn - player.angleMomentum * 20  # Freine la rotation avant d'arriver sur la cible
+    key[pygame.K_RIGHT] = steer > 0.02
+    key[pygame.K_LEFT] = steer < -0.02
+    key[pygame.K_SPACE] = abs(turn) < AIM and distance < FIRING_RANGE
+    key[pygame.K_UP] = distance > CRUISE and abs(turn) < 0.5 and player.fuel > player.max_fuel / 3
+
+    return key
+
+
+def tune(parameters):
+    """Remet les réglages d'origine, puis applique ceux de la partie
+
+    Args:
+        parameters (dict): {"Classe.réglage": valeur}
+    """
+    for name, cls in TUNABLE.items():
+        cls.stats = dict(DEFAULTS[name])
+    for parameter, value in parameters.items():
+        name, stat = parameter.split(".")
+        TUNABLE[name].stats[stat] = value
+
+
+def initWorker():
+    """Prépare un processus du pool : pygame sans affichage ni son
+    """
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    pygame.init()
+
+
+def simulate(parameters, seed, maxTicks):
+    """Joue une partie avec le pilote automatique, jusqu'à la mort du joueur ou maxTicks
+
+    Args:
+        parameters (dict): {"Classe.réglage": valeur}
+        seed (int): Graine de la partie
+        maxTicks (int): Nombre maximum de ticks
+
+    Returns:
+        dict: Résultats de la partie
+    """
+    tune(parameters)
+
+    world = game.createWorld(True, seed)
+    world.reset()
+    player = world.player = Player(world, 300, (world.screenWidth // 2, world.screenHeight // 2), world.ships, 500, 40)
+    # Comme game.run() : une partie de graine donnée commence pareil
+
+    damage = 0
+    health = player.HP + player.shieldHP
+
+    start = perf_counter()
+    while world.tick < maxTicks and not player.dying:
+        game.tickInput(world, botKeys(world))
+        game._randomTick(world)
+        game.updateGame(world)
+        world.tick += 1
+
+        previous, health = health, min(player.HP, player.maxHP) + player.shieldHP
+        damage += max(previous - health, 0)
+        # Les soins au-delà du maximum sont retirés au tick suivant : ce ne sont pas des dégâts
+    elapsed = perf_counter() - start
+
+    world.chunks.close()
+    return {"survie": world.tick / game.tickRate, "mort": player.dying, "score": world.score,
+            "degats": round(damage, 2), "ticks": world.tick, "ticks_par_s": round(world.tick / elapsed),
+            "pid": os.getpid()}
+
+
+def sweep(grid, seeds, maxTicks, path, workers=None, retries=2):
+    """Joue toute la grille avec chaque graine dans un pool de processus, et écrit chaque résultat dès qu'il arrive
+
+    Au plus workers parties sont données au pool à la fois : si un processus tombe, seules celles-là sont relancées,
+    une par une pour trouver celle qui le fait tomber.
+
+    Args:
+        grid (dict): {"Classe.réglage": liste des valeurs}
+        seeds (list): Graines jouées pour chaque combinaison
+        maxTicks (int): Nombre maximum de ticks par partie
+        path (str): Fichier .jsonl où ajouter les résultats, une ligne par partie
+        workers (int, optional): Nombre de processus, un par cœur si None
+        retries (int, optional): Nombre de relances d'une partie qui fait tomber son processus
+
+    Returns:
+        int: Nombre de parties en erreur
+    """
+    workers = workers or os.cpu_count() or 1
+    names = list(grid)
+    runs = [(index, dict(zip(names, values)), seed)
+            for index, (values, seed) in enumerate(product(product(*grid.values()), seeds))]
+    runs.reverse()  # Lancées dans l'ordre, en prenant à la fin
+    suspects = []  # Parties en cours quand le pool est tombé, rejouées une par une
+    crashes = defaultdict(int)  # Nombre de fois où chaque partie, jouée seule, a fait tomber le pool
+    errors = 0
+
+    with open(path, "a", encoding="utf-8") as file:
+
+        def write(run, result, tries):
+            index, parameters, seed = run
+            file.write(json.dumps({"run": index, "graine": seed, "parametres": parameters, **result, "essais": tries},
+                                  ensure_ascii=False))
+            file.write("\n")
+            file.flush()
+
+        while runs or suspects:
+            running = {}
+            try:
+                with ProcessPoolExecutor(workers, initializer=initWorker) as executor:
+                    while True:
+                        if suspects:
+                            if not running:
+                                run = suspects.pop()
+                                running[executor.submit(simulate, run[1], run[2], maxTicks)] = run
+                        else:
+                            while runs and len(running) < workers:
+                                run = runs.pop()
+                                running[executor.submit(simulate, run[1], run[2], maxTicks)] = run
+                        if not running:
+                            break
+
+                        done, _ = wait(running, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            run = running[future]
+                            try:
+                                result = future.result()
+                            except BrokenProcessPool:
+                                raise
+                            except Exception as error:
+                                result = {"erreur": f"{type(error).__name__}: {error}"}
+                                errors += 1
+                            del running[future]
+                            write(run, result, crashes[run[0]] + 1)
+
+            except BrokenProcessPool:
+                alone = len(running) == 1
+                for future, run in running.items():
+                    if future.done() and future.exception() is None:
+                        write(run, future.result(), crashes[run[0]] + 1)  # Finie avant la chute du pool
+                    elif not alone:
+                        suspects.append(run)
+                        # Impossible de savoir laquelle est tombée : chacune est rejouée seule
+                    else:
+                        crashes[run[0]] += 1
+                        if crashes[run[0]] > retries:
+                            write(run, {"erreur": "le processus de la partie est tombé"}, crashes[run[0]])
+                            errors += 1
+                        else:
+                            suspects.append(run)
+
+    return errors
+
+
+def main():
+    """Lit la grille et les options, puis joue toute la grille
+    """
+    parser = argparse.ArgumentParser(description="Simulateur par lots pour l'équilibrage")
+    parser.add_argument("grid", metavar="GRILLE", help="fichier JSON : {\"Classe.réglage\": [valeurs]}")
+    parser.add_argument("--out", default="resultats.jsonl", metavar="FICHIER",
+                        help="fichier .jsonl où ajouter une ligne par partie")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[1, 2, 3, 4], metavar="GRAINE",
+                        help="graines jouées pour chaque combinaison de la grille")
+    parser.add_argument("--ticks", type=int, default=3 * 60 * game.tickRate,
+                        help="durée maximum d'une partie en ticks (3 minutes de jeu par défaut)")
+    parser.add_argument("--workers", type=int, help="nombre de processus (un par cœur par défaut)")
+    parser.add_argument("--retries", type=int, default=2,
+                        help="relances d'une partie qui fait tomber son processus avant de la noter en erreur")
+    arguments = parser.parse_args()
+
+    with open(arguments.grid, encoding="utf-8") as file:
+        grid = json.load(file)
+
+    for parameter, values in grid.items():
+        name, _, stat = parameter.partition(".")
+        if name not in TUNABLE or stat not in DEFAULTS[name]:
+            parser.error(f"réglage inconnu : {parameter!r}, voir l'attribut stats de {', '.join(TUNABLE)}")
+        if not isinstance(values, list) or not values:
+            parser.error(f"{parameter} : liste de valeurs attendue")
+
+    count = len(arguments.seeds)
+    for values in grid.values():
+        count *= len(values)
+
+    start = perf_counter()
+    errors = sweep(grid, arguments.seeds, arguments.ticks, arguments.out, arguments.workers, arguments.retries)
+    print(f"{count} parties jouées en {perf_counter() - start:.1f} s, {errors} en erreur, résultats dans "
+          f"{arguments.out}")
+
+
+if __name__ == "__main__":
+    main()
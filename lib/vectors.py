@@ -0,0 +1,59 @@
+"""Fichier contenant les fonctions utilitaires sur les vecteurs
+"""
+
+from math import atan2, pi
+
+from pygame import Vector2
+import pygame
+
+
+pi_mul_2 = 2 * pi  # Shortcut pour plus de perf
+
+
+def angleBetweenVectors(Vector1, Vector2):
+    """Retourne l'angle entre deux vecteurs, TEST
+    
+    Args:
+        Vector1 (Vector2): Premier vecteur
+        Vector2 (Vector2): Deuxième vecteur
+    
+    Returns:
+        float: Angle entre les deux vecteurs, en radians
+    """
+
+    angleResultant = atan2(Vector1.cross(Vector2), Vector1.dot(Vector2))
+
+    return angleResultant
+
+
+def drawVector(world, Vector, startPos, name, color=(255, 0, 0)):
+    """Dessine le vecteur sur l'écran : DEBUG
+    
+    Args:
+        world (World): Monde où se trouve l'écran
+        Vector (Vector2): Le vecteur à dessiner
+        startPos (tuple): La position d'où dessiner le vecteur
+        name (str): Nom du vecteur à afficher
+        color (tuple, optional): Couleur du vecteur
+    """
+
+    world.renderer.mark(pygame.draw.aaline(world.display, color, startPos,
+                                           (startPos[0] + Vector[0], startPos[1] + Vector[1])))
+
+    textPos = Vector2(startPos) + Vector
+    if not (textPos[0] < 0 or textPos[1] < 0):  # Pour contrer un bug pygame, voir CdC
+        world.renderer.mark(world.vecFont.render_to(world.display, textPos, name, fgcolor=color))
+
+
+def centeredPos(world, pos):
+    """Fonction qui retourne la position centrée sur l'écran
+    
+    Args:
+        world (World): Monde où se trouve l'écran
+        pos (iter): Position à centrer
+    
+    Returns:
+        tuple: Position centrée au milieu de l'écran
+    """
+
+    return (pos[0] + world.centered_screenWidth, pos[1] + world.centered_screenHeight)
@@ -0,0 +1,179 @@
+"""Fichier contenant le monde : l'état partagé par tout les objets du jeu
+"""
+
+import hashlib
+
+from collections import defaultdict
+from random import Random, randrange
+
+import pygame
+import pygame.freetype
+
+from lib.bullet import BulletPool
+from lib.camera import Camera
+from lib.chunks import ChunkMap
+from lib.images import Images
+from lib.red.fleet import Fleet
+from lib.rotation import RotationCache
+from lib.spatial import SpatialHash
+
+
+class World:
+    """Contexte du jeu, donné à chaque objet au lieu de variables globales
+
+    Attributes:
+        asteroidPool (list): Astéroïdes morts, réutilisés par Asteroid.restore() au lieu d'en construire de nouveaux
+        asteroids (pygame.sprite.Group): Groupe tenant tout les astéroïdes
+        bullets (BulletPool): Toutes les balles, dans des tableaux NumPy
+        camera (Camera): Vue de la simulation autour du joueur, qui décide du niveau de détail des objets
+        autoScale (AutoScale): Ajuste renderScale selon le temps des frames, None si l'échelle est fixe
+        chunks (ChunkMap): Chunks du monde chargés autour du joueur, d'où viennent les astéroïdes
+        centered_screenHeight (int): Moitié de la hauteur de la vue, celle de l'écran quelle que soit l'échelle de rendu
+        centered_screenWidth (int): Moitié de la largeur de la vue, celle de l'écran quelle que soit l'échelle de rendu
+        display (Surface): Surface de la fenêtre, où l'image est envoyée
+        fleet (Fleet): Tout les vaisseaux rouges, actualisés en une passe avec des tableaux NumPy
+        headless (bool): Si True, le jeu tourne sans affichage ni son, et sans limite de ticks par seconde
+        highscore (int): Le meilleur score de la session
+        hud (Hud): Textes et barres du HUD gardés une fois rendus, None sans affichage
+        images (Images): Toutes les images du jeu
+        key (list): Tableau des booléens relatifs à chaque touche du clavier
+        myFont (pygame.freetype.Font): Police d'écriture de base, None sans affichage
+        objects (pygame.sprite.Group): Groupe gérant tout les objets physique
+        player (Player): Le vaisseau du joueur
+        profiler (Profiler): Mesure le temps de chaque phase des frames, None s'il n'est pas demandé
+        randomTick (int): Variable aléatoire tirée à chaque tick
+        renderer (Renderer): Moteur d'affichage, None sans affichage
+        renderFactor (int): Nombre de pixels de l'écran par pixel de rendu, sur chaque axe : 1 == pleine résolution
+        renderHeight (int): Hauteur de la surface de rendu
+        renderScale (float): Taille de la surface de rendu par rapport à l'écran, 1 / renderFactor
+        renderWidth (int): Largeur de la surface de rendu
+        restart (bool): Si True, le jeu est prêt à être relancé
+        rng (random.Random): Générateur aléatoire de la simulation : toute la partie en découle
+        rotationCache (RotationCache): Cache des images tournées, partagé par tout les objets
+        score (int): Score de la partie en cours
+        screen (Surface): Surface où sont dessinées les objects : l'écran, ou une surface plus petite agrandie ensuite
+        screenHeight (int): Hauteur de l'écran, aussi utilisée par la simulation
+        screenWidth (int): Largeur de l'écran, aussi utilisée par la simulation
+        seed (int): Graine de rng, pour rejouer la même partie
+        ships (pygame.sprite.Group): Groupe relatif aux vaisseaux
+        spatialHash (SpatialHash): Grille qui trouve les paires d'objets en collision potentielle
+        stars (StarField): Champ d'étoiles, rangé par couches de parallaxe
+        tick (int): Nombre de ticks simulés depuis le lancement
+    """
+
+    def __init__(self, screen, screenWidth, screenHeight, headless=False, seed=None):
+        """Constructeur du monde, une fois l'écran créé
+
+        Args:
+            screen (Surface): Surface où dessiner
+            screenWidth (int): Largeur de l'écran, logique si headless
+            screenHeight (int): Hauteur de l'écran, logique si headless
+            headless (bool, optional): Si True, rien n'est jamais dessiné
+            seed (int, optional): Graine du générateur aléatoire, tirée au hasard si None
+        """
+
+        self.headless = headless
+
+        self.seed = randrange(2 ** 63) if seed is None else seed
+        self.rng = Random(self.seed)
+
+        self.display = screen
+        self.screenWidth, self.screenHeight = screenWidth, screenHeight
+        self.centered_screenWidth = screenWidth // 2
+        self.centered_screenHeight = screenHeight // 2
+        #  Centrées sur le centre de l'écran : la vue ne change pas avec l'échelle de rendu
+
+        self.renderer = None
+        self.autoScale = None
+        self.profiler = None
+        self.setRenderScale(1.0)
+
+        self.images = Images()
+        self.rotationCache = RotationCache(buckets=360, maxBytes=64 * 1024 * 1024)
+        for image, rotations in self.images.rotations.items():
+            self.rotationCache.bake(image, rotations)
+        self.spatialHash = SpatialHash()
+        self.camera = Camera(self)
+        self.chunks = ChunkMap(self)
+
+        self.myFont = None
+        self.hud = None
+        if not headless:
+            from lib.hud import Hud
+            # Importé seulement avec un affichage
+            self.myFont = pygame.freetype.SysFont("arial", 10)
+            self.hud = Hud(self.myFont)
+        self._vecFont = None
+
+        self.stars = None
+        self.asteroidPool = []
+
+        self.key = defaultdict(bool)  # Aucune touche appuyée
+        self.tick = 0
+        self.randomTick = 0
+
+        self.highscore = 0
+        self.reset()
+
+    def setRenderScale(self, scale):
+        """Change la résolution de rendu : le monde est dessiné sur une surface plus petite, agrandie une fois par frame
+
+        La vue montre toujours la même zone du monde, de la taille de l'écran : seuls les étoiles, les boucliers, les
+        sprites et les balles sont dessinés en plus petit (voir Renderer.downscale()), le HUD est dessiné après
+        l'agrandissement, en pleine résolution. L'échelle est arrondie à 1 / n, n entier : chaque pixel de rendu
+        devient un carré de n x n pixels de l'écran. La simulation ne change pas.
+
+        Args:
+            scale (float): Taille de la surface de rendu par rapport à l'écran, entre 0.1 et 1.0
+        """
+        factor = 1 if self.headless else min(max(round(1 / scale), 1), 10)
+        self.renderFactor = factor
+        self.renderScale = 1 / factor
+
+        if factor == 1:
+            self.screen = self.display
+            self.renderWidth, self.renderHeight = self.screenWidth, self.screenHeight
+        else:
+            self.renderWidth, self.renderHeight = -(-self.screenWidth // factor), -(-self.screenHeight // factor)
+            self.screen = pygame.Surface((self.renderWidth, self.renderHeight)).convert(self.display)
+
+        if self.renderer is not None:
+            self.renderer.resize()
+
+    @property
+    def vecFont(self):
+        """Police d'écriture spécifique aux vecteurs, chargée seulement si le debug est utilisé
+        """
+        if self._vecFont is None:
+            self._vecFont = pygame.freetype.SysFont("arial", 10, italic=True)
+        return self._vecFont
+
+    def digest(self):
+        """Empreinte de l'état de la simulation, pour vérifier qu'une partie rejouée est identique
+
+        Returns:
+            str: Empreinte hexadécimale (SHA-1) du tick, du score, de chaque objet et de chaque balle
+        """
+        state = [self.tick, self.score, self.highscore]
+        for instance in self.objects:
+            state.append((type(instance).__name__, instance.x, instance.y, instance.HP, instance.angle))
+        state.append(self.bullets.digest())
+        return hashlib.sha1(repr(state).encode()).hexdigest()
+
+    def reset(self):
+        """Vide le monde pour une nouvelle partie. Le joueur est créé par la suite
+        """
+        if hasattr(self, "asteroids"):
+            for asteroid in self.asteroids.sprites():
+                asteroid.die()  # Les astéroïdes de la partie finie retournent dans le pool
+        self.objects = pygame.sprite.Group()  # Groupe tenant tout les objets, donc tout ce qui est physique
+        self.ships = pygame.sprite.Group()  # Groupe tenant tout les vaisseaux.
+        self.asteroids = pygame.sprite.Group()  # Groupe tenant tout les astéroïdes
+        self.bullets = BulletPool(self)
+        self.fleet = Fleet(self)
+
+        self.player = None
+        self.score = 0
+        self.restart = False
+
+        self.chunks.reset()  # Nouvelle graine : chaque partie a son propre monde